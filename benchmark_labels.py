@@ -0,0 +1,185 @@
+'''
+Author:     Meet Shah
+LinkedIn:   https://www.linkedin.com/in/meetshah10290/
+
+Copyright (C) 2024 Meet Shah
+
+License:    GNU Affero General Public License
+            https://www.gnu.org/licenses/agpl-3.0.en.html
+
+GitHub:     https://github.com/shahmeetk
+
+'''
+
+
+# Runs the question answering rules (see "/modules/answer_rules.py") on question labels recorded with
+# `capture_pages = True` (see "/config/settings.py"), no browser needed. Reports how fast labels are resolved, how
+# many fall through to the AI or a random answer, and how many now resolve differently than when they were recorded.
+# Accuracy is measured on labels verified by hand: add the right `"expected_rule"` and `"expected_option"` (null if no
+# rule should answer it) to a line of the corpus, it then counts for every recording of the same question.
+# Each report is saved by release, and `--compare` fails (exit code 1) if a change made any of them worse. Usage:
+#   python benchmark_labels.py [--labels "fixtures/labels.jsonl"] [--repeat 20] [--release v1.2] [--compare "logs/benchmarks/labels_v1.1.json"]
+
+
+# REQUIRED IMPORTS
+import os
+import sys
+import json
+import argparse
+import subprocess
+from datetime import datetime
+from time import perf_counter
+
+from modules.answer_rules import find_answer_rule, get_answer_values, resolve_answer, get_option_text, get_outcome, get_labels_path
+from modules.helpers import make_directories, print_lg
+
+
+def get_release() -> str:
+    try: return subprocess.run(["git", "describe", "--tags", "--always", "--dirty"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception: return datetime.now().strftime("%Y%m%d")
+
+parser = argparse.ArgumentParser(description="Benchmark and check the question answering rules on recorded labels.")
+parser.add_argument("--labels", default=get_labels_path(), help="Labels corpus recorded with capture_pages = True (JSON lines)")
+parser.add_argument("--repeat", type=int, default=20, help="How many times to resolve the whole corpus for timing")
+parser.add_argument("--no-ai", action="store_true", help="Count unanswered text questions as random answers instead of AI calls")
+parser.add_argument("--release", default=None, help="Name of the report (defaults to git describe)")
+parser.add_argument("--output", default="logs/benchmarks/", help="Folder to save the report in")
+parser.add_argument("--compare", default=None, help="Earlier report to check this one against")
+parser.add_argument("--max-slowdown", type=float, default=20, help="Allowed throughput drop against --compare, in percent")
+parser.add_argument("--show", type=int, default=10, help="How many mismatched labels to list")
+args = parser.parse_args()
+
+
+def load_labels(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as labels:
+        return [json.loads(line) for line in labels if line.strip()]
+
+
+def resolve(record: dict, values: dict[str, str]):
+    return resolve_answer(record["type"], record["label"], values, record.get("options"), record.get("exact_options"), previous_answer=record.get("previous_answer"), city=values["city"])
+
+
+def time_corpus(records: list[dict], values: dict[str, str], repeat: int, cold: bool) -> float:
+    '''
+    Resolves all `records` `repeat` times and returns labels per second. With `cold = True`, remembered rules are forgotten before every pass.
+    '''
+    elapsed = 0.0
+    for _ in range(repeat):
+        if cold: find_answer_rule.cache_clear()
+        start = perf_counter()
+        for record in records: resolve(record, values)
+        elapsed += perf_counter() - start
+    return len(records) * repeat / elapsed if elapsed else 0.0
+
+
+def get_question_key(record: dict) -> tuple:
+    return record["type"], record["label"], json.dumps(record.get("options"))
+
+
+def get_expectations(records: list[dict]) -> dict[tuple, tuple]:
+    '''
+    Returns the hand verified `(expected rule, expected option)` of every question that has them, by `get_question_key()`
+    '''
+    return {get_question_key(record): (record.get("expected_rule"), record.get("expected_option")) for record in records if "expected_rule" in record or "expected_option" in record}
+
+
+def check_corpus(records: list[dict], values: dict[str, str], use_AI: bool) -> dict:
+    outcomes = {}
+    by_type = {}
+    changes = []
+    errors = []
+    expectations = get_expectations(records)
+    for record in records:
+        resolved = resolve(record, values)
+        outcome = get_outcome(record["type"], resolved, use_AI)
+        rule = resolved.rule["name"] if resolved.rule else None
+        option = get_option_text(resolved, record.get("options"), record.get("exact_options"))
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        counts = by_type.setdefault(record["type"], {"labels": 0, "changed": 0, "verified": 0, "wrong": 0, "fall_through": 0})
+        counts["labels"] += 1
+        if outcome in ("ai", "random"): counts["fall_through"] += 1
+        # Random picks can't be compared, only that something was picked at random again
+        snapshot_option = record.get("option") if record.get("outcome") != "random" else None
+        picked_option = option if outcome != "random" else None
+        if rule != record.get("rule") or picked_option != snapshot_option:
+            counts["changed"] += 1
+            changes.append((record, rule, option))
+        expected = expectations.get(get_question_key(record))
+        if expected is not None:
+            counts["verified"] += 1
+            if (rule, picked_option) != expected:
+                counts["wrong"] += 1
+                errors.append((record, rule, option, expected))
+    total = len(records)
+    verified = sum(counts["verified"] for counts in by_type.values())
+    return {
+        "labels": total,
+        "verified_labels": verified,
+        "accuracy": round(1 - len(errors) / verified, 4) if verified else None,
+        "snapshot_change_rate": round(len(changes) / total, 4),
+        "fall_through_rate": round((outcomes.get("ai", 0) + outcomes.get("random", 0)) / total, 4),
+        "ai_call_rate": round(outcomes.get("ai", 0) / total, 4),
+        "random_rate": round(outcomes.get("random", 0) / total, 4),
+        "outcomes": outcomes,
+        "by_type": by_type,
+    }, changes, errors
+
+
+def find_regressions(report: dict, previous: dict, max_slowdown: float) -> list[str]:
+    regressions = []
+    if report["accuracy"] is not None and previous.get("accuracy") is not None and report["accuracy"] < previous["accuracy"]:
+        regressions.append(f'accuracy dropped from {previous["accuracy"]:.2%} to {report["accuracy"]:.2%}')
+    for rate in ("fall_through_rate", "ai_call_rate", "random_rate"):
+        if report[rate] > previous[rate]:
+            regressions.append(f'{rate} rose from {previous[rate]:.2%} to {report[rate]:.2%}')
+    for speed in ("labels_per_sec_cold", "labels_per_sec_warm"):
+        if report[speed] < previous[speed] * (1 - max_slowdown / 100):
+            regressions.append(f'{speed} fell from {previous[speed]:,.0f} to {report[speed]:,.0f}')
+    return regressions
+
+
+def main() -> int:
+    if not os.path.exists(args.labels):
+        print_lg(f'No labels found at "{args.labels}". Run the bot with capture_pages = True to record some.')
+        return 1
+    records = load_labels(args.labels)
+    if not records:
+        print_lg(f'"{args.labels}" has no labels.')
+        return 1
+
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file: previous = json.load(file)
+
+    values = dict(get_answer_values(), city="work location")
+    report, changes, errors = check_corpus(records, values, not args.no_ai)
+    report["labels_per_sec_cold"] = round(time_corpus(records, values, args.repeat, cold=True))
+    report["labels_per_sec_warm"] = round(time_corpus(records, values, args.repeat, cold=False))
+    report["release"] = args.release or get_release()
+    report["date"] = datetime.now().isoformat(timespec="seconds")
+
+    accuracy = f'accuracy {report["accuracy"]:.2%} of {report["verified_labels"]} verified' if report["accuracy"] is not None else "no verified labels"
+    print_lg(f'{report["labels"]} labels | {accuracy} | {report["snapshot_change_rate"]:.2%} changed since recorded | fall-through {report["fall_through_rate"]:.2%} (AI {report["ai_call_rate"]:.2%}, random {report["random_rate"]:.2%}) | {report["labels_per_sec_cold"]:,} labels/s cold, {report["labels_per_sec_warm"]:,} labels/s warm')
+    for question_type, counts in sorted(report["by_type"].items()):
+        print_lg(f'  {question_type:<10} {counts["labels"]:>6} labels | {counts["wrong"]:>5} of {counts["verified"]:>5} verified wrong | {counts["changed"]:>5} changed | {counts["fall_through"]:>5} fell through')
+    for record, rule, option, expected in errors[:args.show]:
+        print_lg(f'  Wrong ({record["type"]}) "{record["label"]}": expected {expected[0]} / {expected[1]}, got {rule} / {option}')
+    for record, rule, option in changes[:args.show]:
+        print_lg(f'  Changed ({record["type"]}) "{record["label"]}": was {record.get("rule")} / {record.get("option")}, now {rule} / {option}')
+
+    make_directories([args.output])
+    path = os.path.join(args.output, f'labels_{report["release"]}.json')
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print_lg(f'Saved report to "{path}"')
+
+    if previous is not None:
+        regressions = find_regressions(report, previous, args.max_slowdown)
+        for regression in regressions: print_lg(f"REGRESSION: {regression}")
+        if regressions: return 1
+        print_lg(f'No regressions against "{args.compare}"')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -76,6 +76,9 @@ about_company_good_words = []      # (dynamic multiple search) or leave empty as
 # Avoid applying to these companies if they have these bad words in their 'Job Description' section...  (In development)
 bad_words = ["US Citizen", "USA Citizen", "No C2C", "No Corp2Corp",  "Security Clearance", "US Citizens Only", "Green Card"]                     # (dynamic multiple search) or leave empty as []. Case Insensitive. Ex: ["word_1", "phrase 1", "word word", "polygraph", "US Citizenship", "Security Clearance"]
 
+# Should the words above only match as whole words? (True: "Java" won't match "JavaScript", False: match anywhere like before)
+match_whole_words = False          # True or False, Note: True or False are case-sensitive
+
 # Do you have an active Security Clearance? (True for Yes and False for No)
 security_clearance = True         # True or False, Note: True or False are case-sensitive
 
@@ -56,6 +56,40 @@ file_name = "all excels/all_applied_applications_history.csv"
 failed_file_name = "all excels/all_failed_applications_history.csv"
 logs_folder_path = "logs/"
 
+# Log messages are buffered in memory and written to "log.txt" by a background thread. How often (in secs) should they be written? Lower loses less on a crash, higher is lighter on slow disks.
+log_flush_interval = 2              # Only Non Negative Integers Eg: 0,1,2,3,.... (0 writes every message immediately)
+log_queue_size = 10000              # Max number of messages waiting to be written, logging waits for the writer once it's full
+log_max_size_mb = 20                # Start a new "log.txt" once it grows beyond this size in MB (0 to never rotate)
+log_backup_count = 3                # Number of rotated logs to keep as "log.txt.1", "log.txt.2", etc. (0 to just start over)
+
+# Save how long each step of applying took (filters, job details, questions, submit, waits...) as JSON in "logs/timings/" after every cycle? A summary is always logged.
+save_stage_timings = True           # True or False, Note: True or False are case-sensitive
+
+# Serve live metrics of the run (jobs applied, failed, skipped, AI calls, stage timings, current search...) at "http://localhost:<port>/metrics" in Prometheus text format, to monitor and alert on long non-stop runs?
+metrics_port = 0                    # Only Non Negative Integers Eg: 0, 9464 (0 to not serve them)
+# Also rewrite the same metrics as JSON in this file every `metrics_interval` seconds? Leave empty "" to not write them.
+metrics_json_path = ""              # Eg: "logs/metrics.json"
+metrics_interval = 30               # Only Integers greater than 0 Eg: 10, 30, 60
+
+# Path of the job ID index kept next to the history files above. It's rebuilt from the CSVs automatically if deleted or if the CSVs are edited by hand (checked by size, modification time and checksum), so the CSVs stay the source of truth.
+history_index_path = "all excels/history_index.db"
+
+# Where should "python export_history.py" save the history as tables for analytics (Parquet if "pyarrow" is installed, else gzip compressed CSVs)?
+history_export_path = "all excels/history_export/"
+
+# Store each job description once (compressed, in the file below) and write a short reference (Eg: "desc:2372e467...") in the history CSVs instead of the full text? Run "python migrate_descriptions.py" to do the same to history written before.
+# Note: This changes what the "About Job" column of the CSVs holds, anything reading them directly gets references instead of descriptions ("python export_history.py" still exports the full descriptions).
+dedupe_descriptions = False         # True or False, Note: True or False are case-sensitive
+description_store_path = "all excels/descriptions.db"   # Once the CSVs have references, this file has the only copy of the descriptions, don't delete it!
+
+# For how many days should jobs rejected for their description (bad words, clearance, experience) and companies rejected for their "About Company" be skipped without opening them again, in later cycles and runs? They're also retried early if the settings they were rejected for change.
+skip_cache_days = 30                # Only Non Negative Integers Eg: 0, 7, 30 (0 to only skip them within the same cycle)
+skip_cache_path = "all excels/skip_cache.db"    # Safe to delete, rejected jobs are just checked again
+
+# Save every search page, filters panel, job details and Easy Apply step seen as offline fixtures? They can then be replayed with "python replay.py" to test and time the bot without LinkedIn. (Fixtures contain your personal details as filled in the forms, don't share them!)
+capture_pages = False               # True or False, Note: True or False are case-sensitive
+fixtures_folder_path = "fixtures/"
+
 # Set the maximum amount of time allowed to wait between each click in secs
 click_gap = 0                       # Enter max allowed secs to wait approximately. (Only Non Negative Integers Eg: 0,1,2,3,....)
 
@@ -68,17 +102,62 @@ disable_extensions = False          # True or False, Note: True or False are cas
 # Run in safe mode. Set this true if chrome is taking too long to open or if you have multiple profiles in browser. This will open chrome in guest profile!
 safe_mode = False                   # True or False, Note: True or False are case-sensitive
 
+# Instead of sleeping for fixed times, the bot waits until the page is ready. What's the longest it should wait (in secs)?
+page_settle_max_wait = 3            # Only Non Negative Integers Eg: 2,3,5,.... (max wait for job listings and Easy Apply forms to stop changing)
+suggestions_max_wait = 3            # Only Non Negative Integers Eg: 2,3,5,.... (max wait for search suggestions after typing a location, city or company)
+
 # Do you want scrolling to be smooth or instantaneous? (Can reduce performance if True)
 smooth_scroll = False               # True or False, Note: True or False are case-sensitive
 
 # If enabled (True), the program would keep your screen active and prevent PC from sleeping. Instead you could disable this feature (set it to false) and adjust your PC sleep settings to Never Sleep or a preferred time.
 keep_screen_awake = True            # True or False, Note: True or False are case-sensitive (Note: Will temporarily deactivate when any application dialog boxes are present (Eg: Pause before submit, Help needed for a question..))
 
+# How many browsers should apply at the same time? Search terms are shared between them and no job is handled twice. Each extra browser gets its own Chrome profile in "worker_profiles_path" (log in once per profile) and logs in "logs/worker_<n>/".
+parallel_workers = 1                # Only Integers greater than 0 Eg: 1,2,3,.... (1 to use a single browser, pauses and dialogs are disabled in extra browsers)
+worker_profiles_path = "Chrome profiles/"
+
 # Run in undetected mode to bypass anti-bot protections (Preview Feature, UNSTABLE. Recommended to leave it as False)
 stealth_mode = False                 # True or False, Note: True or False are case-sensitive
 
 # Do you want to get alerts on errors related to AI API connection?
 showAiErrorAlerts = True            # True or False, Note: True or False are case-sensitive
 
+# How long (in secs) to wait for the local AI server (Ollama)? Connecting should be quick, generating an answer can take a while on slower machines.
+ai_connect_timeout = 5              # Only Non Negative Integers Eg: 3,5,10,....
+ai_read_timeout = 180               # Only Non Negative Integers Eg: 60,180,300,.... (max secs to wait for the AI to start or continue responding)
+ai_max_retries = 3                  # Number of retries with increasing wait for server errors (5xx) and failed connections (0 to disable)
+
+# Send AI requests through one async client (needs "openai" and "httpx" installed), so skill extraction and answers from background and foreground run at the same time? How many requests can run at once, and how long (in secs) can one take before it's cancelled?
+ai_async_client = True              # True or False, Note: True or False are case-sensitive
+ai_max_concurrent_requests = 2      # Only Integers greater than 0 Eg: 1,2,4,.... (1 for a single local model on CPU, more if your AI server runs requests in parallel)
+ai_request_timeout = 300            # Only Integers greater than 0 Eg: 120,300,600,.... (includes waiting for a free slot)
+
+# Load the Ollama model into memory when starting and after each sleep between cycles, so the first job doesn't wait for it to load? And how long should Ollama keep it loaded after each use?
+ollama_warm_up_model = True         # True or False, Note: True or False are case-sensitive
+ollama_keep_alive = "15m"           # Ollama duration Eg: "5m", "15m", "1h", "-1" (keep it loaded until Ollama stops) or "0" (unload right after use). Keep it longer than the 10 min sleep between cycles on slow machines
+
+# Remove boilerplate (equal opportunity statements, benefits and perks sections, repeated lines) from job descriptions before sending them to the AI? And how many tokens of the description should be sent at most? Shorter prompts are faster and cheaper.
+ai_strip_boilerplate = True         # True or False, Note: True or False are case-sensitive
+ai_description_token_budget = 1500  # Only Non Negative Integers Eg: 800,1500,3000,.... (0 to send the whole description, 1 token is about 4 characters)
+
+# Where should AI responses be cached? Saves a round-trip to the AI every time the same job description shows up again (reposts, other search terms, next cycles)
+ai_cache_path = "all excels/ai_cache.db"
+
+# How many extracted skill lists to keep in the AI cache and for how long? Least recently used ones are removed first.
+skills_cache_max_entries = 5000     # Only Non Negative Integers Eg: 0,1000,5000,.... (0 to disable caching extracted skills)
+skills_cache_ttl_days = 30          # Only Non Negative Integers Eg: 0,7,30,.... (0 to never expire)
+
+# Remember answers the AI gave to application questions and reuse them when the same question (same label, type and options) is asked again, instead of asking the AI every time?
+remember_ai_answers = True          # True or False, Note: True or False are case-sensitive
+scope_textarea_answers_to_job = True # True or False, Note: True or False are case-sensitive (If True, long textarea answers are only reused for the same job description, as they're usually written for that job)
+answers_cache_max_entries = 5000    # Only Non Negative Integers Eg: 0,1000,5000,.... (Max number of remembered answers, and of companies whose questions are remembered for prefetching. Least recently used ones are removed first, 0 for no limit)
+
+# Start AI work (skill extraction and answers to questions the company asked before) in the background as soon as the job description is read, so the AI works while the bot fills the Easy Apply form?
+ai_prefetch = True                  # True or False, Note: True or False are case-sensitive
+ai_prefetch_workers = 2             # Max number of AI calls running in the background at once (Only Integers greater than 0 Eg: 1,2,3,....)
+
+# Ask the AI all unanswered questions of an Easy Apply page in one request instead of one request per question? A page with 5 open questions then costs 1 generation instead of 5.
+ai_batch_questions = True           # True or False, Note: True or False are case-sensitive
+
 # Use ChatGPT for resume building (Experimental Feature can break the application. Recommended to leave it as False)
 use_resume_generator = False       # True or False, Note: True or False are case-sensitive ,   This feature may only work with 'stealth_mode = True'. As ChatGPT website is hosted by CloudFlare which is protected by Anti-bot protections!
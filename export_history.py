@@ -0,0 +1,46 @@
+'''
+Author:     Meet Shah
+LinkedIn:   https://www.linkedin.com/in/meetshah10290/
+
+Copyright (C) 2024 Meet Shah
+
+License:    GNU Affero General Public License
+            https://www.gnu.org/licenses/agpl-3.0.en.html
+
+GitHub:     https://github.com/shahmeetk
+
+'''
+
+
+# Converts the applied and failed history CSVs into tables for analytics (see "/modules/history_export.py"), with
+# job descriptions stored once in their own table. Works on any size of history with constant memory. Usage:
+#   python export_history.py [--output "all excels/history_export/"] [--format auto|parquet|csv] [--batch-size 5000]
+# Read it back with Eg: pandas.read_parquet("all excels/history_export/applied", columns=["company", "date_applied"])
+
+
+# REQUIRED IMPORTS
+import sys
+import argparse
+
+from config.settings import history_export_path
+from modules.history_export import export_history
+from modules.helpers import print_lg
+
+parser = argparse.ArgumentParser(description="Export the application history CSVs as partitioned columnar tables.")
+parser.add_argument("--output", default=history_export_path, help="Folder to export the tables to (tables exported there earlier are replaced)")
+parser.add_argument("--format", choices=["auto", "parquet", "csv"], default="auto", help="Parquet needs pyarrow, auto uses it if installed")
+parser.add_argument("--batch-size", type=int, default=5000, help="Rows kept in memory per partition before they're written")
+args = parser.parse_args()
+
+
+def main() -> int:
+    try:
+        export_history(args.output, args.batch_size, None if args.format == "auto" else args.format == "parquet")
+    except ImportError as e:
+        print_lg(e)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+'''
+Author:     Meet Shah
+LinkedIn:   https://www.linkedin.com/in/meetshah10290/
+
+Copyright (C) 2024 Meet Shah
+
+License:    GNU Affero General Public License
+            https://www.gnu.org/licenses/agpl-3.0.en.html
+
+GitHub:     https://github.com/shahmeetk
+
+'''
+
+
+# Rewrites the applied and failed history CSVs written before `dedupe_descriptions = True` (see "/config/settings.py"),
+# storing each job description once in the description store (see "/modules/descriptions.py") and writing its
+# reference in the CSVs instead. Originals are kept as ".bak" files, and it's safe to run again. Run it while the bot
+# is stopped, the job ID index is rebuilt on the next run. Usage:
+#   python migrate_descriptions.py [--dry-run]
+
+
+# REQUIRED IMPORTS
+import os
+import sys
+import argparse
+
+from config.settings import file_name, failed_file_name, description_store_path
+from modules.descriptions import migrate_history_csv, close_description_store
+from modules.helpers import print_lg
+
+parser = argparse.ArgumentParser(description="Replace job descriptions in the history CSVs with references to the description store.")
+parser.add_argument("--dry-run", action="store_true", help="Only report how much smaller the CSVs would get, without changing them")
+args = parser.parse_args()
+
+
+def main() -> int:
+    try:
+        for csv_path, description_column, message_column in ((file_name, "About Job", None), (failed_file_name, None, "Stack Trace")):
+            if not os.path.exists(csv_path):
+                print_lg(f'Skipping "{csv_path}", not found')
+                continue
+            rows, size_before, size_after = migrate_history_csv(csv_path, description_column, message_column, dry_run=args.dry_run)
+            print_lg(f'{"Would shrink" if args.dry_run else "Migrated"} "{csv_path}": {rows} rows, {size_before / 1024**2:.1f} MB -> {size_after / 1024**2:.1f} MB')
+    except OSError as e:
+        print_lg("Failed to migrate the history CSVs! Make sure they aren't open in another program.", e)
+        return 1
+    finally:
+        close_description_store()
+    print_lg(f'Descriptions are stored in "{description_store_path}", keep it with the CSVs!')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
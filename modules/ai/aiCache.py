@@ -0,0 +1,153 @@
+from config.settings import ai_cache_path
+
+from modules.helpers import make_directories, print_lg
+
+import re
+import json
+import sqlite3
+import hashlib
+from time import time
+from threading import Lock
+from typing import Any
+
+
+##> AI response cache
+'''
+On-disk cache for AI responses, so the same job posting seen again across search terms, reposts or
+`run_non_stop` cycles doesn't cost another LLM round-trip. Entries live in a SQLite file and are grouped
+by `namespace` (Eg: "skills"), each namespace with its own size limit (least recently used entries are
+evicted first) and time to live.
+'''
+
+__connection: sqlite3.Connection | None = None
+__lock = Lock()
+__stats: dict[str, dict[str, int]] = {}
+
+
+def get_cache_connection() -> sqlite3.Connection:
+    '''
+    Function to open (once) and return the connection to the AI cache database
+    '''
+    global __connection
+    if __connection is None:
+        make_directories([ai_cache_path])
+        __connection = sqlite3.connect(ai_cache_path, check_same_thread=False)
+        __connection.executescript('''
+            CREATE TABLE IF NOT EXISTS entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS entries_last_used ON entries (namespace, last_used);
+        ''')
+    return __connection
+
+
+def normalize_text(text: str) -> str:
+    '''
+    Function to normalize `text` before hashing, so whitespace and case differences don't cause cache misses
+    '''
+    return re.sub(r'\s+', ' ', text).strip().lower()
+
+
+def make_cache_key(*parts: Any) -> str:
+    '''
+    Function to build a cache key by hashing all `parts` together. Strings are normalized, anything else is JSON encoded.
+    '''
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update((normalize_text(part) if isinstance(part, str) else json.dumps(part, sort_keys=True, default=str)).encode("utf-8"))
+        digest.update(b'\x1f')
+    return digest.hexdigest()
+
+
+def prompt_version(*templates: Any) -> str:
+    '''
+    Function to get a short fingerprint of prompt `templates`, so cached responses are ignored once a prompt is edited
+    '''
+    return make_cache_key(*templates)[:12]
+
+
+def __count(namespace: str, event: str) -> None:
+    __stats.setdefault(namespace, {"hits": 0, "misses": 0, "stores": 0, "evictions": 0})[event] += 1
+
+
+def cache_get(namespace: str, key: str, ttl_days: int = 0) -> Any | None:
+    '''
+    Function to get the cached value for `key` in `namespace`.
+    * Returns `None` on a miss or if the entry is older than `ttl_days` (`0` never expires)
+    * Counts hits and misses, see `get_cache_stats()`
+    '''
+    try:
+        connection = get_cache_connection()
+        with __lock:
+            row = connection.execute("SELECT value, created_at FROM entries WHERE namespace = ? AND key = ?", (namespace, key)).fetchone()
+            now = time()
+            if row and ttl_days > 0 and now - row[1] > ttl_days * 86400:
+                connection.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+                connection.commit()
+                __count(namespace, "evictions")
+                row = None
+            if row is None:
+                __count(namespace, "misses")
+                return None
+            connection.execute("UPDATE entries SET last_used = ? WHERE namespace = ? AND key = ?", (now, namespace, key))
+            connection.commit()
+            __count(namespace, "hits")
+        return json.loads(row[0])
+    except Exception as e:
+        print_lg(f'Failed to read from AI cache "{namespace}"!', e)
+        return None
+
+
+def cache_put(namespace: str, key: str, value: Any, max_entries: int = 0) -> None:
+    '''
+    Function to store `value` (must be JSON serializable) for `key` in `namespace`.
+    * If `max_entries > 0`, evicts the least recently used entries of `namespace` beyond that limit
+    '''
+    try:
+        connection = get_cache_connection()
+        with __lock:
+            now = time()
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (namespace, key, value, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, json.dumps(value), now, now)
+            )
+            __count(namespace, "stores")
+            if max_entries > 0:
+                count = connection.execute("SELECT COUNT(*) FROM entries WHERE namespace = ?", (namespace,)).fetchone()[0]
+                if count > max_entries:
+                    connection.execute(
+                        "DELETE FROM entries WHERE namespace = ? AND key IN (SELECT key FROM entries WHERE namespace = ? ORDER BY last_used ASC LIMIT ?)",
+                        (namespace, namespace, count - max_entries)
+                    )
+                    __stats[namespace]["evictions"] += count - max_entries
+            connection.commit()
+    except Exception as e:
+        print_lg(f'Failed to write to AI cache "{namespace}"!', e)
+
+
+def get_cache_stats() -> dict[str, dict[str, int]]:
+    '''
+    Function to get hits, misses, stores and evictions counted in this run, per namespace
+    '''
+    with __lock:
+        return {namespace: dict(counts) for namespace, counts in __stats.items()}
+
+
+def close_ai_cache() -> None:
+    '''
+    Function to log cache statistics of this run and close the connection to the AI cache database
+    '''
+    global __connection
+    for namespace, counts in get_cache_stats().items():
+        lookups = counts["hits"] + counts["misses"]
+        hit_rate = f"{100 * counts['hits'] / lookups:.1f}%" if lookups else "N/A"
+        print_lg(f'AI cache "{namespace}": {counts["hits"]} hits, {counts["misses"]} misses ({hit_rate} hit rate), {counts["stores"]} stored, {counts["evictions"]} evicted')
+    if __connection is not None:
+        __connection.close()
+        __connection = None
+##<
@@ -1,5 +1,12 @@
 from config.secrets import *
-from modules.helpers import print_lg
+from config.settings import skills_cache_max_entries, skills_cache_ttl_days, remember_ai_answers, scope_textarea_answers_to_job, answers_cache_max_entries, ai_prefetch, ai_prefetch_workers, ollama_warm_up_model, ai_batch_questions, ai_async_client
+from modules.helpers import print_lg, timed
+from modules.ai.aiCache import normalize_text, make_cache_key, prompt_version, cache_get, cache_put, close_ai_cache
+from modules.ai.compaction import compact_description, compact_whitespace
+from modules.ai.prompts import extract_skills_prompt, extract_skills_response_format, ai_answer_prompt
+import re
+import json
+from concurrent.futures import ThreadPoolExecutor, Future
 from typing import Dict, List, Any, Union, Literal
 
 # Import AI provider modules
@@ -13,6 +20,13 @@ try:
 except ImportError:
     print_lg("Ollama module not available")
 
+try:
+    from modules.ai.asyncConnections import is_async_client_available, run_ai, close_async_client, extract_skills_async, answer_question_async, answer_questions_async
+except ImportError:
+    print_lg("Async AI client not available")
+    is_async_client_available = lambda: False
+    close_async_client = lambda: None
+
 # Global client for OpenAI
 openai_client = None
 
@@ -33,8 +47,9 @@ def initialize_ai():
         provider = globals().get('ai_provider', 'unknown').lower()
 
         if provider == "ollama":
-            # Check if Ollama is running
-            if not ollama_is_running():
+            # Check if Ollama is running, the same models list is used to check for the model below
+            models = ollama_get_models_list()
+            if any(isinstance(model, dict) and model.get("error") for model in models):
                 print_lg("Ollama is not running. Please start Ollama and try again.")
                 if not globals().get('use_AI_if_ollama_not_running', False):
                     print_lg("Disabling AI functionality as Ollama is not running")
@@ -47,7 +62,7 @@ def initialize_ai():
             ollama_model_name = globals().get('ollama_model', 'gemma3:4b')
 
             # Check if the configured model exists
-            if not ollama_model_exists(ollama_model_name):
+            if not ollama_model_exists(ollama_model_name, models):
                 print_lg(f"Model '{ollama_model_name}' not found in Ollama. Please pull the model or choose another one.")
                 if not globals().get('use_AI_if_ollama_not_running', False):
                     print_lg("Disabling AI functionality as the model is not available")
@@ -56,6 +71,8 @@ def initialize_ai():
                     print_lg("Continuing without AI functionality as the model is not available")
                     return False
 
+            if ollama_warm_up_model: ollama_warm_up(ollama_model_name)
+
             print_lg(f"Successfully initialized Ollama with model: {ollama_model_name}")
             return True
 
@@ -77,33 +94,94 @@ def initialize_ai():
         print_lg(f"Error initializing AI: {str(e)}")
         return False
 
+def use_async_client() -> bool:
+    """
+    Check if AI requests should go through the async client (see `asyncConnections.py`), which limits how many run at once.
+    """
+    return ai_async_client and is_async_client_available()
+
+def get_ai_model_name() -> str:
+    """
+    Get the name of the model used by the configured AI provider.
+    """
+    provider = globals().get('ai_provider', 'unknown').lower()
+    if provider == "ollama":
+        return f"ollama/{globals().get('ollama_model', 'gemma3:4b')}"
+    return f"{provider}/{globals().get('llm_model', 'unknown')}"
+
+# Changes whenever the skills prompt or its response format is edited, so stale cached skills are not reused
+skills_prompt_version = prompt_version(extract_skills_prompt, json.dumps(extract_skills_response_format, sort_keys=True))
+
 def extract_skills(job_description: str) -> Dict:
     """
     Extract skills from a job description using the configured AI provider.
+    Results are cached by the compacted job description that's sent (see `compaction.py`), model and prompt version,
+    so repeated postings skip the AI call and changing the compaction settings doesn't reuse old skills.
     """
     # Check if AI is enabled in configuration
     if not globals().get('use_AI', False):
         print_lg("AI is disabled, cannot extract skills")
         return {"error": "AI is disabled"}
 
+    job_description = compact_description(job_description)
+    cache_key = make_cache_key(job_description, get_ai_model_name(), skills_prompt_version)
+    if skills_cache_max_entries > 0:
+        cached_skills = cache_get("skills", cache_key, skills_cache_ttl_days)
+        if cached_skills is not None:
+            print_lg("Using cached skills for this job description")
+            return cached_skills
+
     try:
         # Get the AI provider from global configuration
         provider = globals().get('ai_provider', 'unknown').lower()
 
-        if provider == "ollama":
+        if use_async_client():
+            print_lg(f"Using {provider} async client to extract skills")
+            with timed("ai call: extract skills"): skills = run_ai(extract_skills_async(job_description))
+        elif provider == "ollama":
             print_lg("Using Ollama to extract skills")
-            return ollama_extract_skills(job_description)
+            with timed("ai call: extract skills"): skills = ollama_extract_skills(job_description)
         elif provider == "openai" and openai_client:
             print_lg("Using OpenAI to extract skills")
-            return ai_extract_skills(openai_client, job_description)
+            with timed("ai call: extract skills"): skills = ai_extract_skills(openai_client, job_description)
         else:
             print_lg(f"No valid AI provider configured: {provider}")
             return {"error": f"No valid AI provider configured: {provider}"}
+
+        if skills_cache_max_entries > 0 and isinstance(skills, dict) and "error" not in skills:
+            cache_put("skills", cache_key, skills, skills_cache_max_entries)
+        return skills
     except Exception as e:
         print_lg(f"Error extracting skills: {str(e)}")
         return {"error": f"Error extracting skills: {str(e)}"}
 
-def answer_question(
+# Changes whenever the answer prompt is edited, so remembered answers are regenerated with the new prompt
+answer_prompt_version = prompt_version(ai_answer_prompt)
+
+def is_valid_ai_answer(answer: Any) -> bool:
+    """
+    Check if `answer` returned by an AI provider is a usable answer and not an error message.
+    """
+    return isinstance(answer, str) and answer.strip() != "" and not answer.startswith(("Error ", "AI is disabled", "No valid AI provider"))
+
+def get_answer_memo_key(
+    question: str,
+    options: List[str] = None,
+    question_type: str = 'text',
+    job_description: str = None,
+    user_information_all: str = None
+) -> str:
+    """
+    Build the key used to remember an AI answer.
+    Keyed by normalized question label, question type and option set (order doesn't matter). Textarea answers are
+    also keyed by the job description if `scope_textarea_answers_to_job` is enabled, as they're usually job specific.
+    The AI model, user information and answer prompt are part of the key, so changing any of them doesn't reuse old answers.
+    """
+    scope = job_description if question_type == 'textarea' and scope_textarea_answers_to_job else None
+    option_set = sorted(normalize_text(option) for option in options) if options else []
+    return make_cache_key(question, question_type, option_set, scope, user_information_all or "", get_ai_model_name(), answer_prompt_version)
+
+def generate_answer(
     question: str,
     options: List[str] = None,
     question_type: Literal['text', 'textarea', 'single_select', 'multiple_select'] = 'text',
@@ -112,19 +190,19 @@ def answer_question(
     user_information_all: str = None
 ) -> str:
     """
-    Generate an answer to a question using the configured AI provider.
+    Generate an answer to a question using the configured AI provider, without using or updating remembered answers.
+    The job description and user information are compacted first (see `compaction.py`).
     """
-    # Check if AI is enabled in configuration
-    if not globals().get('use_AI', False):
-        print_lg("AI is disabled, cannot answer question")
-        return "AI is disabled"
-
-    try:
-        # Get the AI provider from global configuration
-        provider = globals().get('ai_provider', 'unknown').lower()
+    provider = globals().get('ai_provider', 'unknown').lower()
+    job_description = compact_description(job_description)
+    user_information_all = compact_whitespace(user_information_all)
 
-        if provider == "ollama":
-            print_lg(f"Using Ollama to answer question: {question}")
+    if use_async_client():
+        print_lg(f"Using {provider} async client to answer question: {question}")
+        with timed("ai call: answer question"): return run_ai(answer_question_async(question, options, question_type, job_description, about_company, user_information_all))
+    elif provider == "ollama":
+        print_lg(f"Using Ollama to answer question: {question}")
+        with timed("ai call: answer question"):
             return ollama_answer_question(
                 question,
                 options,
@@ -133,8 +211,9 @@ def answer_question(
                 about_company,
                 user_information_all
             )
-        elif provider == "openai" and openai_client:
-            print_lg(f"Using OpenAI to answer question: {question}")
+    elif provider == "openai" and openai_client:
+        print_lg(f"Using OpenAI to answer question: {question}")
+        with timed("ai call: answer question"):
             return ai_answer_question(
                 openai_client,
                 question,
@@ -144,19 +223,279 @@ def answer_question(
                 about_company,
                 user_information_all
             )
-        else:
-            print_lg(f"No valid AI provider configured: {provider}")
-            return f"No valid AI provider configured: {provider}"
+    else:
+        print_lg(f"No valid AI provider configured: {provider}")
+        return f"No valid AI provider configured: {provider}"
+
+def get_remembered_answer(memo_key: str, question: str, question_type: str = 'text', options: List[str] = None) -> str | None:
+    """
+    Get the answer remembered under `memo_key`, waiting for it if it's being prefetched in the background.
+    Prefetched answers are checked with `check_answer()` first. Returns None if there's no usable one.
+    """
+    prefetched_answer = pending_answers.get(memo_key)
+    if prefetched_answer is not None:
+        print_lg(f"Waiting for answer prefetched in background for question: {question}")
+        try:
+            answer = check_answer(prefetched_answer.result(), question, question_type, options)
+            if answer is not None: return answer
+            print_lg(f"Prefetched answer isn't usable, answering again: {question}")
+        except Exception as e:
+            print_lg(f"Prefetched answer failed, answering again: {str(e)}")
+    remembered_answer = cache_get("answers", memo_key)
+    if remembered_answer is not None:
+        print_lg(f"Using remembered answer for question: {question}")
+    return remembered_answer
+
+def answer_question(
+    question: str,
+    options: List[str] = None,
+    question_type: Literal['text', 'textarea', 'single_select', 'multiple_select'] = 'text',
+    job_description: str = None,
+    about_company: str = None,
+    user_information_all: str = None,
+    company: str = None
+) -> str:
+    """
+    Generate an answer to a question using the configured AI provider.
+    If `remember_ai_answers` is enabled, a previously remembered answer to the same question is returned without calling the AI,
+    and if the same question is already being answered in the background (see `prefetch_answers`), that answer is awaited instead.
+    If `company` is given, the question is remembered as one that company asks, so it can be prefetched for its next jobs.
+    """
+    # Check if AI is enabled in configuration
+    if not globals().get('use_AI', False):
+        print_lg("AI is disabled, cannot answer question")
+        return "AI is disabled"
+
+    if company:
+        remember_company_question(company, question, question_type, options)
+
+    memo_key = None
+    if remember_ai_answers:
+        memo_key = get_answer_memo_key(question, options, question_type, job_description, user_information_all)
+        remembered_answer = get_remembered_answer(memo_key, question, question_type, options)
+        if remembered_answer is not None:
+            return remembered_answer
+
+    try:
+        answer = generate_answer(question, options, question_type, job_description, about_company, user_information_all)
+        if memo_key and is_valid_ai_answer(answer):
+            cache_put("answers", memo_key, answer, answers_cache_max_entries)
+        return answer
     except Exception as e:
         print_lg(f"Error answering question: {str(e)}")
         return f"Error answering question: {str(e)}"
 
+
+##> Batched answers
+'''
+An Easy Apply page often has several questions the bot can't answer from the config. Instead of one AI request
+per question, each sending the same job description and user information, `answer_questions_batch()` asks for
+all of them in a single request that returns a JSON object of answers. Every answer is checked for its question
+(a number for "years" questions, one of the options for select questions, Yes or No for Yes/No questions), and
+questions without a usable answer are left out, so the caller can fall back to `answer_question()` for them.
+'''
+
+# Questions with these words want a number
+numeric_question = re.compile(r"\b(years?|how many|how much|number of|months?)\b", re.IGNORECASE)
+
+def check_answer(answer: Any, question: str, question_type: str = 'text', options: List[str] = None) -> str | None:
+    """
+    Check `answer` given by the AI to `question` and return it cleaned up, or None if it's not usable.
+    * Select questions must be answered with one of `options` (case doesn't matter), or "Yes" or "No" if no options are given
+    * Text questions asking for years or counts must be answered with a number
+    """
+    if not is_valid_ai_answer(answer): return None
+    answer = answer.strip().strip('"').strip()
+    if question_type in ('single_select', 'multiple_select'):
+        choices = options or ["Yes", "No"]
+        return next((choice for choice in choices if choice.strip().lower() == answer.lower()), None)
+    if question_type == 'text' and numeric_question.search(question):
+        number = re.search(r"\d+(\.\d+)?", answer)
+        return number.group() if number else None
+    return answer
+
+def answer_questions_batch(
+    questions: List[Dict[str, Any]],
+    job_description: str = None,
+    about_company: str = None,
+    user_information_all: str = None,
+    company: str = None
+) -> Dict[str, str]:
+    """
+    Answer all `questions` of a form page with a single request to the configured AI provider.
+    Each question is a dict with `question`, `question_type` ('text', 'textarea', 'single_select' or 'multiple_select')
+    and optional `options`. Returns a dict of question to checked answer (see `check_answer()`), remembered answers
+    are used and new ones remembered as in `answer_question()`. Nothing is asked if `ai_batch_questions = False` or
+    only one question is left, those are left to `answer_question()`.
+    """
+    answers = {}
+    if not ai_batch_questions or not globals().get('use_AI', False):
+        return answers
+
+    unanswered = []
+    for item in questions:
+        question, question_type, options = item["question"], item.get("question_type", 'text'), item.get("options")
+        if company:
+            remember_company_question(company, question, question_type, options)
+        memo_key = get_answer_memo_key(question, options, question_type, job_description, user_information_all) if remember_ai_answers else None
+        remembered_answer = get_remembered_answer(memo_key, question, question_type, options) if memo_key else None
+        if remembered_answer is not None:
+            answers[question] = remembered_answer
+        elif question not in (pending["question"] for pending in unanswered):
+            unanswered.append({"id": f"q{len(unanswered) + 1}", "question": question, "question_type": question_type, "options": options, "memo_key": memo_key})
+    if len(unanswered) < 2:
+        return answers
+
+    provider = globals().get('ai_provider', 'unknown').lower()
+    job_description = compact_description(job_description)
+    user_information_all = compact_whitespace(user_information_all)
+    try:
+        if use_async_client():
+            print_lg(f"Using {provider} async client to answer {len(unanswered)} questions at once")
+            with timed("ai call: answer questions"): response = run_ai(answer_questions_async(unanswered, job_description, about_company, user_information_all))
+        elif provider == "ollama":
+            print_lg(f"Using Ollama to answer {len(unanswered)} questions at once")
+            with timed("ai call: answer questions"): response = ollama_answer_questions(unanswered, job_description, about_company, user_information_all)
+        elif provider == "openai" and openai_client:
+            print_lg(f"Using OpenAI to answer {len(unanswered)} questions at once")
+            with timed("ai call: answer questions"): response = ai_answer_questions(openai_client, unanswered, job_description, about_company, user_information_all)
+        else:
+            print_lg(f"No valid AI provider configured: {provider}")
+            return answers
+    except Exception as e:
+        print_lg(f"Error answering questions: {str(e)}")
+        return answers
+    if not isinstance(response, dict) or "error" in response:
+        print_lg(f"Batched answers failed, answering one by one: {response.get('error') if isinstance(response, dict) else response}")
+        return answers
+
+    for pending in unanswered:
+        answer = check_answer(response.get(pending["id"]), pending["question"], pending["question_type"], pending["options"])
+        if answer is None:
+            print_lg(f'AI gave no usable answer for question "{pending["question"]}": {response.get(pending["id"])}')
+            continue
+        answers[pending["question"]] = answer
+        if pending["memo_key"]:
+            cache_put("answers", pending["memo_key"], answer, answers_cache_max_entries)
+    return answers
+##<
+
+
+##> Background prefetch
+'''
+The browser sits idle while the AI thinks. These functions start skill extraction and answers to questions a
+company asked before in a background thread pool as soon as the job description is scraped, so the AI works
+while the bot clicks through the Easy Apply form. Results are picked up where they're needed with
+`collect_skills()` and `answer_question()`, which fall back to calling the AI directly if nothing was prefetched.
+'''
+
+prefetch_executor: ThreadPoolExecutor | None = None
+pending_skills: Dict[str, Future] = {}
+pending_answers: Dict[str, Future] = {}
+
+# Max number of questions remembered per company for prefetching
+max_company_questions = 50
+
+def get_prefetch_executor() -> ThreadPoolExecutor:
+    """
+    Get the thread pool used for background AI calls, creating it on first use.
+    """
+    global prefetch_executor
+    if prefetch_executor is None:
+        prefetch_executor = ThreadPoolExecutor(max_workers=ai_prefetch_workers, thread_name_prefix="ai-prefetch")
+    return prefetch_executor
+
+def remember_company_question(company: str, question: str, question_type: str, options: List[str] = None) -> None:
+    """
+    Remember that `company` asked `question`, so it can be answered in advance for that company's next jobs.
+    """
+    key = make_cache_key(company)
+    known_questions = cache_get("company_questions", key) or []
+    entry = [question, question_type, options or []]
+    if entry not in known_questions:
+        known_questions = (known_questions + [entry])[-max_company_questions:]
+        cache_put("company_questions", key, known_questions, answers_cache_max_entries)
+
+def prefetch_skills(job_description: str) -> None:
+    """
+    Start extracting skills from `job_description` in the background, if `ai_prefetch` is enabled.
+    """
+    if not ai_prefetch or not globals().get('use_AI', False):
+        return
+    key = make_cache_key(job_description)
+    if key in pending_skills:
+        return
+    # Done but uncollected results (Eg: skipped jobs) are in the skills cache already, no need to keep them here
+    for done_key in [pending_key for pending_key, future in pending_skills.items() if future.done()]:
+        pending_skills.pop(done_key, None)
+    pending_skills[key] = get_prefetch_executor().submit(extract_skills, job_description)
+
+def collect_skills(job_description: str) -> Dict:
+    """
+    Get skills extracted from `job_description`, waiting for the background extraction if one was started,
+    else extracting them right away.
+    """
+    future = pending_skills.pop(make_cache_key(job_description), None)
+    if future is not None:
+        try:
+            return future.result()
+        except Exception as e:
+            print_lg(f"Background skill extraction failed, extracting again: {str(e)}")
+    return extract_skills(job_description)
+
+def __prefetch_answer(memo_key: str, question: str, options: List[str], question_type: str, job_description: str, user_information_all: str) -> str:
+    answer = cache_get("answers", memo_key)
+    if answer is None:
+        answer = generate_answer(question, options, question_type, job_description, None, user_information_all)
+        if check_answer(answer, question, question_type, options) is not None:
+            cache_put("answers", memo_key, answer, answers_cache_max_entries)
+    return answer
+
+def prefetch_answers(company: str, job_description: str = None, user_information_all: str = None) -> None:
+    """
+    Start answering questions `company` asked in earlier applications in the background, if `ai_prefetch` and
+    `remember_ai_answers` are enabled. Questions with a remembered answer cost nothing.
+    """
+    if not ai_prefetch or not remember_ai_answers or not company or not globals().get('use_AI', False):
+        return
+    for question, question_type, options in cache_get("company_questions", make_cache_key(company)) or []:
+        memo_key = get_answer_memo_key(question, options, question_type, job_description, user_information_all)
+        if memo_key in pending_answers:
+            continue
+        future = get_prefetch_executor().submit(__prefetch_answer, memo_key, question, options, question_type, job_description, user_information_all)
+        pending_answers[memo_key] = future
+        future.add_done_callback(lambda done, memo_key=memo_key: pending_answers.pop(memo_key, None))
+
+def shutdown_prefetch() -> None:
+    """
+    Cancel queued background AI calls and stop the prefetch thread pool.
+    """
+    global prefetch_executor
+    if prefetch_executor is not None:
+        prefetch_executor.shutdown(wait=False, cancel_futures=True)
+        prefetch_executor = None
+    pending_skills.clear()
+    pending_answers.clear()
+##<
+
+def warm_up_ai() -> None:
+    """
+    Load the local model again in the background (Eg: after a long sleep between cycles), so the next AI call doesn't pay for it.
+    Does nothing for providers other than Ollama or if `ollama_warm_up_model = False`.
+    """
+    if not ollama_warm_up_model or globals().get('ai_provider', 'unknown').lower() != "ollama": return
+    get_prefetch_executor().submit(ollama_warm_up)
+
+
 def cleanup_ai():
     """
     Clean up AI resources when the application is closing.
     """
     global openai_client
 
+    shutdown_prefetch()
+    close_async_client()
+
     # Get AI provider from globals
     provider = globals().get('ai_provider', 'unknown').lower()
 
@@ -169,4 +508,7 @@ def cleanup_ai():
         except Exception as e:
             print_lg(f"Error closing OpenAI client: {str(e)}")
     elif provider == "ollama":
-        print_lg("No cleanup needed for Ollama")
+        print_lg("Closing Ollama connections...")
+        close_ollama_session()
+
+    close_ai_cache()
@@ -0,0 +1,308 @@
+from config.secrets import *
+from config.settings import ai_connect_timeout, ai_read_timeout, ai_max_retries, ai_max_concurrent_requests, ai_request_timeout
+
+from modules.helpers import print_lg, critical_error_log, convert_to_json, strip_code_fence
+from modules.ai.prompts import *
+from modules.ai.ollamaConnections import find_schema_error, log_ollama_timings, ollama_keep_alive_value
+
+import json
+import asyncio
+from abc import ABC, abstractmethod
+from threading import Thread, Lock
+from concurrent.futures import Future
+from typing import Any, Coroutine, Dict, List, Literal, Union
+
+try:
+    import httpx
+    from openai import AsyncOpenAI
+    from modules.ai.openaiConnections import model_supports_temperature
+except ImportError:
+    httpx = AsyncOpenAI = None
+
+
+##> Async AI client
+"""
+One client interface for Ollama and OpenAI compatible servers, running on a single asyncio event loop in a
+background thread. Any thread can hand it work with `run_ai()` (waits for the result) or `submit_ai()` (returns
+a `Future`), so skill extraction, background answers and the main thread's questions are sent concurrently.
+
+* At most `ai_max_concurrent_requests` requests are sent at once (a bounded semaphore), the rest wait their turn
+* Every request is cancelled if it takes longer than `ai_request_timeout` seconds, waiting for a turn included
+* Cancelling the `Future` from `submit_ai()`, or `close_async_client()`, cancels requests that are still running
+"""
+
+__loop: asyncio.AbstractEventLoop | None = None
+__thread: Thread | None = None
+__client = None
+__lock = Lock()
+
+
+class AsyncAIClient(ABC):
+    """
+    Common interface of the async AI clients, subclasses only implement `_complete()` and `close()`.
+    """
+    name = "AI"
+
+    def __init__(self, max_concurrent: int = ai_max_concurrent_requests, timeout: float = ai_request_timeout) -> None:
+        self.semaphore = asyncio.BoundedSemaphore(max_concurrent)
+        self.timeout = timeout
+
+    @abstractmethod
+    async def _complete(self, messages: List[Dict[str, str]], schema: Dict | None, response_format: Dict | None, temperature: float) -> str:
+        """
+        Send `messages` once and return the reply's text.
+        """
+
+    async def __send(self, messages: List[Dict[str, str]], schema: Dict | None, response_format: Dict | None, temperature: float) -> str:
+        async with self.semaphore:
+            return await self._complete(messages, schema, response_format, temperature)
+
+    async def complete(self, messages: List[Dict[str, str]], response_format: Dict = None, temperature: float = 0.7) -> Union[str, Dict]:
+        """
+        Send `messages` and return the reply's text, or its parsed JSON if `response_format` is given (OpenAI style, servers that don't take it are asked for the JSON in the prompt).
+        JSON replies not matching the schema are asked for once more with the mistake pointed out.
+        Raises `asyncio.TimeoutError` if it takes longer than `timeout` seconds.
+        """
+        schema = response_format["json_schema"]["schema"] if response_format and response_format.get("type") == "json_schema" else None
+        result = await asyncio.wait_for(self.__send(messages, schema, response_format, temperature), self.timeout)
+        if not response_format: return result
+        if not schema: return convert_to_json(result)
+        for attempt in range(2):
+            try:
+                parsed = json.loads(strip_code_fence(result))
+                error = find_schema_error(parsed, schema)
+            except json.JSONDecodeError as e:
+                parsed, error = None, f"response is not valid JSON ({e})"
+            if error is None: return parsed
+            print_lg(f"{self.name} response didn't match the expected format: {error}")
+            if attempt == 1: break
+            messages = list(messages) + [
+                {"role": "assistant", "content": result},
+                {"role": "user", "content": f"That response is invalid: {error}. Reply again with only the JSON object, matching the schema exactly."}
+            ]
+            result = await asyncio.wait_for(self.__send(messages, schema, response_format, temperature), self.timeout)
+        return {"error": f"{self.name} response didn't match the expected format: {error}", "data": result}
+
+    @abstractmethod
+    async def close(self) -> None:
+        """
+        Close the connections of the client.
+        """
+
+
+class AsyncOllamaClient(AsyncAIClient):
+    """
+    Async client for Ollama's `/api/chat`, JSON schemas are passed as `format`.
+    """
+    name = "Ollama"
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.model = globals().get('ollama_model', 'gemma3:4b')
+        self.http = httpx.AsyncClient(
+            base_url=globals().get('ollama_api_url', 'http://localhost:11434'),
+            timeout=httpx.Timeout(ai_read_timeout, connect=ai_connect_timeout),
+            transport=httpx.AsyncHTTPTransport(retries=ai_max_retries)
+        )
+
+    async def _complete(self, messages: List[Dict[str, str]], schema: Dict | None, response_format: Dict | None, temperature: float) -> str:
+        payload = {
+            "model": self.model,
+            "messages": list(messages),
+            "stream": False,
+            "keep_alive": ollama_keep_alive_value,
+            "options": {"temperature": temperature}
+        }
+        if schema: payload["format"] = schema
+        response = await self.http.post("/api/chat", json=payload)
+        if response.status_code != 200:
+            raise Exception(f"Ollama API error: {response.status_code} - {response.text}")
+        data = response.json()
+        log_ollama_timings(data, self.model)
+        return data.get("message", {}).get("content", "")
+
+    async def close(self) -> None:
+        await self.http.aclose()
+
+
+class AsyncOpenAIClient(AsyncAIClient):
+    """
+    Async client for OpenAI and OpenAI compatible servers configured in `secrets.py`.
+    """
+    name = "OpenAI"
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.model = globals().get('llm_model', '')
+        self.openai = AsyncOpenAI(
+            base_url=globals().get('llm_api_url'),
+            api_key=globals().get('llm_api_key'),
+            timeout=httpx.Timeout(ai_read_timeout, connect=ai_connect_timeout),
+            max_retries=ai_max_retries
+        )
+
+    async def _complete(self, messages: List[Dict[str, str]], schema: Dict | None, response_format: Dict | None, temperature: float) -> str:
+        params = {"model": self.model, "messages": list(messages)}
+        if model_supports_temperature(self.model):
+            params["temperature"] = temperature
+        if response_format and globals().get('llm_spec') in ["openai", "openai-like"]:
+            params["response_format"] = response_format
+        elif response_format:
+            params["messages"] = add_response_format_prompt(messages, response_format)
+        completion = await self.openai.chat.completions.create(**params)
+        if completion.model_extra and completion.model_extra.get("error"):
+            raise ValueError(f'Error occurred with API: "{completion.model_extra.get("error")}"')
+        return completion.choices[0].message.content or ""
+
+    async def close(self) -> None:
+        await self.openai.close()
+
+
+def is_async_client_available() -> bool:
+    """
+    Check if the async client can be used for the configured AI provider (needs `httpx` and `openai` installed).
+    """
+    return httpx is not None and globals().get('ai_provider', 'unknown').lower() in ("ollama", "openai")
+
+
+def __get_loop() -> asyncio.AbstractEventLoop:
+    global __loop, __thread
+    with __lock:
+        if __loop is None:
+            __loop = asyncio.new_event_loop()
+            __thread = Thread(target=__loop.run_forever, name="ai-async-loop", daemon=True)
+            __thread.start()
+    return __loop
+
+
+def get_async_client() -> AsyncAIClient:
+    """
+    Get the async client of the configured AI provider, creating it on first use.
+    """
+    global __client
+    with __lock:
+        if __client is None:
+            provider = globals().get('ai_provider', 'unknown').lower()
+            __client = AsyncOllamaClient() if provider == "ollama" else AsyncOpenAIClient()
+            print_lg(f"Created async {__client.name} client, sending up to {ai_max_concurrent_requests} requests at once")
+    return __client
+
+
+def submit_ai(coroutine: Coroutine) -> Future:
+    """
+    Start `coroutine` on the AI event loop and return a `Future` for its result. Cancelling the `Future` cancels the request.
+    """
+    return asyncio.run_coroutine_threadsafe(coroutine, __get_loop())
+
+
+def run_ai(coroutine: Coroutine) -> Any:
+    """
+    Run `coroutine` on the AI event loop and wait for its result, requests from other threads keep running meanwhile.
+    """
+    future = submit_ai(coroutine)
+    try:
+        return future.result()
+    except BaseException:
+        future.cancel()
+        raise
+
+
+async def __shutdown() -> None:
+    global __client
+    tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    for task in tasks: task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    if __client is not None:
+        await __client.close()
+        __client = None
+
+
+def close_async_client() -> None:
+    """
+    Cancel running requests, close the async client and stop the AI event loop.
+    """
+    global __loop, __thread
+    if __loop is None: return
+    try:
+        asyncio.run_coroutine_threadsafe(__shutdown(), __loop).result(10)
+    except Exception as e:
+        print_lg(f"Error closing async AI client: {str(e)}")
+    __loop.call_soon_threadsafe(__loop.stop)
+    __thread.join(10)
+    __loop.close()
+    __loop = __thread = None
+
+
+def add_context(prompt: str, job_description: str = None, about_company: str = None) -> str:
+    """
+    Append the job description and company details to `prompt`, if known.
+    """
+    if job_description and job_description != "Unknown":
+        prompt += f"\nJob Description:\n{job_description}"
+    if about_company and about_company != "Unknown":
+        prompt += f"\nAbout the Company:\n{about_company}"
+    return prompt
+
+
+async def extract_skills_async(job_description: str) -> Dict:
+    """
+    Extract skills from `job_description` with the async client.
+    Returns the skills, or a dict with an "error" key if it failed.
+    """
+    client = get_async_client()
+    try:
+        messages = [{"role": "user", "content": extract_skills_prompt.format(job_description)}]
+        return await client.complete(messages, response_format=extract_skills_response_format)
+    except Exception as e:
+        if isinstance(e, asyncio.TimeoutError): error_msg = f"{client.name} took more than {client.timeout}s to extract skills"
+        else: error_msg = f"Error occurred while extracting skills using {client.name}: {str(e)}"
+        critical_error_log(error_msg, e)
+        return {"error": error_msg}
+
+
+async def answer_question_async(
+    question: str,
+    options: List[str] = None,
+    question_type: Literal['text', 'textarea', 'single_select', 'multiple_select'] = 'text',
+    job_description: str = None,
+    about_company: str = None,
+    user_information_all: str = None
+) -> str:
+    """
+    Answer a form question with the async client, same prompt as `ollama_answer_question()` and `ai_answer_question()`.
+    Returns the answer, or a message starting with "Error " if it failed.
+    """
+    client = get_async_client()
+    try:
+        prompt = add_context(ai_answer_prompt.format(user_information_all or "N/A", question), job_description, about_company)
+        if options and question_type in ('single_select', 'multiple_select'):
+            prompt += f"\nOptions: {', '.join(options)}"
+        return await client.complete([{"role": "user", "content": prompt}])
+    except Exception as e:
+        if isinstance(e, asyncio.TimeoutError): error_msg = f"Error answering question: {client.name} took more than {client.timeout}s"
+        else: error_msg = f"Error answering question using {client.name}: {str(e)}"
+        critical_error_log(error_msg, e)
+        return error_msg
+
+
+async def answer_questions_async(
+    questions: List[Dict[str, Any]],
+    job_description: str = None,
+    about_company: str = None,
+    user_information_all: str = None
+) -> Dict[str, str]:
+    """
+    Answer all `questions` of a form page in one request with the async client, see `ollama_answer_questions()`.
+    Returns a dict of question id to answer, or with an "error" key if it failed.
+    """
+    client = get_async_client()
+    try:
+        prompt = add_context(ai_answer_batch_prompt.format(user_information_all or "N/A", format_batch_questions(questions)), job_description, about_company)
+        response_format = ai_answer_batch_response_format([question["id"] for question in questions])
+        return await client.complete([{"role": "user", "content": prompt}], response_format=response_format, temperature=0.3)
+    except Exception as e:
+        if isinstance(e, asyncio.TimeoutError): error_msg = f"{client.name} took more than {client.timeout}s to answer {len(questions)} questions"
+        else: error_msg = f"Error occurred while answering questions using {client.name}: {str(e)}"
+        critical_error_log(error_msg, e)
+        return {"error": error_msg}
+##<
@@ -0,0 +1,108 @@
+from config.settings import ai_strip_boilerplate, ai_description_token_budget
+
+from modules.helpers import print_lg
+
+import re
+from functools import lru_cache
+
+
+##> Job description compaction
+'''
+Every AI call about a job (skills and each form question) carries its description, and prompt length drives
+both latency and cost. Descriptions are compacted once per job before they're sent: equal opportunity and
+accommodation statements, benefits and perks sections, repeated lines and extra whitespace are removed, and
+what's left is capped at `ai_description_token_budget` tokens. Compacted descriptions are kept in memory, so
+every question on the same job's form reuses the same one.
+'''
+
+# Lines with these are legal or HR boilerplate that says nothing about the job itself
+boilerplate_line = re.compile(
+    r"equal (employment )?opportunity|affirmative action|without regard to|regardless of (race|age|gender|religion)|"
+    r"reasonable accommodation|e-verify|protected veteran|sexual orientation|gender identity|national origin|"
+    r"privacy (notice|policy)|recruitment fraud|never ask (you )?for (money|payment)|pay transparency|eeo\b",
+    re.IGNORECASE
+)
+
+# Sections starting with these headings are dropped up to the next heading
+boilerplate_heading = re.compile(
+    r"^(our |the |what we |what you'?ll get|why you'?ll love|why join)?\s*(benefits|perks|compensation (and|&) benefits|"
+    r"offer|what we offer|eeo statement|equal opportunity( employer)?|diversity,? (equity )?(and|&) inclusion|"
+    r"accommodations?|disclaimer|about (the )?benefits)\b.{0,40}$",
+    re.IGNORECASE
+)
+
+# Headings of sections about the job, which end a boilerplate section
+job_heading = re.compile(
+    r"^(about|the role|role|requirements|responsibilities|qualifications|skills|experience|education|duties|"
+    r"what you('ll| will)? (do|bring|need)|who you are|you have|nice to have|preferred|bonus|tech stack|location)",
+    re.IGNORECASE
+)
+
+# Rough number of characters per token for English text, good enough to keep prompts within a budget without a tokenizer
+chars_per_token = 4
+
+
+def is_heading(line: str) -> bool:
+    '''
+    Function to guess if `line` is a section heading (short, not a sentence, not a list item)
+    '''
+    return len(line) <= 60 and not line.endswith((".", ",", ";")) and len(line.split()) <= 8 and not line.startswith(("-", "•", "*", "·"))
+
+
+def strip_boilerplate(text: str) -> str:
+    '''
+    Function to remove boilerplate lines and sections, repeated lines and extra whitespace from `text`
+    '''
+    lines = []
+    seen = set()
+    skipping = False
+    for line in text.splitlines():
+        line = re.sub(r"\s+", " ", line).strip()
+        if not line: continue
+        if is_heading(line):
+            heading = line.rstrip(":").strip()
+            if boilerplate_heading.match(heading):
+                skipping = True
+                continue
+            if line.endswith(":") or job_heading.match(heading): skipping = False
+        if skipping or boilerplate_line.search(line): continue
+        key = line.lower()
+        if key in seen: continue
+        seen.add(key)
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def cap_to_token_budget(text: str, token_budget: int) -> str:
+    '''
+    Function to cut `text` to about `token_budget` tokens at a line or sentence end. `0` or less keeps it whole.
+    '''
+    max_chars = token_budget * chars_per_token
+    if token_budget <= 0 or len(text) <= max_chars: return text
+    cut = text[:max_chars]
+    end = max(cut.rfind("\n"), cut.rfind(". "))
+    if end > max_chars // 2: cut = cut[:end + 1]
+    return cut.rstrip() + "\n..."
+
+
+@lru_cache(maxsize=64)
+def compact_description(job_description: str) -> str:
+    '''
+    Function to get the compacted form of `job_description` to send to the AI, see module notes.
+    Returns `job_description` as is if it's empty or "Unknown".
+    '''
+    if not job_description or job_description == "Unknown": return job_description
+    compacted = strip_boilerplate(job_description) if ai_strip_boilerplate else re.sub(r"[ \t]+", " ", job_description).strip()
+    compacted = cap_to_token_budget(compacted, ai_description_token_budget)
+    print_lg(f"Compacted job description for AI from ~{len(job_description) // chars_per_token} to ~{len(compacted) // chars_per_token} tokens")
+    return compacted
+
+
+@lru_cache(maxsize=4)
+def compact_whitespace(text: str) -> str:
+    '''
+    Function to collapse repeated spaces and blank lines in `text` (Eg: user information sent with every question)
+    '''
+    if not text: return text
+    return "\n".join(re.sub(r"[ \t]+", " ", line).strip() for line in text.splitlines() if line.strip())
+##<
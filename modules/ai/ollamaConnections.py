@@ -1,14 +1,16 @@
 from config.secrets import *
-from config.settings import showAiErrorAlerts
+from config.settings import showAiErrorAlerts, ai_connect_timeout, ai_read_timeout, ai_max_retries, ollama_keep_alive
 from config.personals import ethnicity, gender, disability_status, veteran_status
 from config.questions import *
 from config.search import security_clearance, did_masters
 
-from modules.helpers import print_lg, critical_error_log, convert_to_json
+from modules.helpers import print_lg, critical_error_log, record_time, worker_id
 from modules.ai.prompts import *
 
 from pyautogui import confirm
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 from typing import Iterator, Literal, Dict, List, Any, Union
 
@@ -27,13 +29,95 @@ Open `secrets.py` in the `/config` folder to configure your Ollama settings.
 ERROR:
 """
 
+# Shared HTTP session, so every call to Ollama reuses kept-alive connections instead of opening a new one
+ollama_session = None
+
+# (connect, read) timeouts in seconds for every request to Ollama, so a hung server can't block the bot forever
+ollama_timeout = (ai_connect_timeout, ai_read_timeout)
+
+# Ollama takes `keep_alive` as a duration ("15m") or a number of seconds (-1 to keep forever, 0 to unload right away)
+ollama_keep_alive_value = int(ollama_keep_alive) if ollama_keep_alive.strip().lstrip("-").isdigit() else ollama_keep_alive.strip()
+
+# Function to get the shared Ollama HTTP session
+def get_ollama_session() -> requests.Session:
+    """
+    Function to get the shared `requests.Session` used for all calls to Ollama, creating it on first use.
+    * Keeps connections alive in a small pool
+    * Retries with exponential backoff on 5xx responses and connection errors
+    * Never retries read timeouts or dropped responses, as the generation may still be running (a hung server fails after one `ai_read_timeout`)
+    """
+    global ollama_session
+    if ollama_session is None:
+        retry = Retry(
+            total=ai_max_retries,
+            connect=ai_max_retries,
+            read=0,
+            status=ai_max_retries,
+            backoff_factor=0.5,
+            status_forcelist=[500, 502, 503, 504],
+            allowed_methods=None,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry)
+        ollama_session = requests.Session()
+        ollama_session.mount("http://", adapter)
+        ollama_session.mount("https://", adapter)
+    return ollama_session
+
+# Function to close the shared Ollama HTTP session
+def close_ollama_session() -> None:
+    """
+    Function to close the shared Ollama HTTP session and its pooled connections.
+    """
+    global ollama_session
+    if ollama_session is not None:
+        ollama_session.close()
+        ollama_session = None
+
+# Function to log how long Ollama spent loading the model versus generating
+def log_ollama_timings(data: Dict[str, Any], model_name: str) -> None:
+    """
+    Function to log and record the timings Ollama reports with a finished response (in nanoseconds).
+    * "load_duration" is the time spent loading the model into memory, the cold start that `keep_alive` avoids
+    * Recorded as "ai: model load", "ai: prompt eval" and "ai: generate" stages
+    """
+    seconds = {name: data.get(name, 0) / 1e9 for name in ("total_duration", "load_duration", "prompt_eval_duration", "eval_duration")}
+    if not seconds["total_duration"]: return
+    record_time("ai: model load", seconds["load_duration"])
+    record_time("ai: prompt eval", seconds["prompt_eval_duration"])
+    record_time("ai: generate", seconds["eval_duration"])
+    tokens_per_sec = data.get("eval_count", 0) / seconds["eval_duration"] if seconds["eval_duration"] else 0
+    print_lg(f'Ollama "{model_name}" took {seconds["total_duration"]:.1f}s: load {seconds["load_duration"]:.1f}s, prompt {seconds["prompt_eval_duration"]:.1f}s, generate {seconds["eval_duration"]:.1f}s ({tokens_per_sec:.1f} tokens/s)')
+
+# Function to load the model into memory ahead of use
+def ollama_warm_up(model: str = None) -> bool:
+    """
+    Function to load the Ollama model into memory without generating anything, and keep it there for `ollama_keep_alive`.
+    Returns True if the model is loaded, False otherwise.
+    """
+    api_url = globals().get('ollama_api_url', 'http://localhost:11434')
+    model_name = model or globals().get('ollama_model', 'gemma3:4b')
+    try:
+        print_lg(f"Warming up Ollama model: {model_name}...")
+        response = get_ollama_session().post(f"{api_url}/api/generate", json={"model": model_name, "keep_alive": ollama_keep_alive_value}, timeout=ollama_timeout)
+        if response.status_code != 200:
+            print_lg(f"Failed to warm up Ollama model: {response.status_code} - {response.text}")
+            return False
+        data = response.json()
+        record_time("ai: model load", data.get("load_duration", 0) / 1e9)
+        print_lg(f'Ollama model "{model_name}" is loaded (took {data.get("total_duration", 0) / 1e9:.1f}s), keeping it loaded for {ollama_keep_alive}')
+        return True
+    except Exception as e:
+        print_lg(f"Failed to warm up Ollama model: {str(e)}")
+        return False
+
 # Function to show an Ollama error alert
 def ollama_error_alert(message: str, error: Exception, title: str = "Ollama Connection Error") -> None:
     """
-    Function to show an Ollama error alert and log it.
+    Function to show an Ollama error alert and log it. Extra browsers only log it.
     """
     global showAiErrorAlerts
-    if showAiErrorAlerts:
+    if showAiErrorAlerts and not worker_id:
         if "Pause AI error alerts" == confirm(f"{message}\n{ollama_check_instructions}\n{str(error)}", title, ["Pause AI error alerts", "Okay Continue"]):
             showAiErrorAlerts = False
     critical_error_log(message, error)
@@ -49,7 +133,7 @@ def ollama_is_running() -> bool:
         api_url = globals().get('ollama_api_url', 'http://localhost:11434')
         print_lg(f"Checking if Ollama is running at {api_url}...")
 
-        response = requests.get(f"{api_url}/api/tags")
+        response = get_ollama_session().get(f"{api_url}/api/tags", timeout=ollama_timeout)
         is_running = response.status_code == 200
         print_lg(f"Ollama running status: {is_running}")
         return is_running
@@ -68,7 +152,7 @@ def ollama_get_models_list() -> List[Dict[str, Any]]:
         api_url = globals().get('ollama_api_url', 'http://localhost:11434')
         print_lg(f"Getting Ollama models list from {api_url}...")
 
-        response = requests.get(f"{api_url}/api/tags")
+        response = get_ollama_session().get(f"{api_url}/api/tags", timeout=ollama_timeout)
 
         if response.status_code == 200:
             models = response.json().get("models", [])
@@ -85,13 +169,14 @@ def ollama_get_models_list() -> List[Dict[str, Any]]:
         return [{"error": error_msg}]
 
 # Function to check if a model exists in Ollama
-def ollama_model_exists(model_name: str) -> bool:
+def ollama_model_exists(model_name: str, models: List[Dict[str, Any]] | None = None) -> bool:
     """
     Function to check if a model exists in Ollama.
+    Pass `models` from `ollama_get_models_list()` to skip fetching the list again.
     Returns True if the model exists, False otherwise.
     """
     try:
-        models = ollama_get_models_list()
+        if models is None: models = ollama_get_models_list()
         if any(isinstance(model, dict) and model.get("error") for model in models):
             return False
 
@@ -99,6 +184,75 @@ def ollama_model_exists(model_name: str) -> bool:
     except Exception:
         return False
 
+# Function to check a parsed JSON value against a JSON schema
+def find_schema_error(value: Any, schema: Dict[str, Any], path: str = "response") -> str | None:
+    """
+    Function to check `value` against the subset of JSON schema used in `prompts.py`
+    (type, properties, required, additionalProperties, items, enum).
+    Returns a description of the first mismatch, or None if `value` matches.
+    """
+    types = {"object": dict, "array": list, "string": str, "integer": int, "number": (int, float), "boolean": bool, "null": type(None)}
+    expected = schema.get("type")
+    if expected in types and (not isinstance(value, types[expected]) or (expected in ("integer", "number") and isinstance(value, bool))):
+        return f"{path} should be of type {expected}, got {type(value).__name__}"
+    if "enum" in schema and value not in schema["enum"]:
+        return f"{path} should be one of {schema['enum']}"
+    if isinstance(value, dict):
+        properties = schema.get("properties", {})
+        for name in schema.get("required", []):
+            if name not in value: return f'{path} is missing "{name}"'
+        if schema.get("additionalProperties") is False:
+            extra = [name for name in value if name not in properties]
+            if extra: return f"{path} has unexpected keys {extra}"
+        for name, sub_schema in properties.items():
+            if name in value:
+                error = find_schema_error(value[name], sub_schema, f"{path}.{name}")
+                if error: return error
+    if isinstance(value, list) and "items" in schema:
+        for index, item in enumerate(value):
+            error = find_schema_error(item, schema["items"], f"{path}[{index}]")
+            if error: return error
+    return None
+
+# Function to send one chat request to Ollama
+def ollama_chat(payload: Dict[str, Any], model_name: str) -> str:
+    """
+    Function to post `payload` to Ollama's `/api/chat` and return the reply's text, streaming it to the logs if `payload["stream"]`.
+    Raises an Exception if Ollama responds with an error.
+    """
+    api_url = globals().get('ollama_api_url', 'http://localhost:11434')
+    if payload["stream"]:
+        print_lg("--STREAMING STARTED")
+        response = get_ollama_session().post(f"{api_url}/api/chat", json=payload, stream=True, timeout=ollama_timeout)
+        try:
+            if response.status_code != 200:
+                raise Exception(f"Ollama API error: {response.status_code} - {response.text}")
+            result = ""
+            for line in response.iter_lines():
+                if line:
+                    chunk = json.loads(line)
+                    chunk_text = chunk.get("message", {}).get("content", "")
+                    result += chunk_text
+                    print_lg(chunk_text, end="", flush=True)
+
+                    # Check if we've reached the end of the stream, the last chunk carries the timings
+                    if chunk.get("done", False):
+                        log_ollama_timings(chunk, model_name)
+                        break
+        finally:
+            response.close()
+        print_lg("\n--STREAMING COMPLETE")
+        return result
+
+    response = get_ollama_session().post(f"{api_url}/api/chat", json=payload, timeout=ollama_timeout)
+    if response.status_code != 200:
+        error_msg = f"Ollama API error: {response.status_code} - {response.text}"
+        print_lg(error_msg)
+        raise Exception(error_msg)
+    data = response.json()
+    log_ollama_timings(data, model_name)
+    return data.get("message", {}).get("content", "")
+
 # Function to generate completions using Ollama
 def ollama_completion(
     messages: List[Dict[str, str]],
@@ -108,103 +262,61 @@ def ollama_completion(
     response_format: Dict = None
 ) -> Union[str, Dict]:
     """
-    Function to generate completions using Ollama.
+    Function to generate completions using Ollama's chat endpoint.
 
     Parameters:
     - messages: List of message dictionaries with 'role' and 'content' keys
     - model: Ollama model name to use
     - temperature: Temperature for generation (0.0 to 1.0)
     - stream: Whether to stream the response
-    - response_format: Optional format specification for JSON responses
+    - response_format: Optional OpenAI style `json_schema` format. Its schema is passed to Ollama as `format`,
+      so the model can only generate matching JSON. The reply is checked against it and asked for once more if it doesn't match.
 
     Returns:
     - String response or JSON object if response_format is specified
     """
     try:
         # Get configuration from globals
-        api_url = globals().get('ollama_api_url', 'http://localhost:11434')
         model_name = model or globals().get('ollama_model', 'gemma3:4b')
         should_stream = stream if stream is not None else globals().get('stream_output', False)
+        schema = response_format["json_schema"]["schema"] if response_format and response_format.get("type") == "json_schema" else None
 
-        print_lg(f"Generating completion using Ollama model: {model_name} at {api_url}")
-
-        # Convert OpenAI-style messages to Ollama format
-        prompt = ""
-        for msg in messages:
-            role = msg.get("role", "user")
-            content = msg.get("content", "")
+        print_lg(f"Generating completion using Ollama model: {model_name}")
 
-            if role == "system":
-                prompt = f"{content}\n\n{prompt}"
-            elif role == "user":
-                prompt += f"User: {content}\n"
-            elif role == "assistant":
-                prompt += f"Assistant: {content}\n"
-
-        # Add final prompt marker
-        prompt += "Assistant: "
-
-        # Prepare the request payload
+        # Prepare the request payload, messages are sent as they are
         payload = {
             "model": model_name,
-            "prompt": prompt,
+            "messages": list(messages),
             "stream": should_stream,
+            "keep_alive": ollama_keep_alive_value,
             "options": {
                 "temperature": temperature
             }
         }
-
-        # Make the API request
-        if should_stream:
-            print_lg("--STREAMING STARTED")
-            response = requests.post(
-                f"{api_url}/api/generate",
-                json=payload,
-                stream=True
-            )
-
-            result = ""
-            for line in response.iter_lines():
-                if line:
-                    chunk = json.loads(line)
-                    chunk_text = chunk.get("response", "")
-                    result += chunk_text
-                    print_lg(chunk_text, end="", flush=True)
-
-                    # Check if we've reached the end of the stream
-                    if chunk.get("done", False):
-                        break
-
-            print_lg("\n--STREAMING COMPLETE")
-        else:
-            response = requests.post(
-                f"{api_url}/api/generate",
-                json=payload
-            )
-
-            if response.status_code == 200:
-                result = response.json().get("response", "")
-            else:
-                error_msg = f"Ollama API error: {response.status_code} - {response.text}"
-                print_lg(error_msg)
-                raise Exception(error_msg)
-
-        # Handle JSON response format if specified
-        if response_format and response_format.get("type") == "json_schema":
-            try:
-                # Try to extract JSON from the response
-                json_start = result.find("{")
-                json_end = result.rfind("}") + 1
-
-                if json_start >= 0 and json_end > json_start:
-                    json_str = result[json_start:json_end]
-                    result = json.loads(json_str)
-                else:
-                    # If no JSON found, try to parse the whole response
-                    result = json.loads(result)
-            except json.JSONDecodeError:
-                # If JSON parsing fails, try to convert the text to JSON
-                result = convert_to_json(result)
+        if schema: payload["format"] = schema
+
+        result = ollama_chat(payload, model_name)
+
+        # Check JSON responses against the schema, asking once more with the mistake pointed out if they don't match
+        if schema:
+            for attempt in range(2):
+                try:
+                    parsed = json.loads(result)
+                    error = find_schema_error(parsed, schema)
+                except json.JSONDecodeError as e:
+                    parsed, error = None, f"response is not valid JSON ({e})"
+                if error is None:
+                    result = parsed
+                    break
+                print_lg(f"Ollama response didn't match the expected format: {error}")
+                if attempt == 1:
+                    result = {"error": f"Ollama response didn't match the expected format: {error}", "data": result}
+                    break
+                payload["messages"] = payload["messages"] + [
+                    {"role": "assistant", "content": result},
+                    {"role": "user", "content": f"That response is invalid: {error}. Reply again with only the JSON object, matching the schema exactly."}
+                ]
+                result = ollama_chat(payload, model_name)
 
         print_lg("\nOllama Answer to Question:\n")
         print_lg(result, pretty=bool(response_format))
@@ -309,3 +421,47 @@ def ollama_answer_question(
         error_msg = f"Error occurred while answering question using Ollama: {str(e)}"
         ollama_error_alert(error_msg, e)
         return "Error generating answer"
+
+# Function to answer several questions in one request using Ollama
+def ollama_answer_questions(
+    questions: List[Dict[str, Any]],
+    job_description: str = None,
+    about_company: str = None,
+    user_information_all: str = None,
+    stream: bool = None
+) -> Dict[str, str]:
+    """
+    Function to answer all `questions` of a form page in a single Ollama request.
+
+    Parameters:
+    - questions: List of dicts with `id`, `question`, `question_type` and `options` (None if not a select question)
+    - job_description: Optional job description for context
+    - about_company: Optional company details for context
+    - user_information_all: Information about the user
+    - stream: Whether to stream the response (defaults to config setting)
+
+    Returns:
+    - Dictionary mapping each question id to its answer, or with an "error" key if it failed
+    """
+    print_lg(f"-- ANSWERING {len(questions)} QUESTIONS USING OLLAMA")
+    try:
+        prompt = ai_answer_batch_prompt.format(user_information_all or "N/A", format_batch_questions(questions))
+        if job_description and job_description != "Unknown":
+            prompt += f"\nJob Description:\n{job_description}"
+        if about_company and about_company != "Unknown":
+            prompt += f"\nAbout the Company:\n{about_company}"
+
+        messages = [{"role": "user", "content": prompt}]
+        print_lg("Prompt we are passing to Ollama: ", prompt)
+
+        return ollama_completion(
+            messages=messages,
+            model=globals().get('ollama_model', 'gemma3:4b'),
+            temperature=0.3,
+            stream=stream,
+            response_format=ai_answer_batch_response_format([question["id"] for question in questions])
+        )
+    except Exception as e:
+        error_msg = f"Error occurred while answering questions using Ollama: {str(e)}"
+        ollama_error_alert(error_msg, e)
+        return {"error": error_msg}
@@ -6,7 +6,7 @@ from config.personals import ethnicity, gender, disability_status, veteran_statu
 from config.questions import *
 from config.search import security_clearance, did_masters
 
-from modules.helpers import print_lg, critical_error_log, convert_to_json
+from modules.helpers import print_lg, critical_error_log, convert_to_json, worker_id
 from modules.ai.prompts import *
 
 from pyautogui import confirm
@@ -30,10 +30,10 @@ ERROR:
 # Function to show an AI error alert
 def ai_error_alert(message: str, stackTrace: str, title: str = "AI Connection Error") -> None:
     """
-    Function to show an AI error alert and log it.
+    Function to show an AI error alert and log it. Extra browsers only log it.
     """
     global showAiErrorAlerts
-    if showAiErrorAlerts:
+    if showAiErrorAlerts and not worker_id:
         if "Pause AI error alerts" == confirm(f"{message}{stackTrace}\n", title, ["Pause AI error alerts", "Okay Continue"]):
             showAiErrorAlerts = False
     critical_error_log(message, stackTrace)
@@ -151,6 +151,8 @@ def ai_completion(client: OpenAI, messages: list[dict], response_format: dict =
         params["temperature"] = temperature
     if response_format and llm_spec in ["openai", "openai-like"]:
         params["response_format"] = response_format
+    elif response_format:
+        params["messages"] = add_response_format_prompt(messages, response_format)
 
     completion = client.chat.completions.create(params)
 
@@ -241,6 +243,35 @@ def ai_answer_question(
 ##<
 
 
+def ai_answer_questions(
+    client: OpenAI,
+    questions: list[dict],
+    job_description: str = None, about_company: str = None, user_information_all: str = None,
+    stream: bool = stream_output
+) -> dict | ValueError:
+    """
+    Function to answer all `questions` of a form page in a single AI request.
+    * Takes in `client` of type `OpenAI`
+    * Takes in `questions` of type `list[dict]` with `id`, `question`, `question_type` and `options` (None if not a select question)
+    * Takes in optional `job_description`, `about_company` and `user_information_all` for context
+    * Takes in `stream` of type `bool` to indicate if it's a streaming call
+    * Returns a `dict` mapping each question id to its answer
+    """
+    print_lg(f"-- ANSWERING {len(questions)} QUESTIONS using AI")
+    try:
+        prompt = ai_answer_batch_prompt.format(user_information_all or "N/A", format_batch_questions(questions))
+        if job_description and job_description != "Unknown":
+            prompt += f"\nJob Description:\n{job_description}"
+        if about_company and about_company != "Unknown":
+            prompt += f"\nAbout the Company:\n{about_company}"
+
+        messages = [{"role": "user", "content": prompt}]
+        print_lg("Prompt we are passing to AI: ", prompt)
+        return ai_completion(client, messages, response_format=ai_answer_batch_response_format([question["id"] for question in questions]), stream=stream)
+    except Exception as e:
+        ai_error_alert(f"Error occurred while answering questions. {apiCheckInstructions}", e)
+
+
 def ai_gen_experience(
     client: OpenAI, 
     job_description: str, about_company: str, 
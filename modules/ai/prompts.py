@@ -1,3 +1,6 @@
+import json
+
+
 
 
 ##> Common Response Formats
@@ -5,6 +8,23 @@ array_of_strings = {"type": "array", "items": {"type": "string"}}
 """
 Response schema to represent array of strings `["string1", "string2"]`
 """
+
+response_format_prompt = """
+Reply with only a JSON value matching the following JSON schema, with no additional commentary or code fences:
+{}
+"""
+"""
+Use `response_format_prompt.format(schema)` to insert the JSON `schema`, for servers that don't take `response_format`.
+"""
+
+
+def add_response_format_prompt(messages: list[dict], response_format: dict) -> list[dict]:
+    """
+    Returns `messages` with the JSON reply of `response_format` asked for in the prompt instead, for servers that don't take `response_format` (`llm_spec` other than "openai" or "openai-like").
+    """
+    schema = response_format["json_schema"]["schema"] if response_format.get("type") == "json_schema" else None
+    instructions = response_format_prompt.format(json.dumps(schema)) if schema else "Reply with only valid JSON, with no additional commentary or code fences."
+    return list(messages) + [{"role": "user", "content": instructions}]
 #<
 
 
@@ -86,4 +106,61 @@ Respond concisely based on the type of question:
 **QUESTION Strat from here:**  
 {}
 """
-#<
\ No newline at end of file
+#<
+
+##> Answer Questions in a batch
+# Structure of messages = `[{"role": "user", "content": ai_answer_batch_prompt}]`
+
+ai_answer_batch_prompt = """
+You are an intelligent AI assistant filling out a job application form and answer like a human.
+Answer every question below. Reply with only a JSON object that maps each question's id to its answer.
+Respond concisely based on the type of question:
+
+1. If the question asks for **years of experience, duration, or numeric value**, answer **only a number** (e.g., "2", "5", "10").
+2. If the question is **a Yes/No question**, answer **only "Yes" or "No"**.
+3. If the question has **options**, answer with **exactly one of the options**.
+4. If the question requires a **short description**, give a **single-sentence answer**.
+5. If the question requires a **detailed response** (type "textarea"), give a **well-structured and human-like answer with fewer than 350 characters**.
+6. Do **not** repeat the question in your answer.
+7. here is user information to answer the questions if needed:
+**User Information:**
+{}
+
+**QUESTIONS (id, type, question and options if any):**
+{}
+"""
+"""
+Use `ai_answer_batch_prompt.format(user_information_all, questions)` where `questions` has one line per question, Eg: `q1 (text): How many years of experience do you have with Python?`.
+"""
+
+
+def format_batch_questions(questions: list[dict]) -> str:
+    """
+    Lists `questions` (dicts with `id`, `question`, `question_type` and `options`) one per line for `ai_answer_batch_prompt`.
+    """
+    lines = []
+    for question in questions:
+        line = f'{question["id"]} ({question["question_type"]}): {question["question"]}'
+        if question.get("options"): line += f' Options: {", ".join(question["options"])}'
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def ai_answer_batch_response_format(question_ids: list[str]) -> dict:
+    """
+    Response schema for `answer_questions_batch`, a JSON object with one string answer for each id in `question_ids`.
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "Batch_Answers_Response",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {question_id: {"type": "string"} for question_id in question_ids},
+                "required": list(question_ids),
+                "additionalProperties": False
+            },
+        },
+    }
+#<
@@ -0,0 +1,233 @@
+from config.personals import first_name, middle_name, last_name, phone_number, street, state, zipcode, country, gender, disability_status, veteran_status
+from config.questions import years_of_experience, require_visa, website, linkedIn, us_citizenship, desired_salary, current_ctc, notice_period, linkedin_headline, linkedin_summary, cover_letter, recent_employer, confidence_level
+from config.settings import capture_pages, fixtures_folder_path
+
+from modules.helpers import compile_keywords, find_keywords, make_directories, print_lg
+
+import os
+import json
+from functools import lru_cache
+from threading import Lock
+from typing import NamedTuple
+
+
+##> Answer rules
+'''
+Rules used by `answer_questions()` to answer Easy Apply questions from the config, by the words in a question's label.
+A rule matches a label when every group in `when` has at least one of its words in the label and none of the words in
+`not` are in it. Only rules listing the question's type are tried, highest `priority` first (default 0), then in the
+order they're written here. The first match wins.
+
+`answer` is the name of the value to answer with (see `get_rule_answer()`), `text` a fixed answer. Rules with
+`pick_suggestion` type the answer and pick the first suggestion shown (Eg: city names).
+
+All words are compiled into a single regex when this module is imported, and the rule found for each label and
+question type is remembered, so labels repeated across jobs are resolved without matching again.
+
+`resolve_answer()` works out the whole answer to a question (rule, then option to pick) without a browser, so the
+same logic can be benchmarked offline on recorded labels (see `/benchmark_labels.py`).
+'''
+
+# Options picked when the answer is "Decline" and no option is exactly that
+decline_phrases = ["Decline", "not wish", "don't wish", "Prefer not", "not want"]
+
+__labels_file_name = "labels.jsonl"
+__labels_lock = Lock()
+
+answer_rules = [
+    # Select questions
+    {"name": "select: contact",         "types": ("select",),   "when": [("email", "phone")],                           "answer": "previous_answer"},
+    {"name": "select: gender",          "types": ("select",),   "when": [("gender", "sex")],                            "answer": "gender"},
+    {"name": "select: disability",      "types": ("select",),   "when": [("disability",)],                              "answer": "disability_status"},
+    {"name": "select: proficiency",     "types": ("select",),   "when": [("proficiency",)],                             "text": "Professional"},
+
+    # Radio questions
+    {"name": "radio: citizenship",      "types": ("radio",),    "when": [("citizenship", "employment eligibility")],    "answer": "us_citizenship"},
+    {"name": "radio: veteran",          "types": ("radio",),    "when": [("veteran", "protected")],                     "answer": "veteran_status"},
+    {"name": "radio: disability",       "types": ("radio",),    "when": [("disability", "handicapped")],                "answer": "disability_status"},
+
+    # Text questions
+    {"name": "text: experience",        "types": ("text",),     "when": [("experience", "years")],                      "answer": "years_of_experience"},
+    {"name": "text: phone",             "types": ("text",),     "when": [("phone", "mobile")],                          "answer": "phone_number"},
+    {"name": "text: street",            "types": ("text",),     "when": [("street",)],                                  "answer": "street"},
+    {"name": "text: city",              "types": ("text",),     "when": [("city", "location", "address")],              "answer": "city", "pick_suggestion": True},
+    {"name": "text: signature",         "types": ("text",),     "when": [("signature",)],                               "answer": "full_name"},
+    {"name": "text: full name",         "types": ("text",),     "when": [("name",), ("full",)],                         "answer": "full_name"},
+    {"name": "text: first name",        "types": ("text",),     "when": [("name",), ("first",)],    "not": ("last",),   "answer": "first_name"},
+    {"name": "text: middle name",       "types": ("text",),     "when": [("name",), ("middle",)],   "not": ("last",),   "answer": "middle_name"},
+    {"name": "text: last name",         "types": ("text",),     "when": [("name",), ("last",)],     "not": ("first",),  "answer": "last_name"},
+    {"name": "text: employer name",     "types": ("text",),     "when": [("name",), ("employer",)],                     "answer": "recent_employer"},
+    {"name": "text: name",              "types": ("text",),     "when": [("name",)],                                    "answer": "full_name"},
+    {"name": "text: notice months",     "types": ("text",),     "when": [("notice",), ("month",)],                      "answer": "notice_period_months"},
+    {"name": "text: notice weeks",      "types": ("text",),     "when": [("notice",), ("week",)],                       "answer": "notice_period_weeks"},
+    {"name": "text: notice",            "types": ("text",),     "when": [("notice",)],                                  "answer": "notice_period"},
+    {"name": "text: current ctc month", "types": ("text",),     "when": [("salary", "compensation", "ctc", "pay"), ("current", "present"), ("month",)], "answer": "current_ctc_monthly"},
+    {"name": "text: current ctc lakhs", "types": ("text",),     "when": [("salary", "compensation", "ctc", "pay"), ("current", "present"), ("lakh",)],  "answer": "current_ctc_lakhs"},
+    {"name": "text: current ctc",       "types": ("text",),     "when": [("salary", "compensation", "ctc", "pay"), ("current", "present")],             "answer": "current_ctc"},
+    {"name": "text: salary month",      "types": ("text",),     "when": [("salary", "compensation", "ctc", "pay"), ("month",)],                         "answer": "desired_salary_monthly"},
+    {"name": "text: salary lakhs",      "types": ("text",),     "when": [("salary", "compensation", "ctc", "pay"), ("lakh",)],                          "answer": "desired_salary_lakhs"},
+    {"name": "text: salary",            "types": ("text",),     "when": [("salary", "compensation", "ctc", "pay")],                                     "answer": "desired_salary"},
+    {"name": "text: linkedin",          "types": ("text",),     "when": [("linkedin",)],                                "answer": "linkedIn"},
+    {"name": "text: website",           "types": ("text",),     "when": [("website", "blog", "portfolio", "link")],     "answer": "website"},
+    {"name": "text: confidence",        "types": ("text",),     "when": [("scale of 1-10",)],                           "answer": "confidence_level"},
+    {"name": "text: headline",          "types": ("text",),     "when": [("headline",)],                                "answer": "linkedin_headline"},
+    {"name": "text: heard from",        "types": ("text",),     "when": [("hear", "come across"), ("this",), ("job", "position")], "text": "https://github.com/shahmeetk/Auto_job_applier_linkedIn"},
+    {"name": "text: state",             "types": ("text",),     "when": [("state", "province")],                        "answer": "state"},
+    {"name": "text: zip code",          "types": ("text",),     "when": [("zip", "postal", "code")],                    "answer": "zipcode"},
+    {"name": "text: country",           "types": ("text",),     "when": [("country",)],                                 "answer": "country"},
+
+    # Textarea questions
+    {"name": "textarea: summary",       "types": ("textarea",), "when": [("summary",)],                                 "answer": "linkedin_summary"},
+    {"name": "textarea: cover letter",  "types": ("textarea",), "when": [("cover",)],                                   "answer": "cover_letter"},
+
+    # Common questions, only if nothing more specific matched
+    {"name": "common: visa",            "types": ("select", "radio", "text"), "when": [("sponsorship", "visa")], "priority": -1, "answer": "require_visa"},
+]
+
+
+def compile_answer_rules(rules: list[dict]) -> tuple[tuple, dict[str, list[dict]]]:
+    '''
+    Function to compile `rules` for `find_answer_rule()`.
+    * Returns the keywords regex of all their words and the rules of each question type in the order they're tried
+    '''
+    words = {word for rule in rules for group in rule["when"] for word in group} | {word for rule in rules for word in rule.get("not", ())}
+    rules_by_type = {}
+    for rule in sorted(rules, key=lambda rule: -rule.get("priority", 0)):
+        for question_type in rule["types"]:
+            rules_by_type.setdefault(question_type, []).append(rule)
+    return compile_keywords(list(words)), rules_by_type
+
+
+answer_keywords, answer_rules_by_type = compile_answer_rules(answer_rules)
+
+
+def find_label_words(label: str) -> set[str]:
+    '''
+    Function to find all words used by the answer rules in `label` (case insensitive)
+    '''
+    return {word for word, position in find_keywords(answer_keywords, label)}
+
+
+@lru_cache(maxsize=2048)
+def find_answer_rule(label: str, question_type: str) -> dict | None:
+    '''
+    Function to find the first answer rule matching `label` for a `question_type` ("select", "radio", "text" or "textarea") question.
+    * Returns `None` if no rule matches
+    '''
+    found = find_label_words(label)
+    for rule in answer_rules_by_type.get(question_type, []):
+        if all(found.intersection(group) for group in rule["when"]) and not found.intersection(rule.get("not", ())):
+            return rule
+    return None
+
+
+def get_rule_answer(rule: dict, values: dict[str, str], **current: str) -> str:
+    '''
+    Function to get the answer of `rule`, looking up its value name in `current` (Eg: the question's previous answer) and then in `values`
+    '''
+    if "text" in rule: return rule["text"]
+    name = rule["answer"]
+    return current[name] if name in current else values[name]
+
+
+
+def get_answer_values() -> dict[str, str]:
+    '''
+    Function to get the values from the config the answer rules answer with, by name
+    '''
+    first, middle, last = first_name.strip(), middle_name.strip(), last_name.strip()
+    return {
+        "years_of_experience": years_of_experience, "phone_number": phone_number, "street": street, "country": country, "state": state, "zipcode": zipcode,
+        "full_name": f"{first} {middle} {last}" if middle else f"{first} {last}", "first_name": first, "middle_name": middle, "last_name": last, "recent_employer": recent_employer,
+        "notice_period": str(notice_period), "notice_period_months": str(notice_period//30), "notice_period_weeks": str(notice_period//7),
+        "current_ctc": str(current_ctc), "current_ctc_lakhs": str(round(current_ctc / 100000, 2)), "current_ctc_monthly": str(round(current_ctc/12, 2)),
+        "desired_salary": str(desired_salary), "desired_salary_lakhs": str(round(desired_salary / 100000, 2)), "desired_salary_monthly": str(round(desired_salary/12, 2)),
+        "linkedIn": linkedIn, "website": website, "confidence_level": confidence_level, "linkedin_headline": linkedin_headline,
+        "linkedin_summary": linkedin_summary, "cover_letter": cover_letter, "require_visa": require_visa,
+        "gender": gender, "disability_status": disability_status, "veteran_status": veteran_status, "us_citizenship": us_citizenship,
+    }
+
+
+def find_option(answer: str, options: list[str], exact_options: list[str | None] | None = None) -> tuple[int | None, str, bool]:
+    '''
+    Function to find the option to pick for `answer`.
+    * First the option in `exact_options` (defaults to `options`) equal to `answer`, else the first of `options` containing `answer` (or one of `decline_phrases` if `answer` is "Decline")
+    * Returns `(index of the option or None, answer to record, True if it was an exact match)`
+    '''
+    exact_options = options if exact_options is None else exact_options
+    if answer in exact_options: return exact_options.index(answer), answer, True
+    possible_answer_phrases = decline_phrases if answer == 'Decline' else [answer]
+    for phrase in possible_answer_phrases:
+        for index, option in enumerate(options):
+            if phrase in option:
+                return index, f'Decline ({option})' if len(possible_answer_phrases) > 1 else option, False
+    return None, answer, False
+
+
+class ConfigAnswer(NamedTuple):
+    answer: str
+    option: int | None
+    exact: bool
+    rule: dict | None
+
+
+def resolve_answer(question_type: str, label: str, values: dict[str, str], options: list[str] | None = None, exact_options: list[str | None] | None = None, **current: str) -> ConfigAnswer:
+    '''
+    Function to work out the answer to a question from the config, without touching the page.
+    * `label` is the question's lower case label, `values` from `get_answer_values()`, `current` per question values (Eg: `previous_answer`)
+    * Select and radio questions default to "Yes" and look for the option to pick in `options`, text and textarea questions default to ""
+    '''
+    rule = find_answer_rule(label, question_type)
+    if rule: answer = get_rule_answer(rule, values, **current)
+    else: answer = "Yes" if question_type in ("select", "radio") else ""
+    if options is None: return ConfigAnswer(answer, None, False, rule)
+    option, answer, exact = find_option(answer, options, exact_options)
+    return ConfigAnswer(answer, option, exact, rule)
+
+
+def get_option_text(resolved: ConfigAnswer, options: list[str] | None, exact_options: list[str | None] | None = None) -> str | None:
+    '''
+    Function to get the text of the option `resolved` picked, `None` if it picked none
+    '''
+    if resolved.option is None: return None
+    return (exact_options if resolved.exact and exact_options is not None else options)[resolved.option]
+
+
+def get_outcome(question_type: str, resolved: ConfigAnswer, use_AI: bool) -> str:
+    '''
+    Function to tell how a question was answered: "rule", "default" (a select or radio option matching "Yes"), "ai" or "random"
+    '''
+    if question_type in ("select", "radio"):
+        if resolved.option is None: return "random"
+        return "rule" if resolved.rule else "default"
+    if resolved.rule and resolved.answer != "": return "rule"
+    return "ai" if use_AI else "random"
+
+
+def record_question(question_type: str, label: str, previous_answer: str | None, resolved: ConfigAnswer, outcome: str, options: list[str] | None = None, exact_options: list[str | None] | None = None) -> None:
+    '''
+    Function to add a question seen in a real run to the labels corpus in `fixtures_folder_path`, if `capture_pages = True`.
+    The rule, option and outcome it got are saved as a snapshot, so `/benchmark_labels.py` can show what a change alters.
+    To measure accuracy, add the right `"expected_rule"` and `"expected_option"` to lines checked by hand, recording never writes them.
+    '''
+    if not capture_pages: return
+    try:
+        record = {
+            "type": question_type, "label": label, "previous_answer": previous_answer,
+            "options": options, "exact_options": exact_options if exact_options != options else None,
+            "rule": resolved.rule["name"] if resolved.rule else None, "option": get_option_text(resolved, options, exact_options), "outcome": outcome
+        }
+        with __labels_lock:
+            make_directories([fixtures_folder_path])
+            with open(os.path.join(fixtures_folder_path, __labels_file_name), "a", encoding="utf-8") as labels:
+                labels.write(json.dumps(record) + "\n")
+    except Exception as e:
+        print_lg("Failed to record question label!", e)
+
+
+def get_labels_path(folder: str = fixtures_folder_path) -> str:
+    '''
+    Function to get the path of the labels corpus in `folder`
+    '''
+    return os.path.join(folder, __labels_file_name)
+##<
@@ -1,7 +1,11 @@
 
 
-from config.settings import click_gap, smooth_scroll
-from modules.helpers import buffer, print_lg, sleep
+import os
+
+from time import perf_counter
+
+from config.settings import click_gap, smooth_scroll, page_settle_max_wait, suggestions_max_wait
+from modules.helpers import buffer, print_lg, sleep, record_time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -9,6 +13,7 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.common.action_chains import ActionChains
+from selenium.common.exceptions import TimeoutException
 
 # Click Functions
 def wait_span_click(driver: WebDriver, text: str, time: float=5.0, click: bool=True, scroll: bool=True, scrollTop: bool=False) -> WebElement | bool:
@@ -22,7 +27,7 @@ def wait_span_click(driver: WebDriver, text: str, time: float=5.0, click: bool=T
     '''
     if text:
         try:
-            button = WebDriverWait(driver,time).until(EC.presence_of_element_located((By.XPATH, './/span[normalize-space(.)="'+text+'"]')))
+            button = wait_for(driver, EC.presence_of_element_located((By.XPATH, './/span[normalize-space(.)="'+text+'"]')), time)
             if scroll:  scroll_to_view(driver, button, scrollTop)
             if click:
                 button.click()
@@ -43,7 +48,7 @@ def multi_sel(driver: WebDriver, texts: list, time: float=5.0) -> None:
         wait_span_click(driver, text, time, False)
         ##<
         try:
-            button = WebDriverWait(driver,time).until(EC.presence_of_element_located((By.XPATH, './/span[normalize-space(.)="'+text+'"]')))
+            button = wait_for(driver, EC.presence_of_element_located((By.XPATH, './/span[normalize-space(.)="'+text+'"]')), time)
             scroll_to_view(driver, button)
             button.click()
             buffer(click_gap)
@@ -87,7 +92,64 @@ def find_by_class(driver: WebDriver, class_name: str, time: float=5.0) -> WebEle
     '''
     Waits for a max of `time` seconds for element to be found, and returns `WebElement` if found, else `Exception` if not found.
     '''
-    return WebDriverWait(driver, time).until(EC.presence_of_element_located((By.CLASS_NAME, class_name)))
+    return wait_for(driver, EC.presence_of_element_located((By.CLASS_NAME, class_name)), time)
+
+def wait_for(driver: WebDriver, condition, time: float=5.0, stage: str | None = None):
+    '''
+    Waits for a max of `time` seconds until `condition` is met and returns its result, else raises `TimeoutException`.
+    - Time lost to timeouts is recorded as the "webdriver wait timeout" stage.
+    - If `stage` is given, the time actually waited is also recorded as that stage, met or not.
+    '''
+    start = perf_counter()
+    try:
+        return WebDriverWait(driver, time, poll_frequency=0.1).until(condition)
+    except TimeoutException:
+        record_time("webdriver wait timeout", perf_counter() - start)
+        raise
+    finally:
+        if stage: record_time(stage, perf_counter() - start)
+
+def wait_for_settle(driver: WebDriver, element: WebElement | None = None, stage: str = "wait: page settle", quiet_for: float = 0.3, time: float = page_settle_max_wait) -> bool:
+    '''
+    Waits until nothing changes inside `element` (or the whole page if `None`) for `quiet_for` seconds, for a max of `time` seconds.
+    - Returns `True` if it settled, else `False`. The time actually waited is recorded as `stage`.
+    '''
+    start = perf_counter()
+    try:
+        result = run_js_file(driver, "wait_for_dom_settle.js", element, int(quiet_for * 1000), int(time * 1000), asynchronous=True)
+        return bool(result and result.get("settled"))
+    except Exception as e:
+        print_lg("Failed waiting for the page to settle!", e)
+        return False
+    finally:
+        record_time(stage, perf_counter() - start)
+
+def wait_for_suggestions(driver: WebDriver, stage: str = "wait: suggestions", time: float = suggestions_max_wait) -> bool:
+    '''
+    Waits for a max of `time` seconds until a typeahead suggestion (`role="option"` inside a `role="listbox"`) is visible.
+    - Returns `True` if suggestions showed up, else `False`. The time actually waited is recorded as `stage`.
+    '''
+    try:
+        wait_for(driver, EC.visibility_of_element_located((By.XPATH, '//*[@role="listbox"]//*[@role="option"]')), time, stage)
+        return True
+    except TimeoutException:
+        return False
+
+# Script functions
+__scripts_folder = os.path.join(os.path.dirname(__file__), "javascript")
+__scripts_cache: dict[str, str] = {}
+
+def run_js_file(driver: WebDriver, script_name: str, *args, asynchronous: bool = False):
+    '''
+    Runs the script `script_name` from the `/modules/javascript` folder in the browser with `args` and returns its result.
+    - Scripts are read from disk once and cached.
+    - Uses `execute_async_script` if `asynchronous = True`, the script must then call the callback passed as its last argument.
+    '''
+    script = __scripts_cache.get(script_name)
+    if script is None:
+        with open(os.path.join(__scripts_folder, script_name), encoding="utf-8") as file:
+            script = __scripts_cache[script_name] = file.read()
+    return driver.execute_async_script(script, *args) if asynchronous else driver.execute_script(script, *args)
 
 # Scroll functions
 def scroll_to_view(driver: WebDriver, element: WebElement, top: bool = False, smooth_scroll: bool = smooth_scroll) -> None:
@@ -138,18 +200,19 @@ def company_search_click(driver: WebDriver, actions: ActionChains, companyName:
     search = driver.find_element(By.XPATH,"(.//input[@placeholder='Add a company'])[1]")
     search.send_keys(Keys.CONTROL + "a")
     search.send_keys(companyName)
-    buffer(3)
+    wait_for_suggestions(driver, "wait: company suggestions")
     actions.send_keys(Keys.DOWN).perform()
     actions.send_keys(Keys.ENTER).perform()
     print_lg(f'Tried searching and adding "{companyName}"')
 
 def text_input(actions: ActionChains, textInputEle: WebElement | bool, value: str, textFieldName: str = "Text") -> None | Exception:
     if textInputEle:
-        sleep(1)
+        try: wait_for(textInputEle.parent, EC.element_to_be_clickable(textInputEle), suggestions_max_wait, f"wait: {textFieldName} input")
+        except TimeoutException: pass   # Let clear() below raise the real reason
         # actions.key_down(Keys.CONTROL).send_keys("a").key_up(Keys.CONTROL).perform()
         textInputEle.clear()
         textInputEle.send_keys(value.strip())
-        sleep(2)
+        wait_for_suggestions(textInputEle.parent, f"wait: {textFieldName} suggestions")
         actions.send_keys(Keys.ENTER).perform()
     else:
         print_lg(f'{textFieldName} input was not given!')
\ No newline at end of file
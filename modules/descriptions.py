@@ -0,0 +1,179 @@
+import io
+import os
+import re
+import csv
+import zlib
+import sqlite3
+import hashlib
+
+from datetime import datetime
+from threading import Lock
+
+from config.settings import description_store_path
+from modules.helpers import make_directories, print_lg
+
+
+#< Description store
+'''
+Job descriptions are kilobytes each and the same one is written again for every repost, every failed attempt and
+inside skip messages. With `dedupe_descriptions = True`, the history CSVs only carry a short reference
+(Eg: "desc:2372e46723d08d585c07c2785f50ae8a") and the text is stored once, compressed, in a SQLite file keyed by
+the hash of its text. `load_description()` and `expand_descriptions()` turn references back into text.
+
+NOTE: Once the CSVs carry references, this file holds the only copy of the descriptions. Don't delete it!
+'''
+
+description_ref_prefix = "desc:"
+
+__connection: sqlite3.Connection | None = None
+__lock = Lock()
+__re_description_ref = re.compile(re.escape(description_ref_prefix) + r"([0-9a-f]{32})")
+
+
+def get_description_id(description: str) -> str:
+    '''
+    Function to get the id of a job description, the hex of the first 16 bytes of the SHA-256 of its text
+    '''
+    return hashlib.sha256(description.encode("utf-8")).hexdigest()[:32]
+
+
+def get_store_connection() -> sqlite3.Connection:
+    '''
+    Function to open (once) and return the connection to the description store
+    '''
+    global __connection
+    if __connection is None:
+        make_directories([description_store_path])
+        __connection = sqlite3.connect(description_store_path, check_same_thread=False, timeout=30)
+        __connection.executescript('''
+            CREATE TABLE IF NOT EXISTS descriptions (
+                id TEXT PRIMARY KEY,
+                text BLOB NOT NULL,
+                length INTEGER NOT NULL
+            ) WITHOUT ROWID;
+        ''')
+    return __connection
+
+
+def store_description(description: str, commit: bool = True) -> str:
+    '''
+    Function to store `description` (once, whatever the number of calls) and return its reference to write in its place.
+    "Unknown" and empty descriptions are returned as they are.
+    '''
+    if not description or description == "Unknown": return description
+    description_id = get_description_id(description)
+    connection = get_store_connection()
+    with __lock:
+        connection.execute("INSERT OR IGNORE INTO descriptions (id, text, length) VALUES (?, ?, ?)", (description_id, zlib.compress(description.encode("utf-8"), 6), len(description)))
+        if commit: connection.commit()
+    return description_ref_prefix + description_id
+
+
+def get_description_ref_id(value: str) -> str | None:
+    '''
+    Function to get the description id if `value` is a description reference, else `None`
+    '''
+    match = __re_description_ref.fullmatch(value) if value else None
+    return match.group(1) if match else None
+
+
+def load_description(value: str) -> str:
+    '''
+    Function to get the description text if `value` is a description reference, else `value` as it is.
+    A reference missing from the store is returned as it is.
+    '''
+    description_id = get_description_ref_id(value)
+    if description_id is None: return value
+    with __lock:
+        row = get_store_connection().execute("SELECT text FROM descriptions WHERE id = ?", (description_id,)).fetchone()
+    if row is None:
+        print_lg(f'Description "{value}" is missing from "{description_store_path}"!')
+        return value
+    return zlib.decompress(row[0]).decode("utf-8")
+
+
+def expand_descriptions(text: str) -> str:
+    '''
+    Function to replace every description reference inside `text` (Eg: a skip message) with its text
+    '''
+    if not text or description_ref_prefix not in text: return text
+    return __re_description_ref.sub(lambda match: load_description(match.group(0)), text)
+
+
+def replace_description(text: str, description: str, commit: bool = True) -> str:
+    '''
+    Function to store `description` and replace it with its reference wherever it's in `text` (Eg: a skip message)
+    '''
+    if not text or not description or description == "Unknown" or description not in text: return text
+    return text.replace(description, store_description(description, commit))
+
+
+def commit_descriptions() -> None:
+    '''
+    Function to commit descriptions stored with `commit = False`
+    '''
+    with __lock:
+        get_store_connection().commit()
+
+
+def close_description_store() -> None:
+    '''
+    Function to close the connection to the description store
+    '''
+    global __connection
+    if __connection is not None:
+        __connection.commit()
+        __connection.close()
+        __connection = None
+
+
+def find_skip_message_description(message: str) -> str | None:
+    '''
+    Function to find the job description inside a skip message written by `get_job_description()` (Eg: "\\n<description>\\n\\nContains bad word(s) ... Skipping this job!\\n")
+    '''
+    if not message or not message.startswith("\n") or not message.rstrip().endswith("Skipping this job!"): return None
+    end = message.rfind("\n\n")
+    return message[1:end] if end > 1 else None
+
+
+def migrate_history_csv(csv_path: str, description_column: str | None = None, message_column: str | None = None, batch_size: int = 1000, dry_run: bool = False) -> tuple[int, int, int]:
+    '''
+    Function to rewrite a history CSV with descriptions replaced by references, streaming it row by row.
+    * Descriptions are taken from `description_column` (Eg: "About Job") and from skip messages in `message_column` (Eg: "Stack Trace")
+    * Rows already migrated are kept as they are, so it's safe to run again (files with nothing to migrate aren't rewritten)
+    * The original file is kept as "<csv_path>.<date>.bak", with `dry_run = True` it's left untouched (descriptions are still stored)
+    * Returns `(rows, size before, size after)`
+    '''
+    size_before = os.path.getsize(csv_path)
+    temp_path = csv_path + ".migrating"
+    rows = changed = 0
+    csv.field_size_limit(2**31 - 1)
+    with open(csv_path, 'rb') as raw_file, open(temp_path, 'w', newline='', encoding='utf-8') as new_file:
+        reader = csv.reader(io.TextIOWrapper(raw_file, encoding='utf-8', newline=''))
+        writer = csv.writer(new_file)
+        description_index = message_index = None
+        for row in reader:
+            if row and row[0] == "Job ID":
+                description_index = row.index(description_column) if description_column in row else None
+                message_index = row.index(message_column) if message_column in row else None
+            else:
+                original = list(row)
+                if description_index is not None and description_index < len(row) and not get_description_ref_id(row[description_index]):
+                    row[description_index] = store_description(row[description_index], commit=False)
+                if message_index is not None and message_index < len(row):
+                    row[message_index] = replace_description(row[message_index], find_skip_message_description(row[message_index]), commit=False)
+                rows += 1
+                changed += row != original
+                if rows % batch_size == 0: commit_descriptions()
+            writer.writerow(row)
+    commit_descriptions()
+    size_after = os.path.getsize(temp_path)
+    if dry_run or not changed:
+        os.remove(temp_path)
+        return rows, size_before, size_after if dry_run else size_before
+    backup_path = f'{csv_path}.{datetime.now().strftime("%Y%m%d_%H%M%S")}.bak'
+    while os.path.exists(backup_path): backup_path = backup_path[:-4] + "_.bak"
+    os.replace(csv_path, backup_path)
+    os.replace(temp_path, csv_path)
+    return rows, size_before, size_after
+#>
@@ -1,20 +1,30 @@
 
 
 import os
+import re
 import json
+import atexit
 
-from time import sleep
+from time import sleep, monotonic, perf_counter
 from random import randint
 from datetime import datetime, timedelta
+from queue import Queue, Empty
+from threading import Thread, Event, Lock
 from pyautogui import alert
 from pprint import pprint
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, Future, wait as wait_futures, FIRST_COMPLETED
+from typing import Any, Callable
 
-from config.settings import logs_folder_path
+from config.settings import logs_folder_path, log_flush_interval, log_queue_size, log_max_size_mb, log_backup_count, save_stage_timings
 
 
 
 #### Common functions ####
 
+# Number of this browser when `parallel_workers > 1` (see "/modules/workers.py"), 0 for the main bot
+worker_id = int(os.environ.get("LINKEDIN_BOT_WORKER", "0"))
+
 #< Directories related
 def make_directories(paths: list[str]) -> None:
     '''
@@ -50,9 +60,10 @@ def find_default_profile_directory() -> str | None:
 #< Logging related
 def critical_error_log(possible_reason: str, stack_trace: Exception) -> None:
     '''
-    Function to log and print critical errors along with datetime stamp
+    Function to log and print critical errors along with datetime stamp, and make sure they reach log.txt right away
     '''
     print_lg(possible_reason, stack_trace, datetime.now(), from_critical=True)
+    flush_logs()
 
 
 def get_log_path():
@@ -60,7 +71,7 @@ def get_log_path():
     Function to replace '//' with '/' for logs path
     '''
     try:
-        path = logs_folder_path+"/log.txt"
+        path = logs_folder_path+(f"/worker_{worker_id}" if worker_id else "")+"/log.txt"
         return path.replace("//","/")
     except Exception as e:
         critical_error_log("Failed getting log path! So assigning default logs path: './logs/log.txt'", e)
@@ -68,25 +79,264 @@ def get_log_path():
 
 
 __logs_file_path = get_log_path()
+__log_queue: Queue = Queue(maxsize=log_queue_size)
+__log_writer: Thread | None = None
+__log_writer_lock = Lock()
+
+
+def __open_log_file():
+    '''
+    Function to open log.txt for appending, creating the logs folder if missing
+    '''
+    make_directories([__logs_file_path])
+    return open(__logs_file_path, 'a', encoding="utf-8")
+
+
+def __rotate_log_file(file) -> None:
+    '''
+    Function to close `file` and shift log.txt to log.txt.1, log.txt.1 to log.txt.2 and so on, keeping `log_backup_count` backups
+    '''
+    file.close()
+    if log_backup_count <= 0:
+        open(__logs_file_path, 'w', encoding="utf-8").close()
+        return
+    for index in range(log_backup_count-1, 0, -1):
+        if os.path.exists(f"{__logs_file_path}.{index}"):
+            os.replace(f"{__logs_file_path}.{index}", f"{__logs_file_path}.{index+1}")
+    os.replace(__logs_file_path, f"{__logs_file_path}.1")
+
+
+def __log_writer_loop() -> None:
+    '''
+    Function run by the background log writer thread.
+    * Keeps one file handle open and writes queued messages in the order they were logged
+    * Flushes to disk every `log_flush_interval` secs, or immediately if it's `0`
+    * Rotates log.txt once it grows beyond `log_max_size_mb`
+    * Sets any `Event` found in the queue once everything before it is flushed
+    '''
+    file = None
+    file_size = 0
+    max_size = log_max_size_mb * 1024 * 1024
+    last_flush = monotonic()
+    while True:
+        try:
+            item = __log_queue.get(timeout=log_flush_interval if log_flush_interval > 0 else None)
+        except Empty:
+            item = None
+        try:
+            if isinstance(item, str):
+                if file is None:
+                    file = __open_log_file()
+                    file_size = os.path.getsize(__logs_file_path)
+                file.write(item)
+                file_size += len(item.encode("utf-8"))
+                if max_size and file_size >= max_size:
+                    __rotate_log_file(file)
+                    file = None
+                    last_flush = monotonic()
+                    continue
+            if file and (not isinstance(item, str) or monotonic() - last_flush >= log_flush_interval):
+                file.flush()
+                last_flush = monotonic()
+        except Exception as e:
+            print(f'Failed writing to log.txt in {logs_folder_path}! Is it open or occupied by another program?', e)
+            try:
+                if file: file.close()
+            except Exception: pass
+            file = None
+        finally:
+            if isinstance(item, Event): item.set()
+
+
+def __start_log_writer() -> None:
+    '''
+    Function to start the background log writer thread once
+    '''
+    global __log_writer
+    with __log_writer_lock:
+        if __log_writer is None or not __log_writer.is_alive():
+            __log_writer = Thread(target=__log_writer_loop, name="log-writer", daemon=True)
+            __log_writer.start()
+
+
+def flush_logs(timeout: float = 10.0) -> bool:
+    '''
+    Function to wait until every message logged so far is written to log.txt.
+    * Waits for a max of `timeout` seconds
+    * Returns `True` if everything was flushed, else `False`
+    '''
+    if __log_writer is None: return True
+    flushed = Event()
+    try:
+        __log_queue.put(flushed, timeout=timeout)
+    except Exception:
+        return False
+    return flushed.wait(timeout)
+
+
+atexit.register(flush_logs)
 
 
 def print_lg(*msgs: str | dict, end: str = "\n", pretty: bool = False, flush: bool = False, from_critical: bool = False) -> None:
     '''
     Function to log and print. **Note that, `end` and `flush` parameters are ignored if `pretty = True`**
+    * Messages are queued and written to log.txt by a background thread, use `flush_logs()` to wait for them
     '''
     try:
+        __start_log_writer()
         for message in msgs:
             pprint(message) if pretty else print(message, end=end, flush=flush)
-            with open(__logs_file_path, 'a+', encoding="utf-8") as file:
-                file.write(str(message) + end)
+            __log_queue.put(str(message) + end)
     except Exception as e:
         trail = f'Skipped saving this message: "{message}" to log.txt!' if from_critical else "We'll try one more time to log..."
-        alert(f"log.txt in {logs_folder_path} is open or is occupied by another program! Please close it! {trail}", "Failed Logging")
+        if not worker_id: alert(f"log.txt in {logs_folder_path} is open or is occupied by another program! Please close it! {trail}", "Failed Logging")
         if not from_critical:
             critical_error_log("Log.txt is open or is occupied by another program!", e)
 #>
 
 
+#< Timing related
+__stage_timings: dict[str, list[float]] = {}
+__stage_timings_lock = Lock()
+
+# Upper bounds in seconds of the stage latency histograms, see `get_stage_histograms()`
+stage_histogram_buckets = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+__stage_histograms: dict[str, list[float]] = {}
+
+
+def record_time(stage: str, seconds: float) -> None:
+    '''
+    Function to record that `stage` took `seconds`, see `get_stage_timings()` and `get_stage_histograms()`
+    '''
+    with __stage_timings_lock:
+        __stage_timings.setdefault(stage, []).append(seconds)
+        histogram = __stage_histograms.setdefault(stage, [0] * (len(stage_histogram_buckets) + 2))
+        for index, bucket in enumerate(stage_histogram_buckets):
+            if seconds <= bucket:
+                histogram[index] += 1
+                break
+        histogram[-2] += 1
+        histogram[-1] += seconds
+
+
+@contextmanager
+def timed(stage: str):
+    '''
+    Context manager to record how long the code inside it took as `stage`, even if it raises.
+    Eg: `with timed("apply_filters"): apply_filters()`
+    '''
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        record_time(stage, perf_counter() - start)
+
+
+def __percentile(timings: list[float], percent: float) -> float:
+    return timings[min(len(timings) - 1, round(percent / 100 * (len(timings) - 1)))]
+
+
+def get_stage_timings(reset: bool = False) -> dict[str, dict[str, float]]:
+    '''
+    Function to get `count`, `total`, `p50`, `p95` and `max` seconds of every stage recorded so far.
+    * Clears the recorded timings if `reset = True`
+    '''
+    with __stage_timings_lock:
+        stages = {stage: sorted(timings) for stage, timings in __stage_timings.items()}
+        if reset: __stage_timings.clear()
+    return {
+        stage: {
+            "count": len(timings),
+            "total": round(sum(timings), 3),
+            "p50": round(__percentile(timings, 50), 3),
+            "p95": round(__percentile(timings, 95), 3),
+            "max": round(timings[-1], 3),
+        } for stage, timings in stages.items()
+    }
+
+
+def get_stage_histograms() -> dict[str, dict]:
+    '''
+    Function to get the latency histogram of every stage recorded since the start of the run (never reset).
+    Returns `{stage: {"buckets": [count <= bucket for each of stage_histogram_buckets], "count": count, "sum": seconds}}`
+    '''
+    with __stage_timings_lock:
+        histograms = {stage: list(histogram) for stage, histogram in __stage_histograms.items()}
+    stages = {}
+    for stage, histogram in histograms.items():
+        cumulative, total = [], 0
+        for count in histogram[:len(stage_histogram_buckets)]:
+            total += count
+            cumulative.append(total)
+        stages[stage] = {"buckets": cumulative, "count": int(histogram[-2]), "sum": round(histogram[-1], 3)}
+    return stages
+
+
+def report_stage_timings(cycle: int) -> str | None:
+    '''
+    Function to log the stage timings of `cycle`, save them as JSON in "logs/timings/" and start over for the next cycle.
+    * Returns the JSON file path, or `None` if nothing was recorded or saving is disabled (`save_stage_timings = False`)
+    '''
+    stages = get_stage_timings(reset=True)
+    if not stages: return None
+    lines = [f"{'Stage':<30}{'Count':>8}{'Total':>10}{'p50':>9}{'p95':>9}{'Max':>9}"]
+    for stage, timing in sorted(stages.items(), key=lambda item: item[1]["total"], reverse=True):
+        lines.append(f"{stage:<30}{timing['count']:>8}{timing['total']:>9.1f}s{timing['p50']:>8.2f}s{timing['p95']:>8.2f}s{timing['max']:>8.2f}s")
+    print_lg(f"\nTime spent per stage in cycle {cycle}:\n" + "\n".join(lines) + "\n")
+    if not save_stage_timings: return None
+    path = f"{logs_folder_path}/timings/cycle_{cycle}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json".replace("//","/")
+    try:
+        make_directories([path])
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"cycle": cycle, "finished_at": datetime.now().isoformat(timespec="seconds"), "stages": stages}, file, indent=2)
+        return path
+    except Exception as e:
+        print_lg(f'Failed to save stage timings to "{path}"!', e)
+        return None
+#>
+
+
+#< Concurrent steps
+def __run_step(name: str, step: Callable[[], Any]) -> Any:
+    start = perf_counter()
+    try:
+        return step()
+    finally:
+        seconds = perf_counter() - start
+        record_time(f"startup: {name}", seconds)
+        print_lg(f'"{name}" took {seconds:.1f} secs')
+
+
+def start_steps(steps: dict[str, Callable[[], Any]]) -> dict[str, Future]:
+    '''
+    Function to start all `steps` (name: function without arguments) at the same time in background threads.
+    * Returns their `Future`s by name, see `wait_for_steps()`. Each step's duration is logged and recorded as "startup: <name>"
+    '''
+    executor = ThreadPoolExecutor(max_workers=max(1, len(steps)), thread_name_prefix="step")
+    futures = {name: executor.submit(__run_step, name, step) for name, step in steps.items()}
+    executor.shutdown(wait=False)
+    return futures
+
+
+def wait_for_steps(steps: dict[str, Future], required: set[str], until: list[str] | None = None) -> None:
+    '''
+    Function to wait until the `steps` named in `until` (all if `None`) are done.
+    * Fails fast: raises the error of any step in `required` as soon as it fails, even if it's not one being waited for, and cancels steps not started yet
+    * Errors of other steps are left in their `Future`s
+    '''
+    waiting = {steps[name] for name in (steps if until is None else until)}
+    watched = waiting | {steps[name] for name in required}
+    while waiting:
+        done, _ = wait_futures(watched, return_when=FIRST_COMPLETED)
+        for name, future in steps.items():
+            if future in done and name in required and future.exception() is not None:
+                for other in steps.values(): other.cancel()
+                raise future.exception()
+        waiting -= done
+        watched -= done
+#>
+
+
 def buffer(speed: int=0) -> None:
     '''
     Function to wait within a period of selected random range.
@@ -99,11 +349,13 @@ def buffer(speed: int=0) -> None:
     if speed<=0:
         return
     elif speed <= 1 and speed < 2:
-        return sleep(randint(6,10)*0.1)
+        seconds = randint(6,10)*0.1
     elif speed <= 2 and speed < 3:
-        return sleep(randint(10,18)*0.1)
+        seconds = randint(10,18)*0.1
     else:
-        return sleep(randint(18,round(speed)*10)*0.1)
+        seconds = randint(18,round(speed)*10)*0.1
+    record_time("buffer sleep", seconds)
+    return sleep(seconds)
 
 
 def manual_login_retry(is_logged_in: callable, limit: int = 2) -> None:
@@ -114,6 +366,7 @@ def manual_login_retry(is_logged_in: callable, limit: int = 2) -> None:
     count = 0
     while not is_logged_in():
         try:
+            if worker_id: raise RuntimeError("Dialogs are disabled in extra browsers")
             from pyautogui import alert
             print_lg("Seems like you're not logged in!")
             button = "Confirm Login"
@@ -249,12 +502,62 @@ def convert_to_lakhs(value: str) -> str:
     return value
 
 
+def strip_code_fence(text: str) -> str:
+    '''
+    Function to get the text inside a Markdown code fence (Eg: "```json\n{...}\n```"), as some AI models wrap JSON replies in one
+    '''
+    match = re.fullmatch(r"\s*```[\w-]*\s*\n(.*?)\n?\s*```\s*", text, re.DOTALL)
+    return match.group(1) if match else text
+
+
 def convert_to_json(data) -> dict:
     '''
     Function to convert data to JSON, if unsuccessful, returns `{"error": "Unable to parse the response as JSON", "data": data}`
     '''
     try:
-        result_json = json.loads(data)
+        result_json = json.loads(strip_code_fence(data) if isinstance(data, str) else data)
         return result_json
     except json.JSONDecodeError:
-        return {"error": "Unable to parse the response as JSON", "data": data}
\ No newline at end of file
+        return {"error": "Unable to parse the response as JSON", "data": data}
+
+
+def compile_keywords(words: list[str], whole_words: bool = False) -> tuple[re.Pattern, dict[str, str], dict[str, list[tuple[str, re.Pattern]]]] | None:
+    '''
+    Function to compile `words` once into a single case insensitive regex, to search for all of them in one pass with `find_keywords()`.
+    * If `whole_words = True`, words only match when not surrounded by letters, digits or underscores (Eg: "Java" won't match "JavaScript")
+    * Returns `None` if `words` is empty
+    '''
+    # Keyed by `casefold()`, as IGNORECASE also matches characters `lower()` doesn't map back (Eg: "ſ" for "s")
+    originals = {}
+    for word in words:
+        if word.strip(): originals.setdefault(word.strip().casefold(), word)
+    if not originals: return None
+    # Longest first, so "US Citizens Only" wins over "US Citizen" where both start
+    by_length = sorted(originals.items(), key=lambda item: len(item[1].strip()), reverse=True)
+    alternatives = "|".join(re.escape(word.strip().lower()) for key, word in by_length)
+    if whole_words: alternatives = rf"(?<!\w)(?:{alternatives})(?!\w)"
+    # The regex reports only the longest word starting at a position, so the shorter words a word starts with are checked there after it
+    shorter = {}
+    for key, word in by_length:
+        for other_key, other in by_length:
+            if other_key != key and key.startswith(other_key):
+                shorter.setdefault(key, []).append((other, re.compile(re.escape(other.strip().lower()) + (r"(?!\w)" if whole_words else ""), re.IGNORECASE)))
+    return re.compile(rf"(?=({alternatives}))", re.IGNORECASE), originals, shorter
+
+
+def find_keywords(keywords: tuple[re.Pattern, dict[str, str], dict[str, list[tuple[str, re.Pattern]]]] | None, text: str, first_only: bool = False) -> list[tuple[str, int]]:
+    '''
+    Function to find all words compiled with `compile_keywords()` in `text`.
+    * Returns a list of `(word as configured, position in text)`, in order of position, longest word first where several start at the same position (Eg: "US Citizens Only" and "US Citizen")
+    * Stops at the first match if `first_only = True`
+    '''
+    if keywords is None or not text: return []
+    pattern, originals, shorter = keywords
+    found = []
+    for match in pattern.finditer(text):
+        key = match.group(1).casefold()
+        found.append((originals.get(key, match.group(1)), match.start()))
+        if first_only: break
+        for word, word_pattern in shorter.get(key, ()):
+            if word_pattern.match(text, match.start()): found.append((word, match.start()))
+    return found
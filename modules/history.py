@@ -0,0 +1,181 @@
+import io
+import os
+import csv
+import zlib
+import sqlite3
+
+from threading import Lock
+from typing import Literal
+
+from config.settings import file_name, failed_file_name, history_index_path
+from modules.helpers import make_directories, print_lg, critical_error_log
+
+
+#< Application history index
+'''
+The applied and failed history CSVs carry the full "About Job" text in every row, so reading them just to
+know which Job IDs were already handled gets slower with every application. This index keeps only the Job IDs
+in a small SQLite file next to the CSVs. The CSVs are still written as before and remain the source of truth,
+the index is updated incrementally and is rebuilt from them whenever they change outside of the bot: the size,
+modification time and a CRC32 checksum of the part already indexed are kept, so rows appended by other browsers
+are just read, while hand edits anywhere in a CSV (Eg: fixing a Job ID) rebuild its entries.
+'''
+
+history_statuses = {"applied": file_name, "failed": failed_file_name}
+
+__connection: sqlite3.Connection | None = None
+__lock = Lock()
+
+
+def get_history_connection() -> sqlite3.Connection:
+    '''
+    Function to open (once) and return the connection to the history index database
+    '''
+    global __connection
+    if __connection is None:
+        make_directories([history_index_path])
+        __connection = sqlite3.connect(history_index_path, check_same_thread=False, timeout=30)
+        # Indexes made before checksums were kept are rebuilt
+        columns = [row[1] for row in __connection.execute("PRAGMA table_info(csv_state)")]
+        if columns and "checksum" not in columns: __connection.execute("DROP TABLE csv_state")
+        __connection.executescript('''
+            CREATE TABLE IF NOT EXISTS job_ids (
+                job_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                PRIMARY KEY (job_id, status)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS csv_state (
+                csv_path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime INTEGER NOT NULL,
+                checksum INTEGER NOT NULL
+            );
+        ''')
+    return __connection
+
+
+class LimitedReader(io.RawIOBase):
+    '''
+    Reads at most `limit` bytes of `file`, from where it's at
+    '''
+    def __init__(self, file, limit: int) -> None:
+        self.file = file
+        self.remaining = limit
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), self.remaining)
+        if size <= 0: return 0
+        data = self.file.read(size)
+        buffer[:len(data)] = data
+        self.remaining -= len(data)
+        return len(data)
+
+
+def __read_job_ids(csv_path: str, offset: int, end: int):
+    '''
+    Yields the first column of every row in `csv_path` from byte `offset` to `end`, without keeping rows in memory.
+    Rows appended after `end` (Eg: by another browser while reading) are left for the next sync.
+    '''
+    with open(csv_path, 'rb') as raw_file:
+        raw_file.seek(offset)
+        reader = csv.reader(io.TextIOWrapper(io.BufferedReader(LimitedReader(raw_file, end - offset)), encoding='utf-8', newline=''))
+        for row in reader:
+            if row and row[0] != "Job ID":
+                yield row[0]
+
+
+def __get_checksum(csv_path: str, start: int, end: int, checksum: int = 0) -> int:
+    '''
+    Returns the CRC32 of bytes `start` to `end` of `csv_path`, continuing from `checksum` (the CRC32 of the bytes before `start`)
+    '''
+    with open(csv_path, 'rb') as raw_file:
+        raw_file.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = raw_file.read(min(1024 * 1024, remaining))
+            if not chunk: break
+            checksum = zlib.crc32(chunk, checksum)
+            remaining -= len(chunk)
+    return checksum
+
+
+def __sync_csv(connection: sqlite3.Connection, status: str, csv_path: str, verify: bool = True) -> None:
+    '''
+    Brings the entries of one CSV in line with it, reading only rows appended since the last sync if the part already
+    indexed is unchanged (checked against its checksum if `verify = True`), else rebuilding them from scratch
+    '''
+    stat = os.stat(csv_path) if os.path.exists(csv_path) else None
+    current_size, current_mtime = (stat.st_size, stat.st_mtime_ns) if stat else (0, 0)
+    recorded = connection.execute("SELECT size, mtime, checksum FROM csv_state WHERE csv_path = ?", (csv_path,)).fetchone()
+    if recorded and recorded[0] == current_size and recorded[1] == current_mtime: return
+    if recorded and current_size >= recorded[0] and (not verify or __get_checksum(csv_path, 0, recorded[0]) == recorded[2]):
+        offset, checksum = recorded[0], recorded[2]
+    else:
+        if current_size > 0: print_lg(f'Rebuilding job ID index for "{csv_path}"...')
+        connection.execute("DELETE FROM job_ids WHERE status = ?", (status,))
+        offset, checksum = 0, 0
+    if current_size > offset:
+        connection.executemany(
+            "INSERT OR IGNORE INTO job_ids (job_id, status) VALUES (?, ?)",
+            ((job_id, status) for job_id in __read_job_ids(csv_path, offset, current_size))
+        )
+        checksum = __get_checksum(csv_path, offset, current_size, checksum)
+    connection.execute("INSERT OR REPLACE INTO csv_state (csv_path, size, mtime, checksum) VALUES (?, ?, ?, ?)", (csv_path, current_size, current_mtime, checksum))
+
+
+def sync_history_index() -> None:
+    '''
+    Function to bring the index in line with the history CSVs.
+    * Does nothing for a CSV whose size and modification time didn't change since the last sync
+    * Reads only the newly appended part of a CSV if the part already indexed is unchanged (same checksum)
+    * Rebuilds the entries of a CSV from scratch if it shrank, was edited, was replaced or was never indexed
+    '''
+    connection = get_history_connection()
+    with __lock:
+        for status, csv_path in history_statuses.items():
+            try:
+                __sync_csv(connection, status, csv_path)
+                connection.commit()
+            except Exception as e:
+                connection.rollback()
+                critical_error_log(f'Failed to index Job IDs from "{csv_path}"!', e)
+
+
+def load_job_ids(status: Literal["applied", "failed"] = "applied") -> set[str]:
+    '''
+    Function to get a `set` of Job IDs with the given `status` from the index, syncing it with the CSVs first
+    '''
+    sync_history_index()
+    with __lock:
+        rows = get_history_connection().execute("SELECT job_id FROM job_ids WHERE status = ?", (status,)).fetchall()
+    return {row[0] for row in rows}
+
+
+def record_job_id(job_id: str, status: Literal["applied", "failed"]) -> None:
+    '''
+    Function to add `job_id` to the index right after its row was appended to the matching history CSV.
+    Rows other browsers appended meanwhile are indexed too, the part indexed before isn't checked again.
+    '''
+    csv_path = history_statuses[status]
+    try:
+        connection = get_history_connection()
+        with __lock:
+            connection.execute("INSERT OR IGNORE INTO job_ids (job_id, status) VALUES (?, ?)", (job_id, status))
+            __sync_csv(connection, status, csv_path, verify=False)
+            connection.commit()
+    except Exception as e:
+        print_lg(f"Failed to update job ID index for Job ID: {job_id}!", e)
+
+
+def close_history_index() -> None:
+    '''
+    Function to close the connection to the history index database
+    '''
+    global __connection
+    if __connection is not None:
+        __connection.close()
+        __connection = None
+#>
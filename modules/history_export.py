@@ -0,0 +1,207 @@
+import io
+import os
+import re
+import csv
+import ast
+import gzip
+import shutil
+
+from datetime import datetime
+
+from config.settings import file_name, failed_file_name
+from modules.helpers import make_directories, print_lg
+from modules.descriptions import get_description_id, get_description_ref_id, load_description
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+
+##> History export
+'''
+The history CSVs are easy to append to but slow to analyse: every applied row carries the full "About Job" text
+and a stringified set of the questions answered. `export_history()` converts them into tables for analytics:
+
+* "applied" and "failed": one row per job, partitioned by month (`month=2024-05`), with the description replaced
+  by its `description_id` (the same id as in the description store, see "/modules/descriptions.py")
+* "descriptions": every distinct description once, keyed by `description_id` (hash of its text)
+* "questions": one row per question answered in an application, partitioned like "applied"
+
+Tables are written as Parquet (zstd) if `pyarrow` is installed, else as gzip compressed CSVs, in the same
+Hive style folders (`applied/month=2024-05/part-0000.parquet`), so both can be read with `pandas.read_parquet()`,
+`pyarrow.dataset` or DuckDB one partition or column at a time. The CSVs are streamed row by row and written in
+batches, so memory use doesn't grow with the size of the history (only 16 bytes per distinct description are kept,
+to skip duplicates).
+'''
+
+applied_columns = [
+    ("job_id", "string"), ("title", "string"), ("company", "string"), ("work_location", "string"), ("work_style", "string"),
+    ("description_id", "string"), ("experience_required", "string"), ("skills_required", "string"), ("hr_name", "string"),
+    ("hr_link", "string"), ("resume", "string"), ("reposted", "bool"), ("date_posted", "timestamp"), ("date_applied", "timestamp"),
+    ("job_link", "string"), ("external_job_link", "string"), ("questions_count", "int"), ("connect_request", "string"),
+]
+failed_columns = [
+    ("job_id", "string"), ("job_link", "string"), ("resume_tried", "string"), ("date_listed", "timestamp"), ("date_tried", "timestamp"),
+    ("assumed_reason", "string"), ("stack_trace", "string"), ("external_job_link", "string"), ("screenshot_name", "string"),
+]
+description_columns = [("description_id", "string"), ("description", "string"), ("length", "int")]
+question_columns = [("job_id", "string"), ("question", "string"), ("answer", "string"), ("type", "string"), ("previous_answer", "string")]
+
+__re_month = re.compile(r'^\d{4}-\d{2}')
+
+
+def get_column_name(header: str) -> str:
+    '''
+    Function to turn a CSV header (Eg: "Re-posted") into a column name (Eg: "reposted")
+    '''
+    return re.sub(r'[^a-z0-9]+', '_', header.lower().replace("-", "")).strip("_")
+
+
+def get_month(value: str) -> str:
+    '''
+    Function to get the "YYYY-MM" partition of a date written in the CSVs, "unknown" if it's not a date
+    '''
+    return value[:7] if value and __re_month.match(value) else "unknown"
+
+
+def convert_value(value, kind: str):
+    '''
+    Function to convert a value read from the CSVs to the `kind` of its column, `None` if it can't be
+    '''
+    if value is None or value == "": return None
+    if kind == "timestamp":
+        try: return datetime.fromisoformat(str(value))
+        except ValueError: return None
+    if kind == "int":
+        try: return int(value)
+        except ValueError: return None
+    if kind == "bool": return str(value).strip().lower() == "true"
+    return str(value)
+
+
+def read_questions(questions_found: str) -> list[tuple]:
+    '''
+    Function to read the "Questions Found" column, a set of `(question, answer, type, previous answer)` tuples written as text
+    '''
+    if not questions_found or questions_found == "None": return []
+    try: questions = ast.literal_eval(questions_found)
+    except (ValueError, SyntaxError, MemoryError, RecursionError): return []
+    return [question for question in questions if isinstance(question, tuple) and len(question) == 4] if isinstance(questions, (set, list, tuple)) else []
+
+
+class TableWriter:
+    '''
+    Writes rows of one table into files partitioned by a value (Eg: month), `batch_size` rows at a time
+    '''
+    def __init__(self, folder: str, columns: list[tuple[str, str]], use_parquet: bool, batch_size: int, partition_name: str | None = None) -> None:
+        self.folder = folder
+        self.columns = columns
+        self.use_parquet = use_parquet
+        self.batch_size = batch_size
+        self.partition_name = partition_name
+        self.batches: dict[str, list[list]] = {}
+        self.files: dict[str, tuple] = {}
+        self.rows = 0
+        if use_parquet:
+            types = {"string": pa.string(), "timestamp": pa.timestamp("us"), "int": pa.int64(), "bool": pa.bool_()}
+            self.schema = pa.schema([(name, types[kind]) for name, kind in columns])
+
+    def write(self, row: dict, partition: str | None = None) -> None:
+        batch = self.batches.setdefault(partition, [])
+        batch.append([convert_value(row.get(name), kind) for name, kind in self.columns])
+        self.rows += 1
+        if len(batch) >= self.batch_size: self.flush(partition)
+
+    def __open(self, partition: str | None) -> tuple:
+        folder = self.folder if partition is None else os.path.join(self.folder, f"{self.partition_name}={partition}")
+        make_directories([folder])
+        if self.use_parquet:
+            return (pq.ParquetWriter(os.path.join(folder, "part-0000.parquet"), self.schema, compression="zstd"),)
+        file = gzip.open(os.path.join(folder, "part-0000.csv.gz"), "wt", encoding="utf-8", newline="")
+        writer = csv.writer(file)
+        writer.writerow([name for name, kind in self.columns])
+        return file, writer
+
+    def flush(self, partition: str | None) -> None:
+        batch = self.batches.get(partition)
+        if not batch: return
+        if partition not in self.files: self.files[partition] = self.__open(partition)
+        if self.use_parquet:
+            columns = list(zip(*batch))
+            self.files[partition][0].write_table(pa.Table.from_arrays([pa.array(values, type=field.type) for values, field in zip(columns, self.schema)], schema=self.schema))
+        else:
+            self.files[partition][1].writerows([[value.isoformat(sep=" ") if isinstance(value, datetime) else value for value in row] for row in batch])
+        batch.clear()
+
+    def close(self) -> None:
+        for partition in list(self.batches): self.flush(partition)
+        for file in self.files.values(): file[0].close()
+        self.files.clear()
+
+
+def read_csv_rows(csv_path: str):
+    '''
+    Yields every row of `csv_path` as a dict of column name to text, without keeping rows in memory
+    '''
+    with open(csv_path, 'rb') as raw_file:
+        reader = csv.reader(io.TextIOWrapper(raw_file, encoding='utf-8', newline=''))
+        header = None
+        for row in reader:
+            if not row: continue
+            if row[0] == "Job ID":
+                header = [get_column_name(name) for name in row]
+                continue
+            if header is None: continue
+            yield dict(zip(header, row))
+
+
+def export_history(output_folder: str, batch_size: int = 5000, use_parquet: bool | None = None) -> dict[str, int]:
+    '''
+    Function to export the applied and failed history CSVs into `output_folder`, see module notes.
+    * `use_parquet = None` writes Parquet if `pyarrow` is installed, else gzip compressed CSVs
+    * Replaces tables exported earlier to `output_folder`
+    * Returns the number of rows written to each table
+    '''
+    if use_parquet is None: use_parquet = pa is not None
+    if use_parquet and pa is None: raise ImportError('Exporting to Parquet needs "pyarrow", install it with "pip install pyarrow"')
+    csv.field_size_limit(2**31 - 1)
+
+    tables = ("applied", "failed", "descriptions", "questions")
+    for table in tables:
+        path = os.path.join(output_folder, table)
+        if os.path.isdir(path): shutil.rmtree(path)
+
+    writers = {
+        "applied": TableWriter(os.path.join(output_folder, "applied"), applied_columns, use_parquet, batch_size, "month"),
+        "failed": TableWriter(os.path.join(output_folder, "failed"), failed_columns, use_parquet, batch_size, "month"),
+        "descriptions": TableWriter(os.path.join(output_folder, "descriptions"), description_columns, use_parquet, batch_size),
+        "questions": TableWriter(os.path.join(output_folder, "questions"), question_columns, use_parquet, batch_size, "month"),
+    }
+    seen_descriptions = set()
+    try:
+        if os.path.exists(file_name):
+            for row in read_csv_rows(file_name):
+                month = get_month(row.get("date_applied"))
+                description = row.pop("about_job", "") or ""
+                # Descriptions stored with `dedupe_descriptions = True` are only read the first time they're seen
+                description_id = get_description_ref_id(description) or get_description_id(description)
+                if bytes.fromhex(description_id) not in seen_descriptions:
+                    seen_descriptions.add(bytes.fromhex(description_id))
+                    description = load_description(description)
+                    writers["descriptions"].write({"description_id": description_id, "description": description, "length": len(description)})
+                questions = read_questions(row.pop("questions_found", ""))
+                for question, answer, question_type, previous_answer in questions:
+                    writers["questions"].write({"job_id": row.get("job_id"), "question": question, "answer": answer, "type": question_type, "previous_answer": previous_answer}, month)
+                writers["applied"].write(dict(row, description_id=description_id, questions_count=len(questions)), month)
+        if os.path.exists(failed_file_name):
+            for row in read_csv_rows(failed_file_name):
+                writers["failed"].write(row, get_month(row.get("date_tried")))
+    finally:
+        for writer in writers.values(): writer.close()
+
+    counts = {table: writer.rows for table, writer in writers.items()}
+    print_lg(f'Exported history to "{output_folder}" as {"Parquet" if use_parquet else "gzip CSV"}: ' + ", ".join(f"{rows} {table}" for table, rows in counts.items()))
+    return counts
+##<
@@ -0,0 +1,90 @@
+// Collects every question of the Easy Apply modal passed as `arguments[0]` in a single WebDriver call.
+// Each question is classified the same way `answer_questions` used to probe it, in this order:
+// select, radio, text, textarea and checkbox. Elements are returned too, so answers can be filled
+// in without searching for them again.
+
+const modal = arguments[0];
+
+const textOf = (element) => element ? element.innerText.trim() : "";
+
+const fields = [];
+for (const question of modal.querySelectorAll("div[data-test-form-element]")) {
+    const select = question.querySelector("select");
+    if (select) {
+        const label = question.querySelector("label");
+        fields.push({
+            type: "select",
+            label: label && label.querySelector("span") ? textOf(label.querySelector("span")) : "Unknown",
+            element: select,
+            element_id: select.id,
+            options: Array.from(select.options).map(option => option.text.trim()),
+            value: select.selectedIndex >= 0 ? select.options[select.selectedIndex].text.trim() : "",
+        });
+        continue;
+    }
+
+    const radio = question.querySelector('fieldset[data-test-form-builder-radio-button-form-component="true"]');
+    if (radio) {
+        let label = radio.querySelector("span[data-test-form-builder-radio-button-form-component__title]");
+        if (label && label.querySelector(".visually-hidden")) label = label.querySelector(".visually-hidden");
+        fields.push({
+            type: "radio",
+            label: label ? textOf(label) : "Unknown",
+            element: radio,
+            element_id: radio.id,
+            options: Array.from(radio.querySelectorAll("input")).map(input => {
+                const optionLabel = input.id ? radio.querySelector(`label[for="${CSS.escape(input.id)}"]`) : null;
+                return {
+                    label: optionLabel ? textOf(optionLabel) : "Unknown",
+                    value: input.value,
+                    selected: input.checked,
+                    element: input,
+                    label_element: optionLabel,
+                };
+            }),
+        });
+        continue;
+    }
+
+    const text = question.querySelector("input[type='text']");
+    if (text) {
+        let label = question.querySelector("label[for]");
+        if (label && label.querySelector(".visually-hidden")) label = label.querySelector(".visually-hidden");
+        fields.push({
+            type: "text",
+            label: label ? textOf(label) : "Unknown",
+            element: text,
+            element_id: text.id,
+            value: text.value,
+        });
+        continue;
+    }
+
+    const textArea = question.querySelector("textarea");
+    if (textArea) {
+        const label = question.querySelector("label[for]");
+        fields.push({
+            type: "textarea",
+            label: label ? textOf(label) : "Unknown",
+            element: textArea,
+            element_id: textArea.id,
+            value: textArea.value,
+        });
+        continue;
+    }
+
+    const checkbox = question.querySelector("input[type='checkbox']");
+    if (checkbox) {
+        const label = question.querySelector("span[class='visually-hidden']");
+        const optionLabel = question.querySelector("label[for]");
+        fields.push({
+            type: "checkbox",
+            label: label ? textOf(label) : "Unknown",
+            element: checkbox,
+            element_id: checkbox.id,
+            option: optionLabel ? textOf(optionLabel) : "Unknown",
+            value: checkbox.checked,
+        });
+    }
+}
+return fields;
@@ -0,0 +1,37 @@
+// Collects the details of every job card in the search results page in a single WebDriver call.
+// Run with `driver.execute_async_script(script, maxWait)`, Selenium passes the callback as the last argument.
+// LinkedIn only renders cards close to the viewport (occludable list items), so empty cards are scrolled
+// into view and waited for, for a max of `maxWait` milliseconds each.
+
+const maxWait = arguments[0];
+const done = arguments[arguments.length - 1];
+
+const textOf = (root, selector) => {
+    const element = root.querySelector(selector);
+    return element ? element.innerText.trim() : "";
+};
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+(async () => {
+    try {
+        const cards = [];
+        for (const card of document.querySelectorAll("li[data-occludable-job-id]")) {
+            if (!card.querySelector("a")) {
+                card.scrollIntoView({ block: "center", behavior: "instant" });
+                const start = performance.now();
+                while (!card.querySelector("a") && performance.now() - start < maxWait) await sleep(50);
+            }
+            const anchor = card.querySelector("a");
+            cards.push({
+                job_id: card.getAttribute("data-occludable-job-id"),
+                title: anchor ? anchor.innerText.split("\n")[0].trim() : "",
+                subtitle: textOf(card, ".artdeco-entity-lockup__subtitle"),
+                footer_state: textOf(card, ".job-card-container__footer-job-state"),
+            });
+        }
+        done(cards);
+    } catch (error) {
+        done({ error: String(error) });
+    }
+})();
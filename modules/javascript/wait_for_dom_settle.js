@@ -0,0 +1,23 @@
+// Waits until the DOM under `arguments[0]` (or the whole page if null) stops changing for `arguments[1]` milliseconds,
+// for a max of `arguments[2]` milliseconds. Run with `driver.execute_async_script`, Selenium passes the callback last.
+// Returns { settled, waited } where `waited` is how long it actually waited in milliseconds.
+
+const root = arguments[0] || document.body;
+const quietFor = arguments[1];
+const maxWait = arguments[2];
+const done = arguments[arguments.length - 1];
+
+const start = performance.now();
+let lastChange = start;
+const observer = new MutationObserver(() => { lastChange = performance.now(); });
+observer.observe(root, { childList: true, subtree: true, attributes: true, characterData: true });
+
+const check = () => {
+    const now = performance.now();
+    const settled = now - lastChange >= quietFor;
+    if (settled || now - start >= maxWait) {
+        observer.disconnect();
+        done({ settled: settled, waited: now - start });
+    } else setTimeout(check, 25);
+};
+setTimeout(check, 25);
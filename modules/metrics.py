@@ -0,0 +1,196 @@
+import os
+import json
+
+from time import time
+from datetime import datetime
+from threading import Thread, Event
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+from config.settings import metrics_port, metrics_json_path, metrics_interval
+from modules.helpers import make_directories, print_lg, get_stage_histograms, stage_histogram_buckets, worker_id
+
+
+#< Run metrics
+'''
+Live metrics of a run for monitoring long `run_non_stop` sessions, served at "http://localhost:<metrics_port>/metrics"
+in Prometheus text format (and as JSON at "/metrics.json"), and/or rewritten as JSON in `metrics_json_path` every
+`metrics_interval` seconds. Extra browsers (`parallel_workers > 1`) each serve their own metrics on the next ports
+(`metrics_port + worker number`) and write their own JSON file.
+
+* Counters: jobs easy applied, external, failed and skipped, and AI calls by kind
+* Histograms: time taken by every stage timed with `timed()` or `record_time()` (Eg: "apply_filters", "submit")
+* Gauges: cycle, current search term and page, and whether the daily Easy Apply limit was reached
+'''
+
+ai_call_stage_prefix = "ai call: "
+
+__get_run_state: Callable[[], dict] | None = None
+__started_at = time()
+__server: ThreadingHTTPServer | None = None
+__writer: Thread | None = None
+__stop_writer = Event()
+
+
+def get_metrics() -> dict:
+    '''
+    Function to get the current metrics of the run as a dict (see module notes)
+    '''
+    state = __get_run_state() if __get_run_state else {}
+    stages = get_stage_histograms()
+    return {
+        "worker": worker_id,
+        "started_at": datetime.fromtimestamp(__started_at).isoformat(timespec="seconds"),
+        "updated_at": datetime.now().isoformat(timespec="seconds"),
+        "uptime_seconds": round(time() - __started_at),
+        "jobs": state.get("counters", {}),
+        "ai_calls": {stage[len(ai_call_stage_prefix):]: histogram["count"] for stage, histogram in stages.items() if stage.startswith(ai_call_stage_prefix)},
+        "cycle": state.get("cycle"),
+        "search_term": state.get("search_term"),
+        "page": state.get("page"),
+        "daily_limit_reached": bool(state.get("daily_limit_reached")),
+        "stage_buckets": list(stage_histogram_buckets),
+        "stages": stages,
+    }
+
+
+def __label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_prometheus(metrics: dict) -> str:
+    '''
+    Function to write `metrics` from `get_metrics()` in Prometheus text format
+    '''
+    worker = f'worker="{metrics["worker"]}"'
+    lines = [
+        "# HELP linkedin_bot_jobs_total Jobs handled in this run, by outcome.",
+        "# TYPE linkedin_bot_jobs_total counter",
+    ]
+    lines += [f'linkedin_bot_jobs_total{{{worker},outcome="{__label(outcome)}"}} {count}' for outcome, count in metrics["jobs"].items()]
+    lines += [
+        "# HELP linkedin_bot_ai_calls_total Requests sent to the AI provider, by kind.",
+        "# TYPE linkedin_bot_ai_calls_total counter",
+    ]
+    lines += [f'linkedin_bot_ai_calls_total{{{worker},kind="{__label(kind)}"}} {count}' for kind, count in metrics["ai_calls"].items()]
+    lines += [
+        "# HELP linkedin_bot_stage_seconds Time taken by each stage of applying.",
+        "# TYPE linkedin_bot_stage_seconds histogram",
+    ]
+    for stage, histogram in metrics["stages"].items():
+        labels = f'{worker},stage="{__label(stage)}"'
+        lines += [f'linkedin_bot_stage_seconds_bucket{{{labels},le="{bucket}"}} {count}' for bucket, count in zip(metrics["stage_buckets"], histogram["buckets"])]
+        lines += [
+            f'linkedin_bot_stage_seconds_bucket{{{labels},le="+Inf"}} {histogram["count"]}',
+            f'linkedin_bot_stage_seconds_sum{{{labels}}} {histogram["sum"]}',
+            f'linkedin_bot_stage_seconds_count{{{labels}}} {histogram["count"]}',
+        ]
+    lines += [
+        "# HELP linkedin_bot_cycle Current cycle of the run.",
+        "# TYPE linkedin_bot_cycle gauge",
+        f'linkedin_bot_cycle{{{worker}}} {metrics["cycle"] or 0}',
+        "# HELP linkedin_bot_page Current page of the search results.",
+        "# TYPE linkedin_bot_page gauge",
+        f'linkedin_bot_page{{{worker}}} {metrics["page"] or 0}',
+        "# HELP linkedin_bot_search_term Current search term, as a label.",
+        "# TYPE linkedin_bot_search_term gauge",
+        f'linkedin_bot_search_term{{{worker},search_term="{__label(metrics["search_term"] or "")}"}} 1',
+        "# HELP linkedin_bot_daily_limit_reached 1 once LinkedIn's daily Easy Apply limit was reached.",
+        "# TYPE linkedin_bot_daily_limit_reached gauge",
+        f'linkedin_bot_daily_limit_reached{{{worker}}} {int(metrics["daily_limit_reached"])}',
+        "# HELP linkedin_bot_uptime_seconds Seconds since the run started.",
+        "# TYPE linkedin_bot_uptime_seconds gauge",
+        f'linkedin_bot_uptime_seconds{{{worker}}} {metrics["uptime_seconds"]}',
+    ]
+    return "\n".join(lines) + "\n"
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    '''
+    Serves `format_prometheus()` at "/metrics" and `get_metrics()` at "/metrics.json"
+    '''
+    def do_GET(self) -> None:
+        if self.path == "/metrics":
+            body, content_type = format_prometheus(get_metrics()), "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path == "/metrics.json":
+            body, content_type = json.dumps(get_metrics(), indent=2), "application/json"
+        else:
+            self.send_error(404)
+            return
+        body = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def get_metrics_json_path() -> str:
+    '''
+    Function to get the JSON file of this browser, Eg: "logs/metrics.json" or "logs/metrics_worker2.json"
+    '''
+    if not worker_id: return metrics_json_path
+    root, extension = os.path.splitext(metrics_json_path)
+    return f"{root}_worker{worker_id}{extension}"
+
+
+def write_metrics_json() -> None:
+    '''
+    Function to rewrite the metrics JSON file, atomically so readers never see it half written
+    '''
+    path = get_metrics_json_path()
+    try:
+        make_directories([path])
+        with open(path + ".tmp", "w", encoding="utf-8") as file:
+            json.dump(get_metrics(), file, indent=2)
+        os.replace(path + ".tmp", path)
+    except Exception as e:
+        print_lg(f'Failed to write metrics to "{path}"!', e)
+
+
+def __write_metrics_loop() -> None:
+    while not __stop_writer.wait(metrics_interval):
+        write_metrics_json()
+
+
+def start_metrics(get_run_state: Callable[[], dict]) -> None:
+    '''
+    Function to start serving and/or writing metrics, as configured. Does nothing if both are disabled.
+    * `get_run_state` returns `{"counters": {...}, "cycle": int, "search_term": str, "page": int, "daily_limit_reached": bool}`
+    '''
+    global __get_run_state, __server, __writer
+    __get_run_state = get_run_state
+    if metrics_port and __server is None:
+        port = metrics_port + worker_id
+        try:
+            __server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+            __server.daemon_threads = True
+            Thread(target=__server.serve_forever, name="metrics-server", daemon=True).start()
+            print_lg(f"Serving metrics at http://localhost:{port}/metrics")
+        except OSError as e:
+            __server = None
+            print_lg(f"Failed to serve metrics on port {port}!", e)
+    if metrics_json_path and __writer is None:
+        __stop_writer.clear()
+        __writer = Thread(target=__write_metrics_loop, name="metrics-writer", daemon=True)
+        __writer.start()
+
+
+def stop_metrics() -> None:
+    '''
+    Function to stop serving metrics and write the JSON file one last time
+    '''
+    global __server, __writer
+    if __server is not None:
+        __server.shutdown()
+        __server.server_close()
+        __server = None
+    if __writer is not None:
+        __stop_writer.set()
+        __writer.join(5)
+        __writer = None
+        write_metrics_json()
+#>
@@ -1,5 +1,3 @@
-
-
 from modules.helpers import make_directories
 from config.settings import run_in_background, stealth_mode, disable_extensions, safe_mode, file_name, failed_file_name, logs_folder_path, generated_resume_path
 from config.questions import default_resume_path
@@ -11,41 +9,158 @@ else:
     # from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support.ui import WebDriverWait
-from modules.helpers import find_default_profile_directory, critical_error_log, print_lg
-
-try:
-    make_directories([file_name,failed_file_name,logs_folder_path+"/screenshots",default_resume_path,generated_resume_path+"/temp"])
-
-    # Set up WebDriver with Chrome Profile
-    options = uc.ChromeOptions() if stealth_mode else Options()
-    if run_in_background:   options.add_argument("--headless")
-    if disable_extensions:  options.add_argument("--disable-extensions")
-
-    print_lg("IF YOU HAVE MORE THAN 10 TABS OPENED, PLEASE CLOSE OR BOOKMARK THEM! Or it's highly likely that application will just open browser and not do anything!")
-    if safe_mode:
-        print_lg("SAFE MODE: Will login with a guest profile, browsing history will not be saved in the browser!")
-    else:
-        profile_dir = find_default_profile_directory()
-        if profile_dir: options.add_argument(f"--user-data-dir={profile_dir}")
-        else: print_lg("Default profile directory not found. Logging in with a guest profile, Web history will not be saved!")
-    if stealth_mode:
-        # try:
-        #     driver = uc.Chrome(driver_executable_path="C:\\Program Files\\Google\\Chrome\\chromedriver-win64\\chromedriver.exe", options=options)
-        # except (FileNotFoundError, PermissionError) as e:
-        #     print_lg("(Undetected Mode) Got '{}' when using pre-installed ChromeDriver.".format(type(e).__name__))
-            print_lg("Downloading Chrome Driver... This may take some time. Undetected mode requires download every run!")
-            driver = uc.Chrome(options=options)
-    else: driver = webdriver.Chrome(options=options) #, service=Service(executable_path="C:\\Program Files\\Google\\Chrome\\chromedriver-win64\\chromedriver.exe"))
-    driver.maximize_window()
-    wait = WebDriverWait(driver, 5)
-    actions = ActionChains(driver)
-except Exception as e:
-    msg = 'Seems like either... \n\n1. Chrome is already running. \nA. Close all Chrome windows and try again. \n\n2. Google Chrome or Chromedriver is out dated. \nA. Update browser and Chromedriver (You can run "windows-setup.bat" in /setup folder for Windows PC to update Chromedriver)! \n\n3. If error occurred when using "stealth_mode", try reinstalling undetected-chromedriver. \nA. Open a terminal and use commands "pip uninstall undetected-chromedriver" and "pip install undetected-chromedriver". \n\n\nIf issue persists, try Safe Mode. Set, safe_mode = True in config.py \n\nPlease check GitHub discussions/support for solutions https://github.com/shahmeetk/Auto_job_applier_linkedIn \n                                   OR \nReach out in discord ( https://discord.gg/fFp7uUzWCY )'
-    if isinstance(e,TimeoutError): msg = "Couldn't download Chrome-driver. Set stealth_mode = False in config!"
-    print_lg(msg)
-    critical_error_log("In Opening Chrome", e)
-    from pyautogui import alert
-    alert(msg, "Error in opening chrome")
-    try: driver.quit()
-    except NameError: exit()
+from selenium.webdriver.remote.webdriver import WebDriver
+from modules.helpers import find_default_profile_directory, critical_error_log, print_lg, worker_id
+from modules.workers import get_worker_profile_path
+from contextlib import contextmanager
+from threading import Lock
+
+
+##> Browser factory
+'''
+Chrome is only started when it's first used, not when this module is imported, so config validation, history
+maintenance and AI setup can run before (or without) a browser. `driver`, `wait` and `actions` below stand in for
+the real objects and start the browser the first time any of their attributes is used. Once the browser was
+closed with `close_driver()` they raise instead of starting a new one.
+'''
+
+__driver: WebDriver | None = None
+__driver_closed = False
+__wait: WebDriverWait | None = None
+__actions: ActionChains | None = None
+__driver_lock = Lock()
+
+
+def create_driver() -> WebDriver:
+    '''
+    Function to start a new Chrome window with the configured profile and options, and return its driver
+    * Raises `RuntimeError` with tips to fix it if Chrome couldn't be started
+    '''
+    try:
+        make_directories([file_name,failed_file_name,logs_folder_path+"/screenshots",default_resume_path,generated_resume_path+"/temp"])
+
+        # Set up WebDriver with Chrome Profile
+        options = uc.ChromeOptions() if stealth_mode else Options()
+        if run_in_background:   options.add_argument("--headless")
+        if disable_extensions:  options.add_argument("--disable-extensions")
+
+        print_lg("IF YOU HAVE MORE THAN 10 TABS OPENED, PLEASE CLOSE OR BOOKMARK THEM! Or it's highly likely that application will just open browser and not do anything!")
+        if worker_id:
+            options.add_argument(f"--user-data-dir={get_worker_profile_path()}")
+        elif safe_mode:
+            print_lg("SAFE MODE: Will login with a guest profile, browsing history will not be saved in the browser!")
+        else:
+            profile_dir = find_default_profile_directory()
+            if profile_dir: options.add_argument(f"--user-data-dir={profile_dir}")
+            else: print_lg("Default profile directory not found. Logging in with a guest profile, Web history will not be saved!")
+        if stealth_mode:
+            # try:
+            #     driver = uc.Chrome(driver_executable_path="C:\\Program Files\\Google\\Chrome\\chromedriver-win64\\chromedriver.exe", options=options)
+            # except (FileNotFoundError, PermissionError) as e:
+            #     print_lg("(Undetected Mode) Got '{}' when using pre-installed ChromeDriver.".format(type(e).__name__))
+                print_lg("Downloading Chrome Driver... This may take some time. Undetected mode requires download every run!")
+                driver = uc.Chrome(options=options)
+        else: driver = webdriver.Chrome(options=options) #, service=Service(executable_path="C:\\Program Files\\Google\\Chrome\\chromedriver-win64\\chromedriver.exe"))
+        driver.maximize_window()
+        driver.set_script_timeout(60)
+        return driver
+    except Exception as e:
+        msg = 'Seems like either... \n\n1. Chrome is already running. \nA. Close all Chrome windows and try again. \n\n2. Google Chrome or Chromedriver is out dated. \nA. Update browser and Chromedriver (You can run "windows-setup.bat" in /setup folder for Windows PC to update Chromedriver)! \n\n3. If error occurred when using "stealth_mode", try reinstalling undetected-chromedriver. \nA. Open a terminal and use commands "pip uninstall undetected-chromedriver" and "pip install undetected-chromedriver". \n\n\nIf issue persists, try Safe Mode. Set, safe_mode = True in config.py \n\nPlease check GitHub discussions/support for solutions https://github.com/shahmeetk/Auto_job_applier_linkedIn \n                                   OR \nReach out in discord ( https://discord.gg/fFp7uUzWCY )'
+        if isinstance(e,TimeoutError): msg = "Couldn't download Chrome-driver. Set stealth_mode = False in config!"
+        print_lg(msg)
+        critical_error_log("In Opening Chrome", e)
+        try: driver.quit()
+        except NameError: pass
+        raise RuntimeError(msg) from e
+
+
+def use_driver(new_driver: WebDriver) -> WebDriver:
+    '''
+    Function to make `new_driver` the browser used by the bot (Eg: one created elsewhere), instead of starting Chrome
+    '''
+    global __driver, __wait, __actions, __driver_closed
+    __driver = new_driver
+    __driver_closed = False
+    __wait = WebDriverWait(new_driver, 5)
+    __actions = ActionChains(new_driver)
+    return new_driver
+
+
+def get_driver() -> WebDriver:
+    '''
+    Function to get the browser used by the bot, starting Chrome if it's not running yet
+    * Raises `RuntimeError` once the browser was closed with `close_driver()`
+    '''
+    if __driver is None:
+        with __driver_lock:
+            if __driver_closed: raise RuntimeError("The browser was closed and can't be used anymore!")
+            if __driver is None: use_driver(create_driver())
+    return __driver
+
+
+def get_wait() -> WebDriverWait:
+    '''
+    Function to get the default 5 sec `WebDriverWait` of the bot's browser, starting Chrome if needed
+    '''
+    get_driver()
+    return __wait
+
+
+def get_actions() -> ActionChains:
+    '''
+    Function to get the `ActionChains` of the bot's browser, starting Chrome if needed
+    '''
+    get_driver()
+    return __actions
+
+
+def is_driver_started() -> bool:
+    '''
+    Function to check if the browser was started (or given with `use_driver()`) without starting it
+    '''
+    return __driver is not None
+
+
+def close_driver() -> None:
+    '''
+    Function to quit the browser if it was started, does nothing otherwise.
+    The browser isn't started again after this, unless one is given with `use_driver()`.
+    '''
+    global __driver, __wait, __actions, __driver_closed
+    if __driver is None: return
+    try: __driver.quit()
+    finally:
+        __driver = __wait = __actions = None
+        __driver_closed = True
+
+
+@contextmanager
+def driver_session():
+    '''
+    Context manager giving the bot's browser (started on entry if needed) and quitting it on exit.
+    Eg: `with driver_session() as driver: driver.get("https://www.linkedin.com/")`
+    '''
+    try:
+        yield get_driver()
+    finally:
+        close_driver()
+
+
+class LazyBrowserObject:
+    '''
+    Stands in for the browser object returned by `getter`, which is only called when an attribute is first used
+    '''
+    def __init__(self, getter) -> None:
+        object.__setattr__(self, "_getter", getter)
+
+    def __getattr__(self, name: str):
+        return getattr(self._getter(), name)
+
+    def __repr__(self) -> str:
+        return f"<lazy {self._getter.__name__}()>"
+
 
+driver: WebDriver = LazyBrowserObject(get_driver)
+wait: WebDriverWait = LazyBrowserObject(get_wait)
+actions: ActionChains = LazyBrowserObject(get_actions)
+##<
@@ -0,0 +1,116 @@
+from config.settings import fixtures_folder_path
+
+from modules.helpers import make_directories, print_lg
+
+import os
+import re
+import json
+from datetime import datetime
+from threading import Thread, Lock
+from urllib.parse import urlsplit
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+
+##> Page capture and offline replay
+'''
+Pages seen during a real run can be saved as fixtures (`capture_pages = True` in settings) and later served from
+a local HTTP server, so functions like `get_job_cards()`, `get_job_main_details()`, `answer_questions()` and
+`apply_filters()` can be run and timed without LinkedIn (see `/replay.py`).
+
+Each fixture is the DOM of the page at that moment with scripts removed, so it's static and replays the same
+every time. Fixtures are listed in "manifest.jsonl" with their `kind` ("search", "filters", "job" or "modal"),
+the original `url` and the `file` name.
+
+NOTE: Fixtures contain whatever was on screen, including your name, email and answers. Don't share them as is!
+'''
+
+__manifest_name = "manifest.jsonl"
+__capture_lock = Lock()
+__capture_count = 0
+
+__re_scripts = re.compile(r'<script\b[^>]*>.*?</script\s*>', re.IGNORECASE | re.DOTALL)
+__re_linkedin_urls = re.compile(r'https?://(www\.)?linkedin\.com(?=/)', re.IGNORECASE)
+
+
+def capture_page(driver: WebDriver, kind: str) -> str | None:
+    '''
+    Function to save the current page of `driver` as a replay fixture of `kind`.
+    * Scripts are removed and LinkedIn links are made relative, so the fixture works offline
+    * Returns the fixture's file name, or `None` if capturing failed (never raises, it's only a recording)
+    '''
+    global __capture_count
+    try:
+        url = driver.current_url
+        html = __re_scripts.sub("", driver.page_source)
+        html = __re_linkedin_urls.sub("", html)
+        with __capture_lock:
+            make_directories([fixtures_folder_path])
+            __capture_count += 1
+            file = f'{datetime.now().strftime("%Y%m%d_%H%M%S")}_{__capture_count:04d}_{kind}.html'
+            with open(os.path.join(fixtures_folder_path, file), "w", encoding="utf-8") as fixture:
+                fixture.write(html)
+            with open(os.path.join(fixtures_folder_path, __manifest_name), "a", encoding="utf-8") as manifest:
+                manifest.write(json.dumps({"kind": kind, "url": url, "file": file}) + "\n")
+        return file
+    except Exception as e:
+        print_lg(f'Failed to capture "{kind}" page for replay!', e)
+        return None
+
+
+def get_fixtures(kind: str | None = None, folder: str = fixtures_folder_path) -> list[dict]:
+    '''
+    Function to list captured fixtures in `folder` in the order they were captured, only of `kind` if given
+    '''
+    path = os.path.join(folder, __manifest_name)
+    if not os.path.exists(path): return []
+    fixtures = []
+    with open(path, encoding="utf-8") as manifest:
+        for line in manifest:
+            if not line.strip(): continue
+            fixture = json.loads(line)
+            if (kind is None or fixture["kind"] == kind) and os.path.exists(os.path.join(folder, fixture["file"])):
+                fixtures.append(fixture)
+    return fixtures
+
+
+def __make_handler(folder: str) -> type[SimpleHTTPRequestHandler]:
+    # Requests for a fixture file are served as is, any other path (Eg: a job link clicked inside a fixture) gets the
+    # latest fixture captured at that path, so navigation inside fixtures keeps working offline
+    paths = {urlsplit(fixture["url"]).path: fixture["file"] for fixture in get_fixtures(folder=folder)}
+
+    class ReplayHandler(SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=folder, **kwargs)
+
+        def translate_path(self, path: str) -> str:
+            request_path = urlsplit(path).path
+            if request_path.rstrip("/") and not os.path.exists(super().translate_path(path)) and request_path in paths:
+                path = "/" + paths[request_path]
+            return super().translate_path(path)
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    return ReplayHandler
+
+
+def start_replay_server(port: int = 0, folder: str = fixtures_folder_path) -> ThreadingHTTPServer:
+    '''
+    Function to serve fixtures in `folder` on "http://127.0.0.1:`port`" in a background thread.
+    * `port = 0` picks any free port, use `get_fixture_url()` to get links
+    * Stop it with `server.shutdown()`
+    '''
+    server = ThreadingHTTPServer(("127.0.0.1", port), __make_handler(folder))
+    Thread(target=server.serve_forever, name="replay-server", daemon=True).start()
+    print_lg(f'Replaying {len(get_fixtures(folder=folder))} fixtures from "{folder}" on http://127.0.0.1:{server.server_address[1]}')
+    return server
+
+
+def get_fixture_url(server: ThreadingHTTPServer, fixture: dict) -> str:
+    '''
+    Function to get the local link of `fixture` served by `server`
+    '''
+    return f'http://127.0.0.1:{server.server_address[1]}/{fixture["file"]}'
+##<
@@ -0,0 +1,120 @@
+import sqlite3
+import hashlib
+
+from time import time
+from threading import Lock
+
+from config.search import bad_words, match_whole_words, security_clearance, did_masters, current_experience, about_company_bad_words, about_company_good_words
+from config.settings import skip_cache_path, skip_cache_days
+from modules.helpers import make_directories, print_lg
+
+
+#< Skip cache
+'''
+Jobs rejected for what their description says (bad words, clearance, experience) and companies rejected for what
+their "About Company" says are remembered here with a reason code, so later cycles and runs skip their cards
+without clicking them open again. Entries expire after `skip_cache_days`, and entries whose reason depends on
+settings that were changed since (Eg: `bad_words`, `current_experience`) are ignored, so a job is only skipped for
+reasons that still hold.
+'''
+
+skip_reason_codes = {
+    "Found a Bad Word in About Job": "bad_words",
+    "Asking for Security clearance": "security_clearance",
+    "Required experience is high": "experience",
+    "Found Blacklisted words in About Company": "blacklisted_company",
+}
+
+__reason_settings = {
+    "bad_words": (bad_words, match_whole_words),
+    "security_clearance": (security_clearance,),
+    "experience": (current_experience, did_masters),
+    "blacklisted_company": (about_company_bad_words, about_company_good_words, match_whole_words),
+}
+
+__connection: sqlite3.Connection | None = None
+__lock = Lock()
+
+
+def get_reason_fingerprint(reason: str) -> str | None:
+    '''
+    Function to get a hash of the settings a skip `reason` code depends on, `None` for unknown reasons
+    '''
+    settings = __reason_settings.get(reason)
+    return hashlib.sha256(repr(settings).encode("utf-8")).hexdigest()[:16] if settings is not None else None
+
+
+def get_skip_cache_connection() -> sqlite3.Connection:
+    '''
+    Function to open (once) and return the connection to the skip cache
+    '''
+    global __connection
+    if __connection is None:
+        make_directories([skip_cache_path])
+        __connection = sqlite3.connect(skip_cache_path, check_same_thread=False, timeout=30)
+        __connection.executescript('''
+            CREATE TABLE IF NOT EXISTS skipped (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                reason TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                skipped_at REAL NOT NULL,
+                PRIMARY KEY (kind, key)
+            ) WITHOUT ROWID;
+        ''')
+    return __connection
+
+
+def load_skip_cache() -> tuple[set[str], set[str]]:
+    '''
+    Function to get the `(rejected job IDs, blacklisted companies)` still valid, after dropping expired entries.
+    Returns empty sets if `skip_cache_days` is 0.
+    '''
+    rejected_jobs, blacklisted_companies = set(), set()
+    if skip_cache_days <= 0: return rejected_jobs, blacklisted_companies
+    try:
+        connection = get_skip_cache_connection()
+        with __lock:
+            connection.execute("DELETE FROM skipped WHERE skipped_at < ?", (time() - skip_cache_days * 86400,))
+            connection.commit()
+            rows = connection.execute("SELECT kind, key, reason, fingerprint FROM skipped").fetchall()
+    except Exception as e:
+        print_lg(f'Failed to load skipped jobs from "{skip_cache_path}"!', e)
+        return rejected_jobs, blacklisted_companies
+    fingerprints = {}
+    for kind, key, reason, fingerprint in rows:
+        if reason not in fingerprints: fingerprints[reason] = get_reason_fingerprint(reason)
+        if fingerprint != fingerprints[reason]: continue
+        (blacklisted_companies if kind == "company" else rejected_jobs).add(key)
+    print_lg(f"Loaded {len(rejected_jobs)} rejected jobs and {len(blacklisted_companies)} blacklisted companies to skip, from the last {skip_cache_days} days")
+    return rejected_jobs, blacklisted_companies
+
+
+def record_skip(job_id: str, reason: str, company: str | None = None) -> None:
+    '''
+    Function to remember that `job_id` (and `company`, if given) was rejected for `reason`, a reason code or a reason from `skip_reason_codes`
+    '''
+    if skip_cache_days <= 0: return
+    reason = skip_reason_codes.get(reason, reason)
+    fingerprint = get_reason_fingerprint(reason)
+    if fingerprint is None: return
+    entries = [("job", job_id, reason, fingerprint, time())]
+    if company: entries.append(("company", company, reason, fingerprint, time()))
+    try:
+        connection = get_skip_cache_connection()
+        with __lock:
+            connection.executemany("INSERT OR REPLACE INTO skipped (kind, key, reason, fingerprint, skipped_at) VALUES (?, ?, ?, ?, ?)", entries)
+            connection.commit()
+    except Exception as e:
+        print_lg(f"Failed to remember skipped Job ID: {job_id}!", e)
+
+
+def close_skip_cache() -> None:
+    '''
+    Function to close the connection to the skip cache
+    '''
+    global __connection
+    if __connection is not None:
+        __connection.close()
+        __connection = None
+#>
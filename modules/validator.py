@@ -126,6 +126,7 @@ def validate_search() -> None | ValueError | TypeError:
     check_list(about_company_bad_words, "about_company_bad_words")
     check_list(about_company_good_words, "about_company_good_words")
     check_list(bad_words, "bad_words")
+    check_boolean(match_whole_words, "match_whole_words")
     check_boolean(security_clearance, "security_clearance")
     check_boolean(did_masters, "did_masters")
     check_int(current_experience, "current_experience", -1)
@@ -175,8 +176,26 @@ def validate_settings() -> None | ValueError | TypeError:
     check_string(file_name, "file_name", min_length=1)
     check_string(failed_file_name, "failed_file_name", min_length=1)
     check_string(logs_folder_path, "logs_folder_path", min_length=1)
+    check_int(log_flush_interval, "log_flush_interval", 0)
+    check_int(log_queue_size, "log_queue_size", 1)
+    check_int(log_max_size_mb, "log_max_size_mb", 0)
+    check_int(log_backup_count, "log_backup_count", 0)
+    check_boolean(save_stage_timings, "save_stage_timings")
+    check_int(metrics_port, "metrics_port")
+    check_string(metrics_json_path, "metrics_json_path")
+    check_int(metrics_interval, "metrics_interval", 1)
+    check_string(history_index_path, "history_index_path", min_length=1)
+    check_string(history_export_path, "history_export_path", min_length=1)
+    check_boolean(dedupe_descriptions, "dedupe_descriptions")
+    check_string(description_store_path, "description_store_path", min_length=1)
+    check_int(skip_cache_days, "skip_cache_days")
+    check_string(skip_cache_path, "skip_cache_path", min_length=1)
+    check_boolean(capture_pages, "capture_pages")
+    check_string(fixtures_folder_path, "fixtures_folder_path", min_length=1)
 
     check_int(click_gap, "click_gap", 0)
+    check_int(page_settle_max_wait, "page_settle_max_wait", 0)
+    check_int(suggestions_max_wait, "suggestions_max_wait", 0)
 
     check_boolean(run_in_background, "run_in_background")
     check_boolean(disable_extensions, "disable_extensions")
@@ -184,6 +203,29 @@ def validate_settings() -> None | ValueError | TypeError:
     check_boolean(smooth_scroll, "smooth_scroll")
     check_boolean(keep_screen_awake, "keep_screen_awake")
     check_boolean(stealth_mode, "stealth_mode")
+    check_int(parallel_workers, "parallel_workers", 1)
+    check_string(worker_profiles_path, "worker_profiles_path", min_length=1)
+
+    check_int(ai_connect_timeout, "ai_connect_timeout", 1)
+    check_int(ai_read_timeout, "ai_read_timeout", 1)
+    check_int(ai_max_retries, "ai_max_retries", 0)
+    check_boolean(ai_async_client, "ai_async_client")
+    check_int(ai_max_concurrent_requests, "ai_max_concurrent_requests", 1)
+    check_int(ai_request_timeout, "ai_request_timeout", 1)
+    check_boolean(ollama_warm_up_model, "ollama_warm_up_model")
+    check_string(ollama_keep_alive, "ollama_keep_alive", min_length=1)
+
+    check_boolean(ai_strip_boilerplate, "ai_strip_boilerplate")
+    check_int(ai_description_token_budget, "ai_description_token_budget", 0)
+    check_string(ai_cache_path, "ai_cache_path", min_length=1)
+    check_int(skills_cache_max_entries, "skills_cache_max_entries", 0)
+    check_int(skills_cache_ttl_days, "skills_cache_ttl_days", 0)
+    check_boolean(remember_ai_answers, "remember_ai_answers")
+    check_boolean(scope_textarea_answers_to_job, "scope_textarea_answers_to_job")
+    check_int(answers_cache_max_entries, "answers_cache_max_entries", 0)
+    check_boolean(ai_prefetch, "ai_prefetch")
+    check_int(ai_prefetch_workers, "ai_prefetch_workers", 1)
+    check_boolean(ai_batch_questions, "ai_batch_questions")
 
 
 
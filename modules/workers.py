@@ -0,0 +1,185 @@
+import os
+import sys
+import json
+import subprocess
+
+from time import monotonic
+from datetime import datetime
+from threading import Lock
+
+from config.settings import parallel_workers, worker_profiles_path
+from modules.helpers import make_directories, print_lg, worker_id
+from modules.history import get_history_connection
+
+
+##> Parallel browsers
+'''
+With `parallel_workers > 1`, the main bot starts `parallel_workers - 1` more copies of itself, each one a worker
+with its own Chrome profile (in `worker_profiles_path`) and own log folder. All of them, main bot included, take
+search terms one at a time from a shared queue, so a slow search term doesn't hold the others back, and claim
+every job before working on it, so no two browsers apply to or skip the same job in the same cycle.
+
+The queue, claims and each worker's counters live in the history index database, which every process opens.
+'''
+
+pool_session = os.environ.get("LINKEDIN_BOT_POOL", "")
+
+# Max seconds to wait for workers to finish on their own when the main browser is done, before stopping them
+worker_finish_timeout = 15 * 60
+
+__lock = Lock()
+__tables_ready = False
+
+
+def is_pool_mode() -> bool:
+    '''
+    Function to check if search terms are shared between several browsers in this run
+    '''
+    return parallel_workers > 1 and pool_session != ""
+
+
+def get_worker_profile_path(worker: int = worker_id) -> str:
+    '''
+    Function to get the absolute path of the Chrome profile folder of `worker`, creating it if missing
+    '''
+    path = os.path.abspath(os.path.join(worker_profiles_path, f"worker_{worker}"))
+    make_directories([path])
+    return path
+
+
+def __get_connection():
+    global __tables_ready
+    connection = get_history_connection()
+    if not __tables_ready:
+        connection.executescript('''
+            CREATE TABLE IF NOT EXISTS pool_search_terms (
+                session TEXT NOT NULL,
+                cycle INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                term TEXT NOT NULL,
+                worker INTEGER,
+                PRIMARY KEY (session, cycle, position)
+            );
+            CREATE TABLE IF NOT EXISTS pool_jobs (
+                session TEXT NOT NULL,
+                cycle INTEGER NOT NULL,
+                job_id TEXT NOT NULL,
+                worker INTEGER NOT NULL,
+                PRIMARY KEY (session, cycle, job_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS pool_counters (
+                session TEXT NOT NULL,
+                worker INTEGER NOT NULL,
+                counters TEXT NOT NULL,
+                PRIMARY KEY (session, worker)
+            ) WITHOUT ROWID;
+        ''')
+        __tables_ready = True
+    return connection
+
+
+def start_workers() -> list[subprocess.Popen]:
+    '''
+    Function to start `parallel_workers - 1` workers running this same script, called once by the main bot.
+    * Workers log to "logs/worker_<n>/" instead of the console
+    * Returns the started processes, see `stop_workers()`
+    '''
+    global pool_session
+    if parallel_workers <= 1 or worker_id: return []
+    pool_session = os.environ["LINKEDIN_BOT_POOL"] = datetime.now().strftime("%Y%m%d_%H%M%S_") + str(os.getpid())
+    processes = []
+    for worker in range(1, parallel_workers):
+        environment = dict(os.environ, LINKEDIN_BOT_WORKER=str(worker))
+        processes.append(subprocess.Popen([sys.executable, os.path.abspath(sys.argv[0])], env=environment, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+        print_lg(f'Started worker {worker} with Chrome profile "{get_worker_profile_path(worker)}"')
+    return processes
+
+
+def stop_workers(processes: list[subprocess.Popen], terminate: bool = False, timeout: float = worker_finish_timeout) -> None:
+    '''
+    Function to wait up to `timeout` seconds for all worker `processes` to finish, then stop the ones still running
+    (Eg: with `run_non_stop`). Stops them right away if `terminate = True`.
+    '''
+    deadline = monotonic() + (0 if terminate else timeout)
+    for process in processes:
+        try: process.wait(max(0, deadline - monotonic()))
+        except subprocess.TimeoutExpired: pass
+    for process in processes:
+        if process.poll() is None:
+            print_lg(f"Stopping worker process {process.pid}...")
+            process.terminate()
+    for process in processes:
+        try: process.wait(30)
+        except subprocess.TimeoutExpired: process.kill()
+
+
+def claim_search_terms(cycle: int, search_terms: list[str]):
+    '''
+    Yields the search terms this browser should search in `cycle`.
+    * Without workers, that's just `search_terms`
+    * With workers, the first browser to reach `cycle` queues `search_terms` in its order, then each browser takes the next unclaimed one until none are left
+    '''
+    if not is_pool_mode():
+        yield from search_terms
+        return
+    connection = __get_connection()
+    with __lock:
+        connection.executemany(
+            "INSERT OR IGNORE INTO pool_search_terms (session, cycle, position, term) VALUES (?, ?, ?, ?)",
+            ((pool_session, cycle, position, term) for position, term in enumerate(search_terms))
+        )
+        connection.commit()
+    while True:
+        with __lock:
+            row = connection.execute('''
+                UPDATE pool_search_terms SET worker = ?
+                WHERE session = ? AND cycle = ? AND position = (
+                    SELECT MIN(position) FROM pool_search_terms WHERE session = ? AND cycle = ? AND worker IS NULL
+                ) RETURNING term
+            ''', (worker_id, pool_session, cycle, pool_session, cycle)).fetchone()
+            connection.commit()
+        if row is None: return
+        yield row[0]
+
+
+def claim_job(cycle: int, job_id: str) -> bool:
+    '''
+    Function to claim `job_id` for this browser in `cycle`.
+    * Returns `True` if this browser may work on it (always without workers), `False` if another one already claimed it
+    '''
+    if not is_pool_mode(): return True
+    connection = __get_connection()
+    with __lock:
+        connection.execute("INSERT OR IGNORE INTO pool_jobs (session, cycle, job_id, worker) VALUES (?, ?, ?, ?)", (pool_session, cycle, job_id, worker_id))
+        connection.commit()
+        row = connection.execute("SELECT worker FROM pool_jobs WHERE session = ? AND cycle = ? AND job_id = ?", (pool_session, cycle, job_id)).fetchone()
+    return row is not None and row[0] == worker_id
+
+
+def save_worker_counters(counters: dict[str, int]) -> None:
+    '''
+    Function to share this worker's `counters` (Eg: jobs applied, failed, skipped) with the main bot
+    '''
+    if not is_pool_mode(): return
+    try:
+        connection = __get_connection()
+        with __lock:
+            connection.execute("INSERT OR REPLACE INTO pool_counters (session, worker, counters) VALUES (?, ?, ?)", (pool_session, worker_id, json.dumps(counters)))
+            connection.commit()
+    except Exception as e:
+        print_lg("Failed to share worker counters!", e)
+
+
+def get_workers_counters() -> dict[str, int]:
+    '''
+    Function to get the sum of the counters shared by all workers of this run, except the main bot's own
+    '''
+    if not is_pool_mode(): return {}
+    totals = {}
+    with __lock:
+        rows = __get_connection().execute("SELECT counters FROM pool_counters WHERE session = ? AND worker != 0", (pool_session,)).fetchall()
+    for row in rows:
+        for name, value in json.loads(row[0]).items():
+            totals[name] = totals.get(name, 0) + value
+    return totals
+##<
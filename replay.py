@@ -0,0 +1,106 @@
+'''
+Author:     Meet Shah
+LinkedIn:   https://www.linkedin.com/in/meetshah10290/
+
+Copyright (C) 2024 Meet Shah
+
+License:    GNU Affero General Public License
+            https://www.gnu.org/licenses/agpl-3.0.en.html
+
+GitHub:     https://github.com/shahmeetk
+
+'''
+
+
+# Replays pages captured with `capture_pages = True` (see "/config/settings.py") from a local server and times the
+# bot's hot functions on them, no LinkedIn account or network needed. Usage:
+#   python replay.py [--fixtures "fixtures/"] [--repeat 5] [--kind search filters job modal] [--port 0]
+
+
+# REQUIRED IMPORTS
+import argparse
+from time import perf_counter
+
+import config.settings
+
+parser = argparse.ArgumentParser(description="Time the bot on captured LinkedIn pages served offline.")
+parser.add_argument("--fixtures", default=config.settings.fixtures_folder_path, help="Folder with captured fixtures")
+parser.add_argument("--repeat", type=int, default=5, help="How many times to run each function on each fixture")
+parser.add_argument("--kind", nargs="*", default=["search", "filters", "job", "modal"], help="Kinds of fixtures to replay")
+parser.add_argument("--port", type=int, default=0, help="Port for the local server (0 for any free port)")
+args = parser.parse_args()
+
+# Browser must be headless and nothing must be recorded or sent while replaying, set before the bot is imported
+config.settings.run_in_background = True
+config.settings.capture_pages = False
+
+import runAiBot as bot
+from modules.replay import start_replay_server, get_fixtures, get_fixture_url
+from modules.helpers import print_lg, flush_logs
+
+bot.use_AI = False
+bot.pause_after_filters = False
+bot.click_gap = 0
+
+
+#< Benchmarks
+def bench_search() -> None:
+    bot.wait.until(bot.EC.presence_of_all_elements_located((bot.By.XPATH, "//li[@data-occludable-job-id]")))
+    job_cards = bot.get_job_cards()
+    if job_cards: bot.get_job_main_details(job_cards[0], set(), set(), set(), 1)
+
+def bench_filters() -> None:
+    bot.apply_filters()
+
+def bench_job() -> None:
+    bot.get_job_description()
+
+def bench_modal() -> None:
+    bot.answer_questions(bot.find_by_class(bot.driver, "jobs-easy-apply-modal"), set(), "Remote")
+
+benchmarks = {
+    "search": ("get_job_cards + get_job_main_details", bench_search),
+    "filters": ("apply_filters", bench_filters),
+    "job": ("get_job_description", bench_job),
+    "modal": ("answer_questions", bench_modal),
+}
+#>
+
+
+def percentile(timings: list[float], percent: float) -> float:
+    timings = sorted(timings)
+    return timings[min(len(timings) - 1, int(round(percent / 100 * (len(timings) - 1))))]
+
+
+def main() -> None:
+    server = start_replay_server(args.port, args.fixtures)
+    try:
+        for kind in args.kind:
+            name, bench = benchmarks[kind]
+            fixtures = get_fixtures(kind, args.fixtures)
+            if not fixtures:
+                print_lg(f'No "{kind}" fixtures found in "{args.fixtures}", skipping {name}.')
+                continue
+            timings = []
+            failures = 0
+            for fixture in fixtures:
+                url = get_fixture_url(server, fixture)
+                for _ in range(args.repeat):
+                    bot.driver.get(url)
+                    start = perf_counter()
+                    try: bench()
+                    except Exception as e:
+                        failures += 1
+                        print_lg(f'{name} failed on "{fixture["file"]}"!', e)
+                    timings.append(perf_counter() - start)
+            print_lg(f'{name:<40} {len(fixtures):>4} fixtures x {args.repeat} | p50 {percentile(timings, 50):.3f}s | p95 {percentile(timings, 95):.3f}s | max {max(timings):.3f}s | {failures} failed')
+    finally:
+        server.shutdown()
+        bot.close_history_index()
+        try: bot.close_driver()
+        except Exception: pass
+        flush_logs()
+
+
+if __name__ == "__main__":
+    main()
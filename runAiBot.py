@@ -5,6 +5,7 @@ import csv
 import re
 import pyautogui
 
+from time import perf_counter
 from random import choice, shuffle, randint
 from datetime import datetime
 
@@ -25,11 +26,18 @@ from modules.open_chrome import *
 from modules.helpers import *
 from modules.clickers_and_finders import *
 from modules.validator import validate_config
+from modules.history import load_job_ids, record_job_id, close_history_index
+from modules.descriptions import store_description, replace_description, close_description_store
+from modules.skip_cache import load_skip_cache, record_skip, close_skip_cache
+from modules.metrics import start_metrics, stop_metrics
+from modules.replay import capture_page
+from modules.answer_rules import get_answer_values, resolve_answer, get_outcome, record_question
+from modules.workers import start_workers, stop_workers, claim_search_terms, claim_job, save_worker_counters, get_workers_counters
 
 # Import the unified AI interface
 from modules.ai.aiInterface import *
 
-from typing import Literal
+from typing import Literal, NamedTuple
 
 
 pyautogui.FAILSAFE = False
@@ -43,10 +51,11 @@ if run_in_background == True:
     pause_before_submit = False
     run_non_stop = False
 
-first_name = first_name.strip()
-middle_name = middle_name.strip()
-last_name = last_name.strip()
-full_name = first_name + " " + middle_name + " " + last_name if middle_name else first_name + " " + last_name
+# Extra browsers started for `parallel_workers` run unattended
+if worker_id:
+    pause_at_failed_question = False
+    pause_before_submit = False
+    pause_after_filters = False
 
 useNewResume = True
 randomly_answered_questions = set()
@@ -57,20 +66,18 @@ external_jobs_count = 0
 failed_count = 0
 skip_count = 0
 dailyEasyApplyLimitReached = False
+current_cycle = 0
+current_search_term = None
+current_page_number = None
 
-re_experience = re.compile(r'[(]?\s*(\d+)\s*[)]?\s*[-to]*\s*\d*[+]*\s*year[s]?', re.IGNORECASE)
-
-desired_salary_lakhs = str(round(desired_salary / 100000, 2))
-desired_salary_monthly = str(round(desired_salary/12, 2))
-desired_salary = str(desired_salary)
+bad_words_keywords = compile_keywords(bad_words, match_whole_words)
+about_company_bad_keywords = compile_keywords(about_company_bad_words, match_whole_words)
+about_company_good_keywords = compile_keywords(about_company_good_words, match_whole_words)
 
-current_ctc_lakhs = str(round(current_ctc / 100000, 2))
-current_ctc_monthly = str(round(current_ctc/12, 2))
-current_ctc = str(current_ctc)
+re_experience = re.compile(r'[(]?\s*(\d+)\s*[)]?\s*[-to]*\s*\d*[+]*\s*year[s]?', re.IGNORECASE)
 
-notice_period_months = str(notice_period//30)
-notice_period_weeks = str(notice_period//7)
-notice_period = str(notice_period)
+# Values the answer rules (see "modules/answer_rules.py") answer questions with
+answer_values = get_answer_values()
 
 aiClient = None
 ##> ------ Dheeraj Deshwal : dheeraj9811 Email:dheeraj20194@iiitd.ac.in/dheerajdeshwal9811@gmail.com - Feature ------
@@ -222,17 +229,11 @@ def logout_LN() -> bool:
 def get_applied_job_ids() -> set:
     '''
     Function to get a `set` of applied job's Job IDs
-    * Returns a set of Job IDs from existing applied jobs history csv file
+    * Returns a set of Job IDs from the history index, which is kept in sync with the applied jobs history csv file
     '''
-    job_ids = set()
-    try:
-        with open(file_name, 'r', encoding='utf-8') as file:
-            reader = csv.reader(file)
-            for row in reader:
-                job_ids.add(row[0])
-    except FileNotFoundError:
+    if not os.path.exists(file_name):
         print_lg(f"The CSV file '{file_name}' does not exist.")
-    return job_ids
+    return load_job_ids("applied")
 
 
 
@@ -250,7 +251,7 @@ def set_search_location() -> None:
             actions.send_keys(Keys.TAB, Keys.TAB).perform()
             actions.key_down(Keys.CONTROL).send_keys("a").key_up(Keys.CONTROL).perform()
             actions.send_keys(search_location.strip()).perform()
-            sleep(2)
+            wait_for_suggestions(driver, "wait: Search Location suggestions")
             actions.send_keys(Keys.ENTER).perform()
             try_xp(driver, ".//button[@aria-label='Cancel']")
         except Exception as e:
@@ -267,8 +268,9 @@ def apply_filters() -> None:
     try:
         recommended_wait = 1 if click_gap < 1 else 0
 
-        wait.until(EC.presence_of_element_located((By.XPATH, '//button[normalize-space()="All filters"]'))).click()
+        wait_for(driver, EC.presence_of_element_located((By.XPATH, '//button[normalize-space()="All filters"]'))).click()
         buffer(recommended_wait)
+        if capture_pages: capture_page(driver, "filters")
 
         wait_span_click(driver, sort_by)
         wait_span_click(driver, date_posted)
@@ -333,9 +335,42 @@ def get_page_info() -> tuple[WebElement | None, int | None]:
 
 
 
-def get_job_main_details(job: WebElement, blacklisted_companies: set, rejected_jobs: set) -> tuple[str, str, str, str, str, bool]:
+class JobCard(NamedTuple):
+    '''
+    Details of a job card in the search results, read without clicking it
+    '''
+    job_id: str
+    title: str
+    company: str
+    work_location: str
+    work_style: str
+    applied: bool
+
+
+def get_job_cards() -> list[JobCard] | ValueError:
+    '''
+    Function to get details of all job cards in the current search results page in a single browser call.
+    Returns a list of `JobCard`, in the order they're listed.
+    '''
+    raw_cards = run_js_file(driver, "get_job_cards.js", 1500, asynchronous=True)
+    if isinstance(raw_cards, dict): raise ValueError(f"Failed to read job cards: {raw_cards.get('error')}")
+    job_cards = []
+    for raw_card in raw_cards:
+        other_details = raw_card["subtitle"]
+        index = other_details.find(' · ')
+        company = other_details[:index]
+        work_location = other_details[index+3:]
+        work_style = work_location[work_location.rfind('(')+1:work_location.rfind(')')]
+        work_location = work_location[:work_location.rfind('(')].strip()
+        job_cards.append(JobCard(raw_card["job_id"], raw_card["title"], company, work_location, work_style, raw_card["footer_state"] == "Applied"))
+    return job_cards
+
+
+def get_job_main_details(card: JobCard, blacklisted_companies: set, rejected_jobs: set, applied_jobs: set, cycle: int) -> tuple[str, str, str, str, str, bool]:
     '''
     # Function to get job main details.
+    Decides whether to skip the job from its `card` alone and only clicks it open if it isn't skipped
+    and no other browser claimed it in this `cycle` (see "/modules/workers.py").
     Returns a tuple of (job_id, title, company, work_location, work_style, skip)
     * job_id: Job ID
     * title: Job title
@@ -344,19 +379,7 @@ def get_job_main_details(job: WebElement, blacklisted_companies: set, rejected_j
     * work_style: Work style of this job (Remote, On-site, Hybrid)
     * skip: A boolean flag to skip this job
     '''
-    job_details_button = job.find_element(By.TAG_NAME, 'a')  # job.find_element(By.CLASS_NAME, "job-card-list__title")  # Problem in India
-    scroll_to_view(driver, job_details_button, True)
-    job_id = job.get_dom_attribute('data-occludable-job-id')
-    title = job_details_button.text
-    title = title[:title.find("\n")]
-    # company = job.find_element(By.CLASS_NAME, "job-card-container__primary-description").text
-    # work_location = job.find_element(By.CLASS_NAME, "job-card-container__metadata-item").text
-    other_details = job.find_element(By.CLASS_NAME, 'artdeco-entity-lockup__subtitle').text
-    index = other_details.find(' · ')
-    company = other_details[:index]
-    work_location = other_details[index+3:]
-    work_style = work_location[work_location.rfind('(')+1:work_location.rfind(')')]
-    work_location = work_location[:work_location.rfind('(')].strip()
+    job_id, title, company, work_location, work_style, applied = card
 
     # Skip if previously rejected due to blacklist or already applied
     skip = False
@@ -366,13 +389,18 @@ def get_job_main_details(job: WebElement, blacklisted_companies: set, rejected_j
     elif job_id in rejected_jobs:
         print_lg(f'Skipping previously rejected "{title} | {company}" job. Job ID: {job_id}!')
         skip = True
+    elif applied or job_id in applied_jobs:
+        print_lg(f'Already applied to "{title} | {company}" job. Job ID: {job_id}!')
+        skip = True
+    elif not claim_job(cycle, job_id):
+        print_lg(f'"{title} | {company}" job is being handled by another browser. Job ID: {job_id}!')
+        skip = True
+    if skip: return (job_id,title,company,work_location,work_style,skip)
+
+    job_details_button = driver.find_element(By.XPATH, f'//li[@data-occludable-job-id="{job_id}"]//a')  # job.find_element(By.CLASS_NAME, "job-card-list__title")  # Problem in India
+    scroll_to_view(driver, job_details_button, True)
     try:
-        if job.find_element(By.CLASS_NAME, "job-card-container__footer-job-state").text == "Applied":
-            skip = True
-            print_lg(f'Already applied to "{title} | {company}" job. Job ID: {job_id}!')
-    except: pass
-    try:
-        if not skip: job_details_button.click()
+        job_details_button.click()
     except Exception as e:
         print_lg(f'Failed to click "{title} | {company}" job on details button. Job ID: {job_id}!')
         # print_lg(e)
@@ -388,19 +416,16 @@ def check_blacklist(rejected_jobs: set, job_id: str, company: str, blacklisted_c
     about_company_org = find_by_class(driver, "jobs-company__box")
     scroll_to_view(driver, about_company_org)
     about_company_org = about_company_org.text
-    about_company = about_company_org.lower()
-    skip_checking = False
-    for word in about_company_good_words:
-        if word.lower() in about_company:
-            print_lg(f'Found the word "{word}". So, skipped checking for blacklist words.')
-            skip_checking = True
-            break
-    if not skip_checking:
-        for word in about_company_bad_words:
-            if word.lower() in about_company:
-                rejected_jobs.add(job_id)
-                blacklisted_companies.add(company)
-                raise ValueError(f'\n"{about_company_org}"\n\nContains "{word}".')
+    good_words_found = find_keywords(about_company_good_keywords, about_company_org, first_only=True)
+    if good_words_found:
+        print_lg(f'Found the word "{good_words_found[0][0]}". So, skipped checking for blacklist words.')
+    else:
+        bad_words_found = find_keywords(about_company_bad_keywords, about_company_org)
+        if bad_words_found:
+            rejected_jobs.add(job_id)
+            blacklisted_companies.add(company)
+            record_skip(job_id, "blacklisted_company", company)
+            raise ValueError(f'\n"{about_company_org}"\n\nContains "{bad_words_found[0][0]}".')
     buffer(click_gap)
     scroll_to_view(driver, jobs_top_card)
     return rejected_jobs, blacklisted_companies, jobs_top_card
@@ -447,12 +472,12 @@ def get_job_description(
         skip = False
         skipReason = None
         skipMessage = None
-        for word in bad_words:
-            if word.lower() in jobDescriptionLow:
-                skipMessage = f'\n{jobDescription}\n\nContains bad word "{word}". Skipping this job!\n'
-                skipReason = "Found a Bad Word in About Job"
-                skip = True
-                break
+        bad_words_found = find_keywords(bad_words_keywords, jobDescription)
+        if bad_words_found:
+            words_found = '", "'.join(dict.fromkeys(word for word, _ in bad_words_found))
+            skipMessage = f'\n{jobDescription}\n\nContains bad word(s) "{words_found}". Skipping this job!\n'
+            skipReason = "Found a Bad Word in About Job"
+            skip = True
         if not skip and security_clearance == False and ('polygraph' in jobDescriptionLow or 'clearance' in jobDescriptionLow or 'secret' in jobDescriptionLow):
             skipMessage = f'\n{jobDescription}\n\nFound "Clearance" or "Polygraph". Skipping this job!\n'
             skipReason = "Asking for Security clearance"
@@ -485,255 +510,155 @@ def upload_resume(modal: WebElement, resume: str) -> tuple[bool, str]:
     except: return False, "Previous resume"
 
 # Function to answer common questions for Easy Apply
-def answer_common_questions(label: str, answer: str) -> str:
-    if 'sponsorship' in label or 'visa' in label: answer = require_visa
-    return answer
+# Function to read all questions in the Easy Apply modal
+def get_form_fields(modal: WebElement) -> list[dict]:
+    '''
+    Function to get every question in the Easy Apply `modal` in a single browser call.
+    Returns a list of `dict` with the question's `type` ("select", "radio", "text", "textarea" or "checkbox"), `label`,
+    `options`, current `value`, its `element` and `element_id`. Radio options carry their own `element` and `label_element`.
+    '''
+    return run_js_file(driver, "get_form_fields.js", modal)
 
 
 # Function to answer the questions for Easy Apply
-def answer_questions(modal: WebElement, questions_list: set, work_location: str, job_description: str | None = None ) -> set:
-    # Get all questions from the page
-
-    all_questions = modal.find_elements(By.XPATH, ".//div[@data-test-form-element]")
-    # all_questions = modal.find_elements(By.CLASS_NAME, "jobs-easy-apply-form-element")
-    # all_list_questions = modal.find_elements(By.XPATH, ".//div[@data-test-text-entity-list-form-component]")
-    # all_single_line_questions = modal.find_elements(By.XPATH, ".//div[@data-test-single-line-text-form-component]")
-    # all_questions = all_questions + all_list_questions + all_single_line_questions
+def answer_questions(modal: WebElement, questions_list: set, work_location: str, job_description: str | None = None, company: str | None = None) -> set:
+    # Get all questions from the page in one go, answers are worked out here and only written back when needed
+    all_questions = get_form_fields(modal)
+    # Text questions left for the AI, asked all at once after the rest of the page is filled
+    ai_questions = []
 
     for Question in all_questions:
         # Check if it's a select Question
-        select = try_xp(Question, ".//select", False)
-        if select:
-            label_org = "Unknown"
-            try:
-                label = Question.find_element(By.TAG_NAME, "label")
-                label_org = label.find_element(By.TAG_NAME, "span").text
-            except: pass
+        if Question["type"] == "select":
+            label_org = Question["label"]
             answer = 'Yes'
             label = label_org.lower()
-            select = Select(select)
-            selected_option = select.first_selected_option.text
+            selected_option = Question["value"]
             optionsText = []
             options = '"List of phone country codes"'
             if label != "phone country code":
-                optionsText = [option.text for option in select.options]
+                optionsText = Question["options"]
                 options = "".join([f' "{option}",' for option in optionsText])
             prev_answer = selected_option
             if overwrite_previous_answers or selected_option == "Select an option":
-                if 'email' in label or 'phone' in label: answer = prev_answer
-                elif 'gender' in label or 'sex' in label: answer = gender
-                elif 'disability' in label: answer = disability_status
-                elif 'proficiency' in label: answer = 'Professional'
-                else: answer = answer_common_questions(label,answer)
-                try: select.select_by_visible_text(answer)
-                except NoSuchElementException as e:
-                    possible_answer_phrases = ["Decline", "not wish", "don't wish", "Prefer not", "not want"] if answer == 'Decline' else [answer]
-                    foundOption = False
-                    for phrase in possible_answer_phrases:
-                        for option in optionsText:
-                            if phrase in option:
-                                select.select_by_visible_text(option)
-                                answer = f'Decline ({option})' if len(possible_answer_phrases) > 1 else option
-                                foundOption = True
-                                break
-                        if foundOption: break
-                    if not foundOption:
-                        #TODO: Use AI to answer the question need to be implemented logic to extract the options for the question
-                        print_lg(f'Failed to find an option with text "{answer}" for question labelled "{label_org}", answering randomly!')
-                        select.select_by_index(randint(1, len(select.options)-1))
-                        answer = select.first_selected_option.text
-                        randomly_answered_questions.add((f'{label_org} [ {options} ]',"select"))
+                resolved = resolve_answer("select", label, answer_values, optionsText, Question["options"], previous_answer=prev_answer)
+                answer = resolved.answer
+                record_question("select", label, prev_answer, resolved, get_outcome("select", resolved, use_AI), optionsText, Question["options"])
+                select = Select(Question["element"])
+                if resolved.option is not None:
+                    foundOption = Question["options"][resolved.option]
+                    if foundOption != selected_option: select.select_by_visible_text(foundOption)
+                else:
+                    #TODO: Use AI to answer the question need to be implemented logic to extract the options for the question
+                    print_lg(f'Failed to find an option with text "{answer}" for question labelled "{label_org}", answering randomly!')
+                    random_index = randint(1, len(Question["options"])-1)
+                    select.select_by_index(random_index)
+                    answer = Question["options"][random_index]
+                    randomly_answered_questions.add((f'{label_org} [ {options} ]',"select"))
             questions_list.add((f'{label_org} [ {options} ]', answer, "select", prev_answer))
             continue
 
         # Check if it's a radio Question
-        radio = try_xp(Question, './/fieldset[@data-test-form-builder-radio-button-form-component="true"]', False)
-        if radio:
+        if Question["type"] == "radio":
             prev_answer = None
-            label = try_xp(radio, './/span[@data-test-form-builder-radio-button-form-component__title]', False)
-            try: label = find_by_class(label, "visually-hidden", 2.0)
-            except: pass
-            label_org = label.text if label else "Unknown"
+            label_org = Question["label"]
             answer = 'Yes'
             label = label_org.lower()
 
             label_org += ' [ '
-            options = radio.find_elements(By.TAG_NAME, 'input')
+            options = Question["options"]
             options_labels = []
 
             for option in options:
-                id = option.get_attribute("id")
-                option_label = try_xp(radio, f'.//label[@for="{id}"]', False)
-                options_labels.append( f'"{option_label.text if option_label else "Unknown"}"<{option.get_attribute("value")}>' ) # Saving option as "label <value>"
-                if option.is_selected(): prev_answer = options_labels[-1]
+                options_labels.append( f'"{option["label"]}"<{option["value"]}>' ) # Saving option as "label <value>"
+                if option["selected"]: prev_answer = options_labels[-1]
                 label_org += f' {options_labels[-1]},'
 
             if overwrite_previous_answers or prev_answer is None:
-                if 'citizenship' in label or 'employment eligibility' in label: answer = us_citizenship
-                elif 'veteran' in label or 'protected' in label: answer = veteran_status
-                elif 'disability' in label or 'handicapped' in label:
-                    answer = disability_status
-                else: answer = answer_common_questions(label,answer)
-                foundOption = try_xp(radio, f".//label[normalize-space()='{answer}']", False)
-                if foundOption:
-                    actions.move_to_element(foundOption).click().perform()
+                exact_labels = [" ".join(option["label"].split()) if option["label_element"] else None for option in options]
+                resolved = resolve_answer("radio", label, answer_values, options_labels, exact_labels, previous_answer=prev_answer)
+                answer = resolved.answer
+                record_question("radio", label, prev_answer, resolved, get_outcome("radio", resolved, use_AI), options_labels, exact_labels)
+                if resolved.exact:
+                    actions.move_to_element(options[resolved.option]["label_element"]).click().perform()
+                elif resolved.option is not None:
+                    actions.move_to_element(options[resolved.option]["element"]).click().perform()
                 else:
-                    possible_answer_phrases = ["Decline", "not wish", "don't wish", "Prefer not", "not want"] if answer == 'Decline' else [answer]
-                    ele = options[0]
                     answer = options_labels[0]
-                    for phrase in possible_answer_phrases:
-                        for i, option_label in enumerate(options_labels):
-                            if phrase in option_label:
-                                foundOption = options[i]
-                                ele = foundOption
-                                answer = f'Decline ({option_label})' if len(possible_answer_phrases) > 1 else option_label
-                                break
-                        if foundOption: break
-                    # if answer == 'Decline':
-                    #     answer = options_labels[0]
-                    #     for phrase in ["Prefer not", "not want", "not wish"]:
-                    #         foundOption = try_xp(radio, f".//label[normalize-space()='{phrase}']", False)
-                    #         if foundOption:
-                    #             answer = f'Decline ({phrase})'
-                    #             ele = foundOption
-                    #             break
-                    actions.move_to_element(ele).click().perform()
-                    if not foundOption: randomly_answered_questions.add((f'{label_org} ]',"radio"))
+                    actions.move_to_element(options[0]["element"]).click().perform()
+                    randomly_answered_questions.add((f'{label_org} ]',"radio"))
             else: answer = prev_answer
             questions_list.add((label_org+" ]", answer, "radio", prev_answer))
             continue
 
         # Check if it's a text question
-        text = try_xp(Question, ".//input[@type='text']", False)
-        if text:
+        if Question["type"] == "text":
+            text = Question["element"]
             do_actions = False
-            label = try_xp(Question, ".//label[@for]", False)
-            try: label = label.find_element(By.CLASS_NAME,'visually-hidden')
-            except: pass
-            label_org = label.text if label else "Unknown"
+            label_org = Question["label"]
             answer = "" # years_of_experience
             label = label_org.lower()
 
-            prev_answer = text.get_attribute("value")
+            prev_answer = Question["value"]
+            value = prev_answer
             if not prev_answer or overwrite_previous_answers:
-                if 'experience' in label or 'years' in label: answer = years_of_experience
-                elif 'phone' in label or 'mobile' in label: answer = phone_number
-                elif 'street' in label: answer = street
-                elif 'city' in label or 'location' in label or 'address' in label:
-                    answer = current_city if current_city else work_location
-                    do_actions = True
-                elif 'signature' in label: answer = full_name # 'signature' in label or 'legal name' in label or 'your name' in label or 'full name' in label: answer = full_name     # What if question is 'name of the city or university you attend, name of referral etc?'
-                elif 'name' in label:
-                    if 'full' in label: answer = full_name
-                    elif 'first' in label and 'last' not in label: answer = first_name
-                    elif 'middle' in label and 'last' not in label: answer = middle_name
-                    elif 'last' in label and 'first' not in label: answer = last_name
-                    elif 'employer' in label: answer = recent_employer
-                    else: answer = full_name
-                elif 'notice' in label:
-                    if 'month' in label:
-                        answer = notice_period_months
-                    elif 'week' in label:
-                        answer = notice_period_weeks
-                    else: answer = notice_period
-                elif 'salary' in label or 'compensation' in label or 'ctc' in label or 'pay' in label:
-                    if 'current' in label or 'present' in label:
-                        if 'month' in label:
-                            answer = current_ctc_monthly
-                        elif 'lakh' in label:
-                            answer = current_ctc_lakhs
-                        else:
-                            answer = current_ctc
-                    else:
-                        if 'month' in label:
-                            answer = desired_salary_monthly
-                        elif 'lakh' in label:
-                            answer = desired_salary_lakhs
-                        else:
-                            answer = desired_salary
-                elif 'linkedin' in label: answer = linkedIn
-                elif 'website' in label or 'blog' in label or 'portfolio' in label or 'link' in label: answer = website
-                elif 'scale of 1-10' in label: answer = confidence_level
-                elif 'headline' in label: answer = linkedin_headline
-                elif ('hear' in label or 'come across' in label) and 'this' in label and ('job' in label or 'position' in label): answer = "https://github.com/shahmeetk/Auto_job_applier_linkedIn"
-                elif 'state' in label or 'province' in label: answer = state
-                elif 'zip' in label or 'postal' in label or 'code' in label: answer = zipcode
-                elif 'country' in label: answer = country
-                else: answer = answer_common_questions(label,answer)
+                resolved = resolve_answer("text", label, answer_values, previous_answer=prev_answer, city=current_city if current_city else work_location)
+                answer = resolved.answer
+                do_actions = bool(resolved.rule and resolved.rule.get("pick_suggestion"))
+                record_question("text", label, prev_answer, resolved, get_outcome("text", resolved, use_AI))
                 ##> ------ Dheeraj Deshwal : dheeraj9811 Email:dheeraj20194@iiitd.ac.in/dheerajdeshwal9811@gmail.com - Feature ------
                 if answer == "":
                     if use_AI:
-                        try:
-                            answer = answer_question(
-                                question=label_org,
-                                question_type="text",
-                                job_description=job_description,
-                                user_information_all=user_information_all
-                            )
-                            print_lg(f'AI answer received for question "{label_org}"\nAnswer: "{answer}"')
-                        except Exception as e:
-                            print_lg(f"Failed to get AI answer: {e}")
-                            randomly_answered_questions.add((label_org, "text"))
-                            answer = years_of_experience
+                        ai_questions.append({"question": label_org, "question_type": "text", "element": text, "label": label, "prev_answer": prev_answer})
+                        continue
                     else:
                         randomly_answered_questions.add((label_org, "text"))
                         answer = years_of_experience
                  ##<
                 text.clear()
                 text.send_keys(answer)
+                value = answer
                 if do_actions:
-                    sleep(2)
+                    wait_for_suggestions(driver, "wait: city suggestions")
                     actions.send_keys(Keys.ARROW_DOWN)
                     actions.send_keys(Keys.ENTER).perform()
-            questions_list.add((label, text.get_attribute("value"), "text", prev_answer))
+                    value = text.get_attribute("value")
+            questions_list.add((label, value, "text", prev_answer))
             continue
 
         # Check if it's a textarea question
-        text_area = try_xp(Question, ".//textarea", False)
-        if text_area:
-            label = try_xp(Question, ".//label[@for]", False)
-            label_org = label.text if label else "Unknown"
+        if Question["type"] == "textarea":
+            text_area = Question["element"]
+            label_org = Question["label"]
             label = label_org.lower()
             answer = ""
-            prev_answer = text_area.get_attribute("value")
+            prev_answer = Question["value"]
+            value = prev_answer
             if not prev_answer or overwrite_previous_answers:
-                if 'summary' in label: answer = linkedin_summary
-                elif 'cover' in label: answer = cover_letter
+                resolved = resolve_answer("textarea", label, answer_values, previous_answer=prev_answer)
+                answer = resolved.answer
+                record_question("textarea", label, prev_answer, resolved, get_outcome("textarea", resolved, use_AI))
                 if answer == "":
                 ##> ------ Dheeraj Deshwal : dheeraj9811 Email:dheeraj20194@iiitd.ac.in/dheerajdeshwal9811@gmail.com - Feature ------
                     if use_AI:
-                        try:
-                            answer = answer_question(
-                                question=label_org,
-                                question_type="textarea",
-                                job_description=job_description,
-                                user_information_all=user_information_all
-                            )
-                            print_lg(f'AI answer received for question "{label_org}"\nAnswer: "{answer}"')
-                        except Exception as e:
-                            print_lg(f"Failed to get AI answer: {e}")
-                            randomly_answered_questions.add((label_org, "textarea"))
+                        ai_questions.append({"question": label_org, "question_type": "textarea", "element": text_area, "label": label, "prev_answer": prev_answer})
+                        continue
                     else:
                         randomly_answered_questions.add((label_org, "textarea"))
-            text_area.clear()
-            text_area.send_keys(answer)
-            if do_actions:
-                    sleep(2)
-                    actions.send_keys(Keys.ARROW_DOWN)
-                    actions.send_keys(Keys.ENTER).perform()
-            questions_list.add((label, text_area.get_attribute("value"), "textarea", prev_answer))
+                text_area.clear()
+                text_area.send_keys(answer)
+                value = answer
+            questions_list.add((label, value, "textarea", prev_answer))
             ##<
             continue
 
         # Check if it's a checkbox question
-        checkbox = try_xp(Question, ".//input[@type='checkbox']", False)
-        if checkbox:
-            label = try_xp(Question, ".//span[@class='visually-hidden']", False)
-            label_org = label.text if label else "Unknown"
+        if Question["type"] == "checkbox":
+            checkbox = Question["element"]
+            label_org = Question["label"]
             label = label_org.lower()
-            answer = try_xp(Question, ".//label[@for]", False)  # Sometimes multiple checkboxes are given for 1 question, Not accounted for that yet
-            answer = answer.text if answer else "Unknown"
-            prev_answer = checkbox.is_selected()
+            answer = Question["option"]  # Sometimes multiple checkboxes are given for 1 question, Not accounted for that yet
+            prev_answer = Question["value"]
             checked = prev_answer
             if not prev_answer:
                 try:
@@ -746,6 +671,33 @@ def answer_questions(modal: WebElement, questions_list: set, work_location: str,
             continue
 
 
+    ##> ------ Dheeraj Deshwal : dheeraj9811 Email:dheeraj20194@iiitd.ac.in/dheerajdeshwal9811@gmail.com - Feature ------
+    # Answer the text questions left for the AI, all in one request if there are several
+    if ai_questions:
+        ai_answers = answer_questions_batch(ai_questions, job_description=job_description, user_information_all=user_information_all, company=company)
+        for ai_question in ai_questions:
+            label_org, question_type = ai_question["question"], ai_question["question_type"]
+            answer = ai_answers.get(label_org)
+            if answer is None:
+                try:
+                    answer = answer_question(
+                        question=label_org,
+                        question_type=question_type,
+                        job_description=job_description,
+                        user_information_all=user_information_all,
+                        company=company
+                    )
+                    print_lg(f'AI answer received for question "{label_org}"\nAnswer: "{answer}"')
+                except Exception as e:
+                    print_lg(f"Failed to get AI answer: {e}")
+                    randomly_answered_questions.add((label_org, question_type))
+                    answer = years_of_experience if question_type == "text" else ""
+            else: print_lg(f'AI answer received for question "{label_org}"\nAnswer: "{answer}"')
+            ai_question["element"].clear()
+            ai_question["element"].send_keys(answer)
+            questions_list.add((ai_question["label"], answer, question_type, ai_question["prev_answer"]))
+    ##<
+
     # Select todays date
     try_xp(driver, "//button[contains(@aria-label, 'This is today')]")
 
@@ -773,7 +725,7 @@ def external_apply(pagination_element: WebElement, job_id: str, job_link: str, r
         if pagination_element != None: return True, application_link, tabs_count
     try:
         # Click the Apply button
-        apply_button = wait.until(EC.element_to_be_clickable((By.XPATH, ".//button[contains(@class,'jobs-apply-button') and contains(@class, 'artdeco-button--3')]")))
+        apply_button = wait_for(driver, EC.element_to_be_clickable((By.XPATH, ".//button[contains(@class,'jobs-apply-button') and contains(@class, 'artdeco-button--3')]")))
         apply_button.click()
 
         # Click Continue if needed
@@ -824,20 +776,23 @@ def follow_company(modal: WebDriver = driver) -> None:
 
 
 #< Failed attempts logging
-def failed_job(job_id: str, job_link: str, resume: str, date_listed, error: str, exception: Exception, application_link: str, screenshot_name: str) -> None:
+def failed_job(job_id: str, job_link: str, resume: str, date_listed, error: str, exception: Exception, application_link: str, screenshot_name: str, description: str | None = None) -> None:
     '''
     Function to update failed jobs list in excel
+    * `description` found in `exception` (Eg: skip messages) is written as a reference if `dedupe_descriptions` is True
     '''
     try:
+        if dedupe_descriptions and description: exception = replace_description(str(exception), description)
         with open(failed_file_name, 'a', newline='', encoding='utf-8') as file:
             fieldnames = ['Job ID', 'Job Link', 'Resume Tried', 'Date listed', 'Date Tried', 'Assumed Reason', 'Stack Trace', 'External Job link', 'Screenshot Name']
             writer = csv.DictWriter(file, fieldnames=fieldnames)
             if file.tell() == 0: writer.writeheader()
             writer.writerow({'Job ID':job_id, 'Job Link':job_link, 'Resume Tried':resume, 'Date listed':date_listed, 'Date Tried':datetime.now(), 'Assumed Reason':error, 'Stack Trace':exception, 'External Job link':application_link, 'Screenshot Name':screenshot_name})
             file.close()
+        record_job_id(job_id, "failed")
     except Exception as e:
         print_lg("Failed to update failed jobs list!", e)
-        pyautogui.alert("Failed to update the excel of failed jobs!\nProbably because of 1 of the following reasons:\n1. The file is currently open or in use by another program\n2. Permission denied to write to the file\n3. Failed to find the file", "Failed Logging")
+        if not worker_id: pyautogui.alert("Failed to update the excel of failed jobs!\nProbably because of 1 of the following reasons:\n1. The file is currently open or in use by another program\n2. Permission denied to write to the file\n3. Failed to find the file", "Failed Logging")
 
 
 def screenshot(driver: WebDriver, job_id: str, failedAt: str) -> str:
@@ -868,14 +823,15 @@ def submitted_jobs(job_id: str, title: str, company: str, work_location: str, wo
             writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
             if csv_file.tell() == 0: writer.writeheader()
             writer.writerow({'Job ID':job_id, 'Title':title, 'Company':company, 'Work Location':work_location, 'Work Style':work_style,
-                            'About Job':description, 'Experience required': experience_required, 'Skills required':skills,
+                            'About Job':store_description(description) if dedupe_descriptions else description, 'Experience required': experience_required, 'Skills required':skills,
                                 'HR Name':hr_name, 'HR Link':hr_link, 'Resume':resume, 'Re-posted':reposted,
                                 'Date Posted':date_listed, 'Date Applied':date_applied, 'Job Link':job_link,
                                 'External Job link':application_link, 'Questions Found':questions_list, 'Connect Request':connect_request})
         csv_file.close()
+        record_job_id(job_id, "applied")
     except Exception as e:
         print_lg("Failed to update submitted jobs list!", e)
-        pyautogui.alert("Failed to update the excel of applied jobs!\nProbably because of 1 of the following reasons:\n1. The file is currently open or in use by another program\n2. Permission denied to write to the file\n3. Failed to find the file", "Failed Logging")
+        if not worker_id: pyautogui.alert("Failed to update the excel of applied jobs!\nProbably because of 1 of the following reasons:\n1. The file is currently open or in use by another program\n2. Permission denied to write to the file\n3. Failed to find the file", "Failed Logging")
 
 
 
@@ -890,48 +846,52 @@ def discard_job() -> None:
 
 
 # Function to apply to jobs
-def apply_to_jobs(search_terms: list[str]) -> None:
-    applied_jobs = get_applied_job_ids()
-    rejected_jobs = set()
-    blacklisted_companies = set()
+def apply_to_jobs(search_terms: list[str], cycle: int = 1, applied_jobs: set | None = None) -> None:
+    if applied_jobs is None: applied_jobs = get_applied_job_ids()
+    rejected_jobs, blacklisted_companies = load_skip_cache()
     global current_city, failed_count, skip_count, easy_applied_count, external_jobs_count, tabs_count, pause_before_submit, pause_at_failed_question, useNewResume
+    global current_cycle, current_search_term, current_page_number
+    current_cycle = cycle
 
     # Track applications in current session for logout/login refresh
     session_application_count = 0
     current_city = current_city.strip()
 
     if randomize_search_order:  shuffle(search_terms)
-    for searchTerm in search_terms:
+    for searchTerm in claim_search_terms(cycle, search_terms):
+        current_search_term, current_page_number = searchTerm, None
         driver.get(f"https://www.linkedin.com/jobs/search/?keywords={searchTerm}")
         print_lg("\n________________________________________________________________________________________________________________________\n")
         print_lg(f'\n>>>> Now searching for "{searchTerm}" <<<<\n\n')
 
-        apply_filters()
+        with timed("apply_filters"): apply_filters()
 
         current_count = 0
         try:
             while current_count < switch_number:
                 # Wait until job listings are loaded
-                wait.until(EC.presence_of_all_elements_located((By.XPATH, "//li[@data-occludable-job-id]")))
+                wait_for(driver, EC.presence_of_all_elements_located((By.XPATH, "//li[@data-occludable-job-id]")))
 
-                pagination_element, current_page = get_page_info()
+                with timed("get_page_info"): pagination_element, current_page = get_page_info()
+                current_page_number = current_page
 
-                # Find all job listings in current page
-                buffer(3)
-                job_listings = driver.find_elements(By.XPATH, "//li[@data-occludable-job-id]")
+                # Get details of all job listings in current page once the list stops changing
+                wait_for_settle(driver, try_xp(driver, "//li[@data-occludable-job-id]/parent::*", False) or None, "wait: job list")
+                job_cards = get_job_cards()
+                if capture_pages: capture_page(driver, "search")
 
 
-                for job in job_listings:
+                for card in job_cards:
                     if keep_screen_awake: pyautogui.press('shiftright')
                     if current_count >= switch_number: break
                     print_lg("\n-@-\n")
 
-                    job_id,title,company,work_location,work_style,skip = get_job_main_details(job, blacklisted_companies, rejected_jobs)
+                    with timed("get_job_main_details"): job_id,title,company,work_location,work_style,skip = get_job_main_details(card, blacklisted_companies, rejected_jobs, applied_jobs, cycle)
 
                     if skip: continue
                     # Redundant fail safe check for applied jobs!
                     try:
-                        if job_id in applied_jobs or find_by_class(driver, "jobs-s-apply__application-link", 2):
+                        if find_by_class(driver, "jobs-s-apply__application-link", 2):
                             print_lg(f'Already applied to "{title} | {company}" job. Job ID: {job_id}!')
                             continue
                     except Exception as e:
@@ -951,7 +911,7 @@ def apply_to_jobs(search_terms: list[str]) -> None:
                     screenshot_name = "Not Available"
 
                     try:
-                        rejected_jobs, blacklisted_companies, jobs_top_card = check_blacklist(rejected_jobs,job_id,company,blacklisted_companies)
+                        with timed("check_blacklist"): rejected_jobs, blacklisted_companies, jobs_top_card = check_blacklist(rejected_jobs,job_id,company,blacklisted_companies)
                     except ValueError as e:
                         print_lg(e, 'Skipping this job!\n')
                         failed_job(job_id, job_link, resume, date_listed, "Found Blacklisted words in About Company", e, "Skipped", screenshot_name)
@@ -965,7 +925,7 @@ def apply_to_jobs(search_terms: list[str]) -> None:
 
                     # Hiring Manager info
                     try:
-                        hr_info_card = WebDriverWait(driver,2).until(EC.presence_of_element_located((By.CLASS_NAME, "hirer-card__hirer-information")))
+                        with timed("hr_card_wait"): hr_info_card = wait_for(driver, EC.presence_of_element_located((By.CLASS_NAME, "hirer-card__hirer-information")), 2)
                         hr_link = hr_info_card.find_element(By.TAG_NAME, "a").get_attribute("href")
                         hr_name = hr_info_card.find_element(By.TAG_NAME, "span").text
                         # if connect_hr:
@@ -1003,24 +963,21 @@ def apply_to_jobs(search_terms: list[str]) -> None:
                         print_lg("Failed to calculate the date posted!",e)
 
 
-                    description, experience_required, skip, reason, message = get_job_description()
+                    with timed("get_job_description"): description, experience_required, skip, reason, message = get_job_description()
+                    if capture_pages: capture_page(driver, "job")
                     if skip:
                         print_lg(message)
-                        failed_job(job_id, job_link, resume, date_listed, reason, message, "Skipped", screenshot_name)
+                        failed_job(job_id, job_link, resume, date_listed, reason, message, "Skipped", screenshot_name, description)
                         rejected_jobs.add(job_id)
+                        record_skip(job_id, reason)
                         skip_count += 1
                         continue
 
 
-                    # Extract skills using AI if enabled
+                    # Start extracting skills and answering this company's known questions in the background if AI is enabled
                     if use_AI and description != "Unknown":
-                        try:
-                            skills = extract_skills(description)
-                            print_lg("Skills extracted using AI:")
-                            print_lg(skills, pretty=True)
-                        except Exception as e:
-                            print_lg(f"Failed to extract skills using AI: {e}")
-                            skills = "Failed to extract skills using AI"
+                        prefetch_skills(description)
+                        prefetch_answers(company, description, user_information_all)
 
                     uploaded = False
                     # Case 1: Easy Apply Button
@@ -1029,7 +986,8 @@ def apply_to_jobs(search_terms: list[str]) -> None:
                             try:
                                 errored = ""
                                 modal = find_by_class(driver, "jobs-easy-apply-modal")
-                                wait_span_click(modal, "Next", 1)
+                                wait_for_settle(driver, modal, "wait: easy apply modal")
+                                wait_span_click(modal, "Next", 0)
                                 # if description != "Unknown":
                                 #     resume = create_custom_resume(description)
                                 resume = "Previous resume"
@@ -1048,8 +1006,10 @@ def apply_to_jobs(search_terms: list[str]) -> None:
                                         screenshot_name = screenshot(driver, job_id, "Failed at questions")
                                         errored = "stuck"
                                         raise Exception("Seems like stuck in a continuous loop of next, probably because of new questions.")
-                                    questions_list = answer_questions(modal, questions_list, work_location, job_description=description)
-                                    if useNewResume and not uploaded: uploaded, resume = upload_resume(modal, default_resume_path)
+                                    if capture_pages: capture_page(driver, "modal")
+                                    with timed("answer_questions (per page)"): questions_list = answer_questions(modal, questions_list, work_location, job_description=description, company=company)
+                                    if useNewResume and not uploaded:
+                                        with timed("upload_resume"): uploaded, resume = upload_resume(modal, default_resume_path)
                                     try: next_button = modal.find_element(By.XPATH, './/span[normalize-space(.)="Review"]')
                                     except NoSuchElementException:  next_button = modal.find_element(By.XPATH, './/button[contains(span, "Next")]')
                                     try: next_button.click()
@@ -1069,7 +1029,7 @@ def apply_to_jobs(search_terms: list[str]) -> None:
                                     pause_before_submit = False if "Disable Pause" == decision else True
                                     # try_xp(modal, ".//span[normalize-space(.)='Review']")
                                 follow_company(modal)
-                                submit_success = wait_span_click(driver, "Submit application", 2, scrollTop=True)
+                                with timed("submit"): submit_success = wait_span_click(driver, "Submit application", 2, scrollTop=True)
                                 if submit_success:
                                     date_applied = datetime.now()
                                     print_lg(f"\n*** APPLICATION SUBMITTED SUCCESSFULLY! ***\nJob: {title} | {company}\nJob ID: {job_id}\n")
@@ -1117,6 +1077,16 @@ def apply_to_jobs(search_terms: list[str]) -> None:
                             return
                         if skip: continue
 
+                    # Collect skills extracted using AI if enabled
+                    if use_AI and description != "Unknown":
+                        try:
+                            with timed("extract_skills"): skills = collect_skills(description)
+                            print_lg("Skills extracted using AI:")
+                            print_lg(skills, pretty=True)
+                        except Exception as e:
+                            print_lg(f"Failed to extract skills using AI: {e}")
+                            skills = "Failed to extract skills using AI"
+
                     submitted_jobs(job_id, title, company, work_location, work_style, description, experience_required, skills, hr_name, hr_link, resume, reposted, date_listed, date_applied, job_link, application_link, questions_list, connect_request)
                     if uploaded:   useNewResume = False
 
@@ -1168,66 +1138,128 @@ def apply_to_jobs(search_terms: list[str]) -> None:
             # print_lg(e)
 
 
-def run(total_runs: int) -> int:
+def run(total_runs: int, applied_jobs: set | None = None) -> int:
     if dailyEasyApplyLimitReached:
         return total_runs
     print_lg("\n########################################################################################################################\n")
     print_lg(f"Date and Time: {datetime.now()}")
     print_lg(f"Cycle number: {total_runs}")
     print_lg(f"Currently looking for jobs posted within '{date_posted}' and sorting them by '{sort_by}'")
-    apply_to_jobs(search_terms)
+    try: apply_to_jobs(search_terms, total_runs, applied_jobs)
+    finally:
+        report_stage_timings(total_runs)
+        save_worker_counters(get_counters())
     print_lg("########################################################################################################################\n")
     if not dailyEasyApplyLimitReached:
         print_lg("Sleeping for 10 min...")
         sleep(300)
         print_lg("Few more min... Gonna start with in next 5 min...")
         sleep(300)
+        if use_AI: warm_up_ai()
     buffer(3)
     return total_runs + 1
 
 
 
+def get_counters() -> dict[str, int]:
+    '''
+    Function to get the counters of this browser shown in the final summary
+    '''
+    return {"easy_applied": easy_applied_count, "external_jobs": external_jobs_count, "failed": failed_count, "skipped": skip_count}
+
+
+def get_run_state() -> dict:
+    '''
+    Function to get the counters and progress of this browser for the live metrics (see "/modules/metrics.py")
+    '''
+    return {"counters": get_counters(), "cycle": current_cycle, "search_term": current_search_term, "page": current_page_number, "daily_limit_reached": dailyEasyApplyLimitReached}
+
+
+
+def open_linkedin_session() -> None:
+    '''
+    Function to reuse the LinkedIn session of the browser profile if possible (`reuse_browser_session = True`), else login
+    '''
+    global tabs_count
+    tabs_count = len(driver.window_handles)
+
+    # Check if we should try to reuse an existing session
+    if reuse_browser_session:
+        print_lg("Attempting to reuse existing LinkedIn session...")
+        # First try to go to LinkedIn feed to see if we're already logged in
+        driver.get("https://www.linkedin.com/feed/")
+        buffer(2)
+
+        # Check if we're logged in
+        if is_logged_in_LN():
+            print_lg("Successfully reused existing LinkedIn session!")
+        else:
+            print_lg("No existing session found or session expired. Proceeding with normal login...")
+            driver.get("https://www.linkedin.com/login")
+            login_LN()
+    else:
+        # Standard login process
+        driver.get("https://www.linkedin.com/login")
+        if not is_logged_in_LN(): login_LN()
+
+
+def start_AI() -> None:
+    '''
+    Function to initialize the configured AI provider if AI is enabled, and disable AI for this run if that fails
+    '''
+    global use_AI
+    if use_AI:
+        try:
+            print_lg(f"Initializing AI with provider: {ai_provider}")
+            ai_initialized = initialize_ai()
+            if not ai_initialized:
+                print_lg("Failed to initialize AI. Continuing without AI functionality.")
+                use_AI = False
+        except Exception as e:
+            print_lg(f"Error initializing AI: {str(e)}")
+            print_lg("Continuing without AI functionality.")
+            use_AI = False
+
+
+
 chatGPT_tab = False
 linkedIn_tab = False
 
 def main() -> None:
     total_runs = 1
+    worker_processes = []
+    finished = False
     try:
         global linkedIn_tab, tabs_count, useNewResume
         alert_title = "Error Occurred. Closing Browser!"
         validate_config()
+        start_metrics(get_run_state)
+        worker_processes = start_workers()
 
         if not os.path.exists(default_resume_path):
             try:
+                if worker_id: raise RuntimeError("Dialogs are disabled in extra browsers")
                 pyautogui.alert(text='Your default resume "{}" is missing! Please update it\'s folder path "default_resume_path" in config.py\n\nOR\n\nAdd a resume with exact name and path (check for spelling mistakes including cases).\n\n\nFor now the bot will continue using your previous upload from LinkedIn!'.format(default_resume_path), title="Missing Resume", button="OK")
             except Exception as alert_error:
                 print_lg(f"Error showing alert: {alert_error}")
                 print_lg(f"Your default resume '{default_resume_path}' is missing! Will use your previous upload from LinkedIn.")
             useNewResume = False
 
-        # Login to LinkedIn
-        tabs_count = len(driver.window_handles)
-
-        # Check if we should try to reuse an existing session
-        if reuse_browser_session:
-            print_lg("Attempting to reuse existing LinkedIn session...")
-            # First try to go to LinkedIn feed to see if we're already logged in
-            driver.get("https://www.linkedin.com/feed/")
-            buffer(2)
-
-            # Check if we're logged in
-            if is_logged_in_LN():
-                print_lg("Successfully reused existing LinkedIn session!")
-            else:
-                print_lg("No existing session found or session expired. Proceeding with normal login...")
-                driver.get("https://www.linkedin.com/login")
-                login_LN()
-        else:
-            # Standard login process
-            driver.get("https://www.linkedin.com/login")
-            if not is_logged_in_LN(): login_LN()
-
+        # Launch Chrome, check the AI backend and load the history of applied jobs at the same time
+        startup_start = perf_counter()
+        startup_steps = start_steps({
+            "Chrome launch": get_driver,
+            "AI backend": start_AI,
+            "Applied jobs history": get_applied_job_ids,
+        })
+        required_steps = {"Chrome launch", "Applied jobs history"}
+        wait_for_steps(startup_steps, required_steps, ["Chrome launch"])
+
+        # Login to LinkedIn while the rest finishes
+        with timed("startup: LinkedIn session"): open_linkedin_session()
         linkedIn_tab = driver.current_window_handle
+        wait_for_steps(startup_steps, required_steps)
+        print_lg(f"Ready to search after {perf_counter() - startup_start:.1f} secs of start up")
 
         # # Login to ChatGPT in a new tab for resume customization
         # if use_resume_generator:
@@ -1240,23 +1272,11 @@ def main() -> None:
         #         chatGPT_tab = driver.current_window_handle
         #     except Exception as e:
         #         print_lg("Opening OpenAI chatGPT tab failed!")
-        # Initialize AI if enabled
-        global use_AI
-        if use_AI:
-            try:
-                print_lg(f"Initializing AI with provider: {ai_provider}")
-                ai_initialized = initialize_ai()
-                if not ai_initialized:
-                    print_lg("Failed to initialize AI. Continuing without AI functionality.")
-                    use_AI = False
-            except Exception as e:
-                print_lg(f"Error initializing AI: {str(e)}")
-                print_lg("Continuing without AI functionality.")
-                use_AI = False
 
         # Start applying to jobs
         driver.switch_to.window(linkedIn_tab)
-        total_runs = run(total_runs)
+        # The first cycle uses the applied jobs loaded during start up, later cycles reload them
+        total_runs = run(total_runs, startup_steps["Applied jobs history"].result())
         while(run_non_stop):
             if cycle_date_posted:
                 date_options = ["Any time", "Past month", "Past week", "Past 24 hours"]
@@ -1270,17 +1290,29 @@ def main() -> None:
             total_runs = run(total_runs)
             if dailyEasyApplyLimitReached:
                 break
+        finished = True
 
 
     except NoSuchWindowException:   pass
     except Exception as e:
         critical_error_log("In Applier Main", e)
         try:
+            if worker_id: raise RuntimeError("Dialogs are disabled in extra browsers")
             pyautogui.alert(str(e), alert_title)
         except Exception as alert_error:
             print_lg(f"Error showing alert: {alert_error}")
             print_lg(f"Error occurred: {e}")
     finally:
+        global easy_applied_count, external_jobs_count, failed_count, skip_count
+        if worker_id: save_worker_counters(get_counters())
+        elif worker_processes:
+            print_lg("Waiting for the other browsers to finish..." if finished else "Stopping the other browsers...")
+            stop_workers(worker_processes, terminate=not finished)
+            workers_counters = get_workers_counters()
+            easy_applied_count += workers_counters.get("easy_applied", 0)
+            external_jobs_count += workers_counters.get("external_jobs", 0)
+            failed_count += workers_counters.get("failed", 0)
+            skip_count += workers_counters.get("skipped", 0)
         print_lg("\n\nTotal runs:                     {}".format(total_runs))
         print_lg("Jobs Easy Applied:              {}".format(easy_applied_count))
         print_lg("External job links collected:   {}".format(external_jobs_count))
@@ -1305,14 +1337,14 @@ def main() -> None:
             ])
         msg = f"\n{quote}\n\n\nBest regards,\nMeet Shah\nhttps://www.linkedin.com/in/meetshah10290/\n\n"
         try:
-            pyautogui.alert(msg, "Exiting..")
+            if not worker_id: pyautogui.alert(msg, "Exiting..")
         except Exception as alert_error:
             print_lg(f"Error showing alert: {alert_error}")
         print_lg(msg,"Closing the browser...")
         if tabs_count >= 10:
             msg = "NOTE: IF YOU HAVE MORE THAN 10 TABS OPENED, PLEASE CLOSE OR BOOKMARK THEM!\n\nOr it's highly likely that application will just open browser and not do anything next time!"
             try:
-                pyautogui.alert(msg,"Info")
+                if not worker_id: pyautogui.alert(msg,"Info")
             except Exception as alert_error:
                 print_lg(f"Error showing alert: {alert_error}")
             print_lg("\n"+msg)
@@ -1320,11 +1352,17 @@ def main() -> None:
         if use_AI:
             cleanup_ai()
 
+        close_history_index()
+        close_description_store()
+        close_skip_cache()
+        stop_metrics()
+
         # Close the browser
         try:
-            driver.quit()
+            close_driver()
         except Exception as e:
             critical_error_log("When quitting...", e)
+        flush_logs()
 
 
 if __name__ == "__main__":
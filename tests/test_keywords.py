@@ -0,0 +1,31 @@
+import importlib
+
+import pytest
+
+
+@pytest.fixture
+def helpers():
+    pytest.importorskip("pyautogui")
+    return importlib.import_module("modules.helpers")
+
+
+def test_find_keywords_reports_words_starting_at_the_same_position(helpers):
+    keywords = helpers.compile_keywords(["US Citizen", "US Citizens Only", "Clearance"])
+    found = helpers.find_keywords(keywords, "Open to us citizens only, no clearance needed")
+    assert found == [("US Citizens Only", 8), ("US Citizen", 8), ("Clearance", 29)]
+
+
+def test_find_keywords_whole_words_checks_each_word(helpers):
+    keywords = helpers.compile_keywords(["US Citizen", "US Citizens Only"], whole_words=True)
+    assert helpers.find_keywords(keywords, "US Citizens Only") == [("US Citizens Only", 0)]
+    assert helpers.find_keywords(keywords, "US Citizen, or green card") == [("US Citizen", 0)]
+
+
+def test_find_keywords_first_only(helpers):
+    keywords = helpers.compile_keywords(["Java", "JavaScript"])
+    assert helpers.find_keywords(keywords, "JavaScript and Java", first_only=True) == [("JavaScript", 0)]
+
+
+def test_find_keywords_casefold(helpers):
+    keywords = helpers.compile_keywords(["sales"])
+    assert helpers.find_keywords(keywords, "ſales") == [("sales", 0)]
@@ -0,0 +1,25 @@
+import importlib
+
+import pytest
+
+
+def test_helpers_dont_shadow_browser_objects():
+    '''
+    runAiBot star imports `modules.open_chrome` and then `modules.helpers`, so helpers must not export these names
+    '''
+    pytest.importorskip("pyautogui")
+    helpers = importlib.import_module("modules.helpers")
+    for name in ("driver", "wait", "actions"):
+        assert not hasattr(helpers, name), f'modules.helpers exports "{name}", which replaces the browser object in runAiBot'
+
+
+def test_runaibot_wait_is_browser_wait():
+    for module in ("selenium", "pyautogui", "config.personals", "config.secrets"):
+        pytest.importorskip(module)
+    bot = importlib.import_module("runAiBot")
+    open_chrome = importlib.import_module("modules.open_chrome")
+    # Reads the proxies' own attributes only, so Chrome isn't started
+    assert isinstance(bot.wait, open_chrome.LazyBrowserObject)
+    assert object.__getattribute__(bot.wait, "_getter") is open_chrome.get_wait
+    assert object.__getattribute__(bot.driver, "_getter") is open_chrome.get_driver
+    assert object.__getattribute__(bot.actions, "_getter") is open_chrome.get_actions